@@ -1,40 +1,647 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, make_response, request, stream_with_context
 from flask_cors import CORS
+from requests.adapters import HTTPAdapter
+from logging.handlers import RotatingFileHandler
+from urllib.parse import parse_qsl, quote, unquote, urlparse
+from collections import OrderedDict
+from bisect import bisect_left
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
 import subprocess
+import itertools
+import socket
+import re
+import threading
+import logging
 import requests
+import time
 import os
 import atexit
 
 app = Flask(__name__)
 CORS(app)
 
-# Start Node.js server as subprocess
-node_process = None
 NODE_PORT = 5004
 
-def start_node_server():
-    global node_process
-    try:
-        # Start Node.js server
+# Shared upstream session: keeps connections to Node alive and pooled across requests
+PROXY_POOL_CONNECTIONS = int(os.getenv('PROXY_POOL_CONNECTIONS', '4'))
+PROXY_POOL_SIZE = int(os.getenv('PROXY_POOL_SIZE', '32'))
+PROXY_KEEP_ALIVE = os.getenv('PROXY_KEEP_ALIVE', 'true').lower() == 'true'
+PROXY_CHUNK_SIZE = int(os.getenv('PROXY_CHUNK_SIZE', '65536'))
+# Forward request bodies as raw bytes (set to false to fall back to JSON re-serialization)
+PROXY_PASSTHROUGH = os.getenv('PROXY_PASSTHROUGH', 'true').lower() == 'true'
+
+# (connect, read) timeouts for every call to Node
+PROXY_CONNECT_TIMEOUT = float(os.getenv('PROXY_CONNECT_TIMEOUT', '3.05'))
+PROXY_READ_TIMEOUT = float(os.getenv('PROXY_READ_TIMEOUT', '30'))
+UPSTREAM_TIMEOUT = (PROXY_CONNECT_TIMEOUT, PROXY_READ_TIMEOUT)
+
+# When set, Node listens on Unix domain sockets in this directory instead of TCP ports
+NODE_SOCKET_DIR = os.getenv('NODE_SOCKET_DIR')
+
+# Hop-by-hop headers only apply to a single connection and are never forwarded
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade'
+}
+
+# Response headers copied from Node back to the client
+FORWARDED_RESPONSE_HEADERS = ('Content-Type', 'Content-Length', 'Content-Encoding', 'ETag')
+
+# Per-thread scratch space for timings measured inside urllib3 (see TimedHTTPConnection)
+upstream_timing = threading.local()
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTP connection that records how long opening the socket took"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        upstream_timing.connect = time.perf_counter() - started
+        return sock
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class UnixHTTPConnection(HTTPConnection):
+    """HTTP connection over a Unix domain socket instead of TCP"""
+
+    def __init__(self, socket_path, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        upstream_timing.connect = time.perf_counter() - started
+        return sock
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    """Keep-alive pool of connections to a single Unix socket"""
+
+    def __init__(self, socket_path, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        self.num_connections += 1
+        return UnixHTTPConnection(self.socket_path, timeout=self.timeout.connect_timeout)
+
+class UnixSocketAdapter(HTTPAdapter):
+    """requests adapter for http+unix://<quoted socket path>/<path> URLs"""
+
+    def __init__(self, pool_maxsize, pool_block=False):
+        self.socket_pools = {}
+        self.socket_pools_lock = threading.Lock()
+        super().__init__(pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+    def get_connection(self, url, proxies=None):
+        socket_path = unquote(urlparse(url).netloc)
+        with self.socket_pools_lock:
+            pool = self.socket_pools.get(socket_path)
+            if pool is None:
+                pool = UnixHTTPConnectionPool(socket_path, maxsize=self._pool_maxsize, block=self._pool_block)
+                self.socket_pools[socket_path] = pool
+        return pool
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self.get_connection(request.url, proxies)
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self):
+        with self.socket_pools_lock:
+            for pool in self.socket_pools.values():
+                pool.close()
+            self.socket_pools.clear()
+        super().close()
+
+def create_upstream_session():
+    """Create a requests session with a connection pool sized for the proxy"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=PROXY_POOL_CONNECTIONS,
+        pool_maxsize=PROXY_POOL_SIZE,
+        pool_block=False
+    )
+    adapter.poolmanager.pool_classes_by_scheme = dict(
+        adapter.poolmanager.pool_classes_by_scheme, http=TimedHTTPConnectionPool
+    )
+    session.mount('http://', adapter)
+    session.mount('http+unix://', UnixSocketAdapter(pool_maxsize=PROXY_POOL_SIZE))
+    # Don't add our own default headers (Accept-Encoding, User-Agent, ...) to proxied calls
+    session.headers.clear()
+    if not PROXY_KEEP_ALIVE:
+        session.headers['Connection'] = 'close'
+    return session
+
+upstream_session = create_upstream_session()
+
+class RequestBodyStream:
+    """Iterate the incoming WSGI body in chunks while telling requests its length"""
+
+    def __init__(self, stream, length):
+        self.stream = stream
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        while True:
+            chunk = self.stream.read(PROXY_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def forwarded_request_headers():
+    """Copy the client's headers for Node, minus hop-by-hop ones and the ones requests sets"""
+    headers = {}
+    for name, value in request.headers.items():
+        lower = name.lower()
+        if lower in HOP_BY_HOP_HEADERS or lower in ('host', 'content-length'):
+            continue
+        headers[name] = value
+    return headers
+
+def passthrough_request_body():
+    """Return the request body as a stream that is never decoded or buffered"""
+    length = request.content_length
+    if length:
+        return RequestBodyStream(request.stream, length)
+    if length is None and request.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+        # Unknown length: a plain generator makes requests send it chunked too
+        return iter(RequestBodyStream(request.stream, 0))
+    return None
+
+def send_upstream(url):
+    """Forward the current request to Node and return the streamed response"""
+    if PROXY_PASSTHROUGH:
+        query = request.query_string.decode('latin-1')
+        if query:
+            url = f'{url}?{query}'
+        return upstream_session.request(
+            request.method,
+            url,
+            data=passthrough_request_body(),
+            headers=forwarded_request_headers(),
+            stream=True,
+            timeout=UPSTREAM_TIMEOUT
+        )
+
+    if request.method in ('POST', 'PUT', 'PATCH'):
+        return upstream_session.request(
+            request.method, url, json=request.get_json(), params=request.args,
+            stream=True, timeout=UPSTREAM_TIMEOUT
+        )
+    return upstream_session.request(
+        request.method, url, params=request.args, stream=True, timeout=UPSTREAM_TIMEOUT
+    )
+
+def stream_upstream_body(resp):
+    """Yield the upstream body as it arrives"""
+    # decode_content=False keeps the bytes exactly as Node sent them, so
+    # Content-Length and Content-Encoding stay valid for the client
+    for chunk in resp.raw.stream(PROXY_CHUNK_SIZE, decode_content=False):
+        yield chunk
+
+def build_proxy_response(resp, on_close=None, prefix=None, route=None):
+    """Turn a streamed upstream response into a Flask response without buffering it"""
+    headers = {}
+    for name in FORWARDED_RESPONSE_HEADERS:
+        if name in resp.headers:
+            headers[name] = resp.headers[name]
+    headers.setdefault('Content-Type', 'application/json')
+
+    # Chunked upstream responses carry no Content-Length, so the WSGI server
+    # sends them to the client with Transfer-Encoding: chunked as well
+    body = stream_upstream_body(resp)
+    if prefix:
+        # Part of the body was already read off the socket (see fetch_for_cache)
+        body = itertools.chain([prefix], body)
+    response = Response(
+        stream_with_context(body),
+        status=resp.status_code,
+        headers=headers
+    )
+    # Runs when the WSGI server closes the response, even if the client went away early;
+    # closing the upstream response hands its connection back to the pool
+    response.call_on_close(resp.close)
+    if on_close:
+        response.call_on_close(on_close)
+    if route:
+        headers_at = time.perf_counter()
+        response.call_on_close(
+            lambda: proxy_metrics.observe('proxy_upstream_body_seconds', route, time.perf_counter() - headers_at)
+        )
+    return response
+
+# ============= NODE PROCESS SUPERVISOR =============
+
+NODE_LOG_DIR = os.getenv('NODE_LOG_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs'))
+NODE_LOG_MAX_BYTES = int(os.getenv('NODE_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+NODE_LOG_BACKUP_COUNT = int(os.getenv('NODE_LOG_BACKUP_COUNT', '5'))
+NODE_READY_TIMEOUT = float(os.getenv('NODE_READY_TIMEOUT', '30'))
+NODE_READY_WAIT = float(os.getenv('NODE_READY_WAIT', '5'))
+NODE_RESTART_BACKOFF = float(os.getenv('NODE_RESTART_BACKOFF', '0.5'))
+NODE_RESTART_BACKOFF_MAX = float(os.getenv('NODE_RESTART_BACKOFF_MAX', '30'))
+# A child that stayed up this long counts as healthy again and resets the backoff
+NODE_STABLE_AFTER = float(os.getenv('NODE_STABLE_AFTER', '60'))
+# Number of Node processes behind the proxy, listening on NODE_PORT, NODE_PORT + 1, ...
+NODE_WORKERS = int(os.getenv('NODE_WORKERS', '1'))
+NODE_HEALTH_INTERVAL = float(os.getenv('NODE_HEALTH_INTERVAL', '5'))
+NODE_DRAIN_TIMEOUT = float(os.getenv('NODE_DRAIN_TIMEOUT', '30'))
+
+# Consecutive failures that open a worker's circuit, and how long it stays open
+PROXY_BREAKER_FAILURES = int(os.getenv('PROXY_BREAKER_FAILURES', '5'))
+PROXY_BREAKER_RESET = float(os.getenv('PROXY_BREAKER_RESET', '10'))
+
+# Upstream statuses that count as a failure of the worker itself
+BREAKER_FAILURE_STATUSES = {502, 503, 504}
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial call -> closed again"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+        self.counters = {'failures': 0, 'opened': 0, 'rejected': 0}
+
+    def available(self):
+        """Whether a call may go through right now (does not change state)"""
+        with self.lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open':
+                return time.monotonic() - self.opened_at >= self.reset_timeout
+            return not self.trial_in_flight
+
+    def begin(self):
+        """Mark the start of a call; in half-open only one trial call is let through"""
+        with self.lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            if self.state == 'half_open':
+                self.trial_in_flight = True
+
+    def reject(self):
+        with self.lock:
+            self.counters['rejected'] += 1
+
+    def abandon(self):
+        """End a call without an outcome, so a half-open breaker lets the next trial through"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self.lock:
+            self.state = 'closed'
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.counters['failures'] += 1
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.counters['opened'] += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats['state'] = self.state
+            stats['consecutiveFailures'] = self.consecutive_failures
+        return stats
+
+class NodeSupervisor:
+    """Run `node start.js`, drain its output into rotating logs and restart it when it dies"""
+
+    def __init__(self, port, name='node', socket_path=None):
+        self.port = port
+        self.name = name
+        self.socket_path = socket_path
+        if socket_path:
+            self.base_url = f'http+unix://{quote(socket_path, safe="")}'
+        else:
+            self.base_url = f'http://localhost:{port}'
+        self.process = None
+        self.ready = threading.Event()
+        self.stopping = threading.Event()
+        self.restart_requested = threading.Event()
+        self.restart_count = 0
+        self.last_exit_code = None
+        self.started_at = None
+        self.monitor_thread = None
+        # Load balancing state, owned by NodeWorkerPool
+        self.inflight = 0
+        self.draining = False
+        self.breaker = CircuitBreaker(PROXY_BREAKER_FAILURES, PROXY_BREAKER_RESET)
+        self.logger = self._create_logger()
+
+    def _create_logger(self):
+        os.makedirs(NODE_LOG_DIR, exist_ok=True)
+        logger = logging.getLogger(f'macs.{self.name}')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            handler = RotatingFileHandler(
+                os.path.join(NODE_LOG_DIR, f'{self.name}.log'),
+                maxBytes=NODE_LOG_MAX_BYTES,
+                backupCount=NODE_LOG_BACKUP_COUNT
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+            logger.addHandler(handler)
+        return logger
+
+    def start(self):
+        self.stopping.clear()
+        self._spawn()
+        self.monitor_thread = threading.Thread(target=self._monitor, name=f'{self.name}-monitor', daemon=True)
+        self.monitor_thread.start()
+
+    def _spawn(self):
         env = os.environ.copy()
-        env['PORT'] = str(NODE_PORT)
-        node_process = subprocess.Popen(
+        env['PORT'] = str(self.port)
+        if self.socket_path:
+            env['SOCKET_PATH'] = self.socket_path
+        process = subprocess.Popen(
             ['node', 'start.js'],
             env=env,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
         )
-        print(f"Started Node.js server on port {NODE_PORT}")
+        self.ready.clear()
+        self.process = process
+        self.started_at = time.monotonic()
+
+        # Both pipes must be read continuously, otherwise Node blocks once the pipe buffer fills up
+        for pipe, level in ((process.stdout, logging.INFO), (process.stderr, logging.ERROR)):
+            threading.Thread(target=self._drain, args=(pipe, level), daemon=True).start()
+        threading.Thread(target=self._wait_for_health, args=(process,), daemon=True).start()
+        print(f"Started Node.js server on {self.socket_path or f'port {self.port}'} (pid {process.pid})")
+
+    def _drain(self, pipe, level):
+        for line in iter(pipe.readline, b''):
+            self.logger.log(level, line.decode('utf-8', errors='replace').rstrip())
+        pipe.close()
+
+    def _wait_for_health(self, process):
+        """Poll Node's /health endpoint until it answers, then open the gate for traffic"""
+        deadline = time.monotonic() + NODE_READY_TIMEOUT
+        url = f'{self.base_url}/health'
+        while time.monotonic() < deadline and process.poll() is None and not self.stopping.is_set():
+            try:
+                resp = upstream_session.get(url, timeout=1)
+                resp.close()
+                if resp.status_code == 200:
+                    if process is self.process:
+                        self.ready.set()
+                    return
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.1)
+        if process.poll() is None and not self.stopping.is_set():
+            self.logger.error(f'Node did not become healthy within {NODE_READY_TIMEOUT}s')
+
+    def _monitor(self):
+        backoff = NODE_RESTART_BACKOFF
+        while not self.stopping.is_set():
+            exit_code = self.process.wait()
+            self.ready.clear()
+            if self.stopping.is_set():
+                break
+
+            if self.restart_requested.is_set():
+                # Planned restart: bring the replacement up right away
+                self.restart_requested.clear()
+                self._spawn()
+                self.restart_count += 1
+                continue
+
+            self.last_exit_code = exit_code
+            if time.monotonic() - self.started_at >= NODE_STABLE_AFTER:
+                backoff = NODE_RESTART_BACKOFF
+            print(f"Node.js server exited with code {exit_code}, restarting in {backoff:.1f}s")
+            self.logger.error(f'Node exited with code {exit_code}, restarting in {backoff:.1f}s')
+
+            if self.stopping.wait(backoff):
+                break
+            backoff = min(backoff * 2, NODE_RESTART_BACKOFF_MAX)
+            try:
+                self._spawn()
+                self.restart_count += 1
+            except Exception as e:
+                print(f"Failed to restart Node.js server: {e}")
+
+    def _terminate(self, process):
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    def stop(self):
+        self.stopping.set()
+        self.ready.clear()
+        self._terminate(self.process)
+
+    def restart(self):
+        """Replace the child with a fresh process and wait until the new one is healthy"""
+        self.ready.clear()
+        self.restart_requested.set()
+        self._terminate(self.process)
+        return self.wait_until_ready(NODE_READY_TIMEOUT)
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def mark_unhealthy(self):
+        """Take the worker out of rotation; the pool's health loop puts it back"""
+        if self.ready.is_set():
+            self.ready.clear()
+            self.logger.error('Node failed a health check, taking it out of rotation')
+
+    def wait_until_ready(self, timeout):
+        return self.ready.wait(timeout)
+
+    def stats(self):
+        process = self.process
+        running = self.is_running()
+        return {
+            'name': self.name,
+            'port': None if self.socket_path else self.port,
+            'socket': self.socket_path,
+            'pid': process.pid if running else None,
+            'running': running,
+            'ready': self.ready.is_set(),
+            'draining': self.draining,
+            'inflight': self.inflight,
+            'breaker': self.breaker.stats(),
+            'restarts': self.restart_count,
+            'lastExitCode': self.last_exit_code,
+            'uptimeSeconds': round(time.monotonic() - self.started_at, 1) if running else 0
+        }
+
+class NodeWorkerPool:
+    """A set of supervised Node workers balanced by least in-flight requests"""
+
+    def __init__(self, size, base_port, socket_dir=None):
+        self.workers = []
+        for i in range(size):
+            name = 'node' if size == 1 else f'node-{i}'
+            socket_path = os.path.join(socket_dir, f'{name}.sock') if socket_dir else None
+            self.workers.append(NodeSupervisor(base_port + i, name=name, socket_path=socket_path))
+        if socket_dir:
+            os.makedirs(socket_dir, exist_ok=True)
+        self.condition = threading.Condition()
+        self.stopping = threading.Event()
+        self.restart_lock = threading.Lock()
+
+    def start(self):
+        self.stopping.clear()
+        for worker in self.workers:
+            worker.start()
+        threading.Thread(target=self._health_loop, name='node-health', daemon=True).start()
+
+    def stop(self):
+        self.stopping.set()
+        for worker in self.workers:
+            worker.stop()
+
+    def wait_until_ready(self, timeout):
+        """Wait until at least one worker can take traffic"""
+        deadline = time.monotonic() + timeout
+        while not any(w.ready.is_set() for w in self.workers):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(0.05, remaining))
+        return True
+
+    def acquire(self, timeout):
+        """Reserve the healthy worker with the fewest in-flight requests, or None on timeout"""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                candidates = [w for w in self.workers if w.ready.is_set() and not w.draining]
+                closed = [w for w in candidates if w.breaker.available()]
+                if closed:
+                    worker = min(closed, key=lambda w: w.inflight)
+                    worker.breaker.begin()
+                    worker.inflight += 1
+                    return worker
+                if candidates:
+                    # Node is up but every circuit is open: fail fast instead of waiting
+                    for worker in candidates:
+                        worker.breaker.reject()
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                # Readiness is flipped by supervisor threads, so poll instead of waiting for a notify
+                self.condition.wait(min(0.05, remaining))
+
+    def release(self, worker):
+        with self.condition:
+            worker.inflight -= 1
+            self.condition.notify_all()
+
+    def record(self, worker, status_code):
+        """Feed the outcome of an upstream call into the worker's circuit breaker"""
+        if status_code in BREAKER_FAILURE_STATUSES:
+            worker.breaker.record_failure()
+        else:
+            worker.breaker.record_success()
+
+    def abandon(self, worker):
+        """Release a worker after a call that failed on our side, not the worker's"""
+        self.release(worker)
+        worker.breaker.abandon()
+
+    def fail(self, worker, error):
+        """Release a worker after a call that never got a response"""
+        self.release(worker)
+        worker.breaker.record_failure()
+        if isinstance(error, requests.exceptions.ConnectionError):
+            worker.mark_unhealthy()
+
+    def _drain(self, worker):
+        """Stop routing to a worker and wait for its in-flight requests to finish"""
+        deadline = time.monotonic() + NODE_DRAIN_TIMEOUT
+        with self.condition:
+            worker.draining = True
+            while worker.inflight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
         return True
+
+    def rolling_restart(self):
+        """Restart workers one at a time so the others keep serving"""
+        with self.restart_lock:
+            for worker in self.workers:
+                if not self._drain(worker):
+                    worker.logger.error(f'Requests still in flight after {NODE_DRAIN_TIMEOUT}s, restarting anyway')
+                try:
+                    if not worker.restart():
+                        worker.logger.error(f'Node not healthy {NODE_READY_TIMEOUT}s after a rolling restart')
+                finally:
+                    with self.condition:
+                        worker.draining = False
+                        self.condition.notify_all()
+
+    def _health_loop(self):
+        """Take failing workers out of rotation and put recovered ones back"""
+        while not self.stopping.wait(NODE_HEALTH_INTERVAL):
+            for worker in self.workers:
+                if worker.draining or not worker.is_running():
+                    continue
+                try:
+                    resp = upstream_session.get(f'{worker.base_url}/health', timeout=2)
+                    resp.close()
+                    healthy = resp.status_code == 200
+                except requests.exceptions.RequestException:
+                    healthy = False
+                if healthy and not worker.ready.is_set():
+                    worker.ready.set()
+                elif not healthy:
+                    worker.mark_unhealthy()
+
+    def stats(self):
+        return [worker.stats() for worker in self.workers]
+
+node_pool = NodeWorkerPool(NODE_WORKERS, NODE_PORT, NODE_SOCKET_DIR)
+
+def start_node_server():
+    try:
+        node_pool.start()
     except Exception as e:
         print(f"Failed to start Node.js server: {e}")
         return False
 
+    # Hold off serving until Node answers its health check
+    if not node_pool.wait_until_ready(NODE_READY_TIMEOUT):
+        print(f"Node.js server not healthy after {NODE_READY_TIMEOUT}s, requests will wait for it")
+    return True
+
 def stop_node_server():
-    global node_process
-    if node_process:
-        node_process.terminate()
-        node_process.wait()
+    node_pool.stop()
 
 # Register cleanup function
 atexit.register(stop_node_server)
@@ -42,35 +649,605 @@ atexit.register(stop_node_server)
 # Start Node.js server when Flask starts
 start_node_server()
 
+def backend_unavailable():
+    return jsonify({
+        'success': False,
+        'message': 'Backend service unavailable',
+        'data': {'error': 'Node.js server not responding'}
+    }), 503
+
+def backend_timeout():
+    return jsonify({
+        'success': False,
+        'message': 'Backend service timed out',
+        'data': {'error': f'Node.js server did not respond within {PROXY_READ_TIMEOUT}s'}
+    }), 504
+
+class BackendUnavailable(Exception):
+    """No Node worker could take the request"""
+
+# ============= METRICS =============
+
+PROXY_METRICS_SHARDS = int(os.getenv('PROXY_METRICS_SHARDS', '16'))
+# Distinct route labels kept before new ones are folded into "other"
+PROXY_METRICS_MAX_ROUTES = int(os.getenv('PROXY_METRICS_MAX_ROUTES', '200'))
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HISTOGRAM_HELP = {
+    'proxy_request_duration_seconds': 'Total time spent in the proxy, including streaming the body',
+    'proxy_upstream_connect_seconds': 'Time to open a new connection to Node',
+    'proxy_upstream_ttfb_seconds': 'Time from sending the request to Node until its response headers arrive',
+    'proxy_upstream_body_seconds': 'Time spent moving the response body from Node to the client'
+}
+COUNTER_HELP = {
+    'proxy_responses_total': 'Responses sent by the proxy by route and status code',
+    'proxy_upstream_errors_total': 'Failed calls to Node by route and kind'
+}
+
+# Path segments that are ids, so /api/v1/bookings/42 and /api/v1/bookings/43 share a label
+ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f]{8}-[0-9a-f-]{27}|c[a-z0-9]{20,}|[^@]+@[^@]+)$', re.IGNORECASE)
+
+class MetricsShard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.inflight = 0
+
+class ProxyMetrics:
+    """Histograms and counters split over lock shards so request threads rarely contend"""
+
+    def __init__(self, shards, buckets):
+        self.shards = [MetricsShard() for _ in range(shards)]
+        self.buckets = buckets
+        self.routes = set()
+        self.routes_lock = threading.Lock()
+        # Thread idents are page aligned, so taking them modulo the shard count maps
+        # every thread to one shard; number the threads as they first record instead
+        self.next_index = itertools.count()
+        self.local = threading.local()
+
+    def _shard(self):
+        index = getattr(self.local, 'index', None)
+        if index is None:
+            index = self.local.index = next(self.next_index) % len(self.shards)
+        return self.shards[index]
+
+    def route(self, path):
+        """Collapse ids in a path into a bounded set of route labels"""
+        label = '/'.join(':id' if ID_SEGMENT.match(part) else part for part in path.split('/')) or '/'
+        if label in self.routes:
+            return label
+        with self.routes_lock:
+            if len(self.routes) >= PROXY_METRICS_MAX_ROUTES:
+                return 'other'
+            self.routes.add(label)
+        return label
+
+    def observe(self, name, route, seconds):
+        shard = self._shard()
+        with shard.lock:
+            histogram = shard.histograms.get((name, route))
+            if histogram is None:
+                # Bucket counts, then sum and count
+                histogram = shard.histograms[(name, route)] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            histogram[bisect_left(self.buckets, seconds)] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+
+    def inc(self, name, labels):
+        shard = self._shard()
+        with shard.lock:
+            shard.counters[(name, labels)] = shard.counters.get((name, labels), 0) + 1
+
+    def request_started(self):
+        shard = self._shard()
+        with shard.lock:
+            shard.inflight += 1
+
+    def request_finished(self, route, status_code, seconds):
+        shard = self._shard()
+        with shard.lock:
+            shard.inflight -= 1
+        self.observe('proxy_request_duration_seconds', route, seconds)
+        self.inc('proxy_responses_total', (('route', route), ('code', str(status_code))))
+
+    def upstream_error(self, route, kind):
+        self.inc('proxy_upstream_errors_total', (('route', route), ('kind', kind)))
+
+    def _merge(self):
+        histograms, counters, inflight = {}, {}, 0
+        for shard in self.shards:
+            with shard.lock:
+                inflight += shard.inflight
+                for key, values in shard.histograms.items():
+                    merged = histograms.setdefault(key, [0] * len(values))
+                    for i, value in enumerate(values):
+                        merged[i] += value
+                for key, value in shard.counters.items():
+                    counters[key] = counters.get(key, 0) + value
+        return histograms, counters, inflight
+
+    def render(self):
+        """Prometheus text exposition format"""
+        histograms, counters, inflight = self._merge()
+        lines = [
+            '# HELP proxy_requests_inflight Requests currently being handled by the proxy',
+            '# TYPE proxy_requests_inflight gauge',
+            f'proxy_requests_inflight {inflight}'
+        ]
+        for name, help_text in HISTOGRAM_HELP.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (metric, route), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                label = f'route="{escape_label(route)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, values):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{label},le="+Inf"}} {values[-1]}')
+                lines.append(f'{name}_sum{{{label}}} {values[-2]:.6f}')
+                lines.append(f'{name}_count{{{label}}} {values[-1]}')
+        for name, help_text in COUNTER_HELP.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    rendered = ','.join(f'{key}="{escape_label(val)}"' for key, val in labels)
+                    lines.append(f'{name}{{{rendered}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+proxy_metrics = ProxyMetrics(PROXY_METRICS_SHARDS, METRICS_BUCKETS)
+
+def timed_upstream_call(route, call):
+    """Run an upstream call, recording connect time (new connections only) and time to first byte"""
+    upstream_timing.connect = None
+    started = time.perf_counter()
+    resp = call()
+    proxy_metrics.observe('proxy_upstream_ttfb_seconds', route, time.perf_counter() - started)
+    if upstream_timing.connect is not None:
+        proxy_metrics.observe('proxy_upstream_connect_seconds', route, upstream_timing.connect)
+    return resp
+
+def upstream_error_kind(error):
+    if isinstance(error, BackendUnavailable):
+        return 'unavailable'
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return 'connect'
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'timeout'
+    return 'other'
+
+# ============= RESPONSE CACHE =============
+
+PROXY_CACHE_ENABLED = os.getenv('PROXY_CACHE_ENABLED', 'true').lower() == 'true'
+PROXY_CACHE_MAX_ENTRIES = int(os.getenv('PROXY_CACHE_MAX_ENTRIES', '1024'))
+PROXY_CACHE_MAX_BODY = int(os.getenv('PROXY_CACHE_MAX_BODY', str(1024 * 1024)))
+# How long past its TTL an entry may still be served while it is refreshed in the background
+PROXY_CACHE_STALE_WHILE_REVALIDATE = float(os.getenv('PROXY_CACHE_STALE_WHILE_REVALIDATE', '30'))
+
+# Per-route TTLs in seconds; a route covers its own path and everything below it.
+# Override with PROXY_CACHE_TTLS="/api/v1/campaigns=10,/health=2"
+CACHE_ROUTE_TTLS = {
+    '/health': 2,
+    '/api/v1/campaigns': 10,
+    '/api/v1/projects': 30,
+    '/api/v1/users': 30,
+    '/api/v1/bookings/availability': 5
+}
+if os.getenv('PROXY_CACHE_TTLS'):
+    CACHE_ROUTE_TTLS = {
+        prefix.strip(): float(ttl)
+        for prefix, ttl in (item.split('=') for item in os.getenv('PROXY_CACHE_TTLS').split(','))
+    }
+
+# Writes that change data served under another cached route
+CACHE_RELATED_INVALIDATIONS = {
+    '/api/v1/contributions': ['/api/v1/campaigns'],
+    '/api/v1/bookings': ['/api/v1/bookings/availability']
+}
+
+# Request headers that change the response and so are part of the cache key
+CACHE_VARY_HEADERS = ('Authorization', 'Cookie', 'Accept', 'Accept-Encoding')
+CONDITIONAL_REQUEST_HEADERS = {'if-none-match', 'if-modified-since'}
+
+def path_in_route(path, route):
+    return path == route or path.startswith(route.rstrip('/') + '/')
+
+def cache_route_for(path):
+    """Return the most specific cached route covering this path, or None"""
+    matches = [route for route in CACHE_ROUTE_TTLS if path_in_route(path, route)]
+    return max(matches, key=len) if matches else None
+
+class CacheEntry:
+    def __init__(self, key, route, status, headers, body, ttl, upstream_path, upstream_headers):
+        self.key = key
+        self.route = route
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.ttl = ttl
+        self.etag = headers.get('ETag')
+        self.expires_at = time.monotonic() + ttl
+        self.revalidating = False
+        # Enough of the original request to refresh the entry outside a request context
+        self.upstream_path = upstream_path
+        self.upstream_headers = upstream_headers
+
+    def refresh(self):
+        self.expires_at = time.monotonic() + self.ttl
+
+class ResponseCache:
+    """Bounded LRU of upstream GET responses with TTLs and stale-while-revalidate"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {
+            'hits': 0, 'staleHits': 0, 'misses': 0, 'revalidations': 0,
+            'notModified': 0, 'evictions': 0, 'invalidations': 0
+        }
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def lookup(self, key):
+        """Return (entry, state) where state is 'fresh', 'stale' or 'expired'"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None, None
+            self.entries.move_to_end(key)
+            age = time.monotonic() - entry.expires_at
+            if age <= 0:
+                self.counters['hits'] += 1
+                return entry, 'fresh'
+            if age <= PROXY_CACHE_STALE_WHILE_REVALIDATE:
+                self.counters['staleHits'] += 1
+                return entry, 'stale'
+            self.counters['misses'] += 1
+            return entry, 'expired'
+
+    def store(self, entry):
+        with self.lock:
+            self.entries[entry.key] = entry
+            self.entries.move_to_end(entry.key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def claim_revalidation(self, entry):
+        """Let exactly one caller refresh a stale entry"""
+        with self.lock:
+            if entry.revalidating:
+                return False
+            entry.revalidating = True
+            return True
+
+    def invalidate(self, path):
+        """Drop every entry under the routes this write touches"""
+        routes = {route for route in CACHE_ROUTE_TTLS if path_in_route(route, path) or path_in_route(path, route)}
+        for prefix, related in CACHE_RELATED_INVALIDATIONS.items():
+            if path_in_route(path, prefix):
+                routes.update(related)
+        if not routes:
+            return
+        with self.lock:
+            stale = [key for key, entry in self.entries.items() if entry.route in routes]
+            for key in stale:
+                del self.entries[key]
+            self.counters['invalidations'] += len(stale)
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self.entries)
+            stats['bytes'] = sum(len(entry.body) for entry in self.entries.values())
+        lookups = stats['hits'] + stats['staleHits'] + stats['misses']
+        stats['hitRate'] = round((stats['hits'] + stats['staleHits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+response_cache = ResponseCache(PROXY_CACHE_MAX_ENTRIES)
+
+def cache_key():
+    query = tuple(sorted(parse_qsl(request.query_string.decode('latin-1'), keep_blank_values=True)))
+    varies = tuple(request.headers.get(name, '') for name in CACHE_VARY_HEADERS)
+    return (request.method, request.path, query, varies)
+
+def is_cacheable(result):
+    cache_control = result.headers.get('Cache-Control', '').lower()
+    return result.status == 200 and 'no-store' not in cache_control and 'private' not in cache_control
+
+def cached_response(entry, cache_status):
+    # The client already has this version
+    if entry.etag and entry.etag in request.headers.get('If-None-Match', ''):
+        response = Response(status=304, headers={'ETag': entry.etag})
+    else:
+        response = Response(entry.body, status=entry.status, headers=entry.headers)
+    response.headers['X-Cache'] = cache_status
+    return response
+
+class UpstreamResult:
+    """A buffered upstream response that can be shared between coalesced callers"""
+
+    def __init__(self, status, headers, body, stream=None):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        # (resp, worker) when the body was too big to buffer and must be streamed by the caller
+        self.stream = stream
+
+def fetch_buffered(upstream_path, headers):
+    """GET from the least busy worker, buffering up to PROXY_CACHE_MAX_BODY bytes of the body"""
+    route = proxy_metrics.route(upstream_path.split('?', 1)[0])
+    worker = node_pool.acquire(NODE_READY_WAIT)
+    if worker is None:
+        proxy_metrics.upstream_error(route, 'unavailable')
+        raise BackendUnavailable()
+    try:
+        resp = timed_upstream_call(route, lambda: upstream_session.get(
+            f'{worker.base_url}{upstream_path}', headers=headers, stream=True, timeout=UPSTREAM_TIMEOUT
+        ))
+        started = time.perf_counter()
+        body = resp.raw.read(PROXY_CACHE_MAX_BODY + 1, decode_content=False)
+        proxy_metrics.observe('proxy_upstream_body_seconds', route, time.perf_counter() - started)
+    except Exception as e:
+        node_pool.fail(worker, e)
+        proxy_metrics.upstream_error(route, upstream_error_kind(e))
+        raise
+
+    node_pool.record(worker, resp.status_code)
+    if len(body) > PROXY_CACHE_MAX_BODY:
+        return UpstreamResult(resp.status_code, resp.headers, body, stream=(resp, worker))
+    resp.close()
+    node_pool.release(worker)
+    return UpstreamResult(resp.status_code, resp.headers, body)
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Let one caller per key do the work while concurrent callers wait for its result"""
+
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+        self.counters = {'leaders': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """Return (result, shared); shared is True when the result came from another caller"""
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = _Flight()
+                self.counters['leaders'] += 1
+            else:
+                self.counters['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters, inFlight=len(self.flights))
+
+single_flight = SingleFlight()
+
+def cache_headers(upstream_headers):
+    headers = {name: upstream_headers[name] for name in FORWARDED_RESPONSE_HEADERS if name in upstream_headers}
+    headers.pop('Content-Length', None)
+    headers.setdefault('Content-Type', 'application/json')
+    return headers
+
+def revalidate(entry):
+    """Refresh a stale entry in the background with a conditional GET"""
+    try:
+        headers = dict(entry.upstream_headers)
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        result = fetch_buffered(entry.upstream_path, headers)
+        if result.stream:
+            resp, worker = result.stream
+            resp.close()
+            node_pool.release(worker)
+            return
+
+        response_cache.count('revalidations')
+        if result.status == 304:
+            response_cache.count('notModified')
+            entry.refresh()
+        elif is_cacheable(result):
+            response_cache.store(CacheEntry(
+                entry.key, entry.route, result.status, cache_headers(result.headers), result.body,
+                entry.ttl, entry.upstream_path, entry.upstream_headers
+            ))
+    except (BackendUnavailable, requests.exceptions.RequestException) as e:
+        print(f"Cache revalidation failed for {entry.upstream_path}: {e!r}")
+    finally:
+        entry.revalidating = False
+
+def cached_proxy(path, route):
+    """Serve a GET from the cache, going to Node only for misses and expired entries"""
+    key = cache_key()
+    entry, state = response_cache.lookup(key)
+    if state == 'fresh':
+        return cached_response(entry, 'HIT')
+    if state == 'stale':
+        if response_cache.claim_revalidation(entry):
+            threading.Thread(target=revalidate, args=(entry,), daemon=True).start()
+        return cached_response(entry, 'STALE')
+
+    query = request.query_string.decode('latin-1')
+    upstream_path = f'/{path}?{query}' if query else f'/{path}'
+    upstream_headers = {
+        name: value for name, value in forwarded_request_headers().items()
+        if name.lower() not in CONDITIONAL_REQUEST_HEADERS
+    }
+    headers = dict(upstream_headers)
+    if entry and entry.etag:
+        headers['If-None-Match'] = entry.etag
+
+    # Concurrent misses for the same key share a single upstream call
+    result, shared = single_flight.do(
+        (key, headers.get('If-None-Match')),
+        lambda: fetch_buffered(upstream_path, headers)
+    )
+    if result.stream:
+        if shared:
+            # The leader is streaming that body to its own client; fetch our own copy
+            result = fetch_buffered(upstream_path, headers)
+        if result.stream:
+            resp, worker = result.stream
+            return build_proxy_response(resp, on_close=lambda: node_pool.release(worker), prefix=result.body)
+
+    if result.status == 304 and entry:
+        response_cache.count('notModified')
+        entry.refresh()
+        return cached_response(entry, 'REVALIDATED')
+
+    headers = cache_headers(result.headers)
+    if is_cacheable(result) and not shared:
+        ttl = CACHE_ROUTE_TTLS[route]
+        response_cache.store(CacheEntry(key, route, result.status, headers, result.body, ttl, upstream_path, upstream_headers))
+    response = Response(result.body, status=result.status, headers=headers)
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+@app.route('/_proxy/status', methods=['GET'])
+def proxy_status():
+    return jsonify({
+        'success': True,
+        'data': {
+            'workers': node_pool.stats(),
+            'cache': response_cache.stats(),
+            'coalescing': single_flight.stats()
+        }
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    # Served here, never forwarded to Node
+    return Response(proxy_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/_proxy/restart', methods=['POST'])
+def proxy_restart():
+    # Only reachable from the box itself
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        return jsonify({'success': False, 'message': 'Forbidden', 'data': None}), 403
+
+    threading.Thread(target=node_pool.rolling_restart, name='node-rolling-restart', daemon=True).start()
+    return jsonify({
+        'success': True,
+        'message': 'Rolling restart started',
+        'data': {'workers': len(node_pool.workers)}
+    }), 202
+
 # Proxy all requests to Node.js server
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>', methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'])
 def proxy(path):
+    started = time.perf_counter()
+    route = proxy_metrics.route(request.path)
+    proxy_metrics.request_started()
+    try:
+        response = make_response(forward_request(path, route))
+    except Exception:
+        proxy_metrics.request_finished(route, 500, time.perf_counter() - started)
+        raise
+    # Recorded when the WSGI server closes the response, so streamed bodies are included
+    status_code = response.status_code
+    response.call_on_close(
+        lambda: proxy_metrics.request_finished(route, status_code, time.perf_counter() - started)
+    )
+    return response
+
+def forward_request(path, route):
+    if PROXY_CACHE_ENABLED and request.method == 'GET':
+        cache_route = cache_route_for(request.path)
+        if cache_route:
+            try:
+                return cached_proxy(path, cache_route)
+            except BackendUnavailable:
+                return backend_unavailable()
+            except requests.exceptions.ConnectionError:
+                return backend_unavailable()
+            except requests.exceptions.Timeout:
+                return backend_timeout()
+            except Exception as e:
+                return jsonify({
+                    'success': False,
+                    'message': 'Proxy error',
+                    'data': {'error': str(e)}
+                }), 500
+
+    # Pick a healthy worker; waits while Node is booting or restarting
+    worker = node_pool.acquire(NODE_READY_WAIT)
+    if worker is None:
+        proxy_metrics.upstream_error(route, 'unavailable')
+        return backend_unavailable()
+
+    recorded = False
     try:
-        url = f'http://localhost:{NODE_PORT}/{path}'
+        url = f'{worker.base_url}/{path}'
         
         # Forward the request to Node.js server
-        if request.method == 'GET':
-            resp = requests.get(url, params=request.args)
-        elif request.method == 'POST':
-            resp = requests.post(url, json=request.get_json(), params=request.args)
-        elif request.method == 'PUT':
-            resp = requests.put(url, json=request.get_json(), params=request.args)
-        elif request.method == 'DELETE':
-            resp = requests.delete(url, params=request.args)
-        elif request.method == 'PATCH':
-            resp = requests.patch(url, json=request.get_json(), params=request.args)
+        resp = timed_upstream_call(route, lambda: send_upstream(url))
+        node_pool.record(worker, resp.status_code)
+        recorded = True
+        if PROXY_CACHE_ENABLED and request.method != 'GET':
+            # Node has handled the write by the time its response headers arrive
+            response_cache.invalidate(request.path)
         
-        # Return the response from Node.js
-        return resp.content, resp.status_code, {'Content-Type': resp.headers.get('Content-Type', 'application/json')}
+        # Stream the response from Node.js back to the client
+        return build_proxy_response(resp, on_close=lambda: node_pool.release(worker), route=route)
         
-    except requests.exceptions.ConnectionError:
+    except requests.exceptions.ConnectionError as e:
+        node_pool.fail(worker, e)
+        proxy_metrics.upstream_error(route, 'connect')
+        return backend_unavailable()
+    except requests.exceptions.Timeout as e:
+        node_pool.fail(worker, e)
+        proxy_metrics.upstream_error(route, 'timeout')
+        return backend_timeout()
+    except requests.exceptions.RequestException as e:
+        node_pool.fail(worker, e)
+        proxy_metrics.upstream_error(route, 'other')
         return jsonify({
             'success': False,
-            'message': 'Backend service unavailable',
-            'data': {'error': 'Node.js server not responding'}
-        }), 503
+            'message': 'Proxy error',
+            'data': {'error': str(e)}
+        }), 500
     except Exception as e:
+        # Not the worker's fault (a malformed body, a client gone mid-upload): free a
+        # half-open trial without counting a failure against the breaker
+        if recorded:
+            node_pool.release(worker)
+        else:
+            node_pool.abandon(worker)
         return jsonify({
             'success': False,
             'message': 'Proxy error',
@@ -0,0 +1,77 @@
+"""Time "who is free at this time" over many artists: per-artist checks vs the FreeSlotIndex.
+
+Usage: python benchmarks/artist_search.py [--artists 5000] [--bookings 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.slot_calendar import AvailabilityCalendar, SLOT_MINUTES  # noqa: E402
+from src.models.timestamps import day_and_minute, to_epoch_ms  # noqa: E402
+
+SLOT_MS = SLOT_MINUTES * 60000
+
+HOURS = [f'{h:02d}:00' for h in range(8, 19)]
+
+
+def make_calendar(artists, bookings_per_artist, first_day):
+    rng = random.Random(11)
+    calendar = AvailabilityCalendar()
+    for artist in range(artists):
+        artist_id = str(artist)
+        default_hours = sorted(rng.sample(HOURS, 7))
+        statuses = {
+            (first_day + timedelta(days=d)).isoformat(): 'unavailable'
+            for d in range(60) if rng.random() < 0.2
+        }
+        calendar.configure(artist_id, default_hours, {}, statuses)
+        for _ in range(bookings_per_artist):
+            day = first_day + timedelta(days=rng.randrange(60))
+            calendar.set_booked(artist_id, to_epoch_ms(f'{day.isoformat()}T{rng.choice(default_hours)}:00Z'), True)
+    return calendar
+
+
+def scan(calendar, moment):
+    # What a client does today: check every artist's calendar one by one
+    day, minute = day_and_minute(moment)
+    slot = minute // SLOT_MINUTES
+    return [artist_id for artist_id, artist in calendar.artists.items() if artist.free_on(day) >> slot & 1]
+
+
+def timed(label, fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f'  {label:<34} {(time.perf_counter() - started) / repeat * 1e3:>10.3f} ms/call')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--artists', type=int, default=5000)
+    parser.add_argument('--bookings', type=int, default=50)
+    args = parser.parse_args()
+
+    first_day = date(2026, 3, 2)
+    calendar = make_calendar(args.artists, args.bookings, first_day)
+    moment = to_epoch_ms('2026-03-14T14:00:00Z')
+    window = (to_epoch_ms('2026-03-14T12:00:00Z'), to_epoch_ms('2026-03-14T18:00:00Z'))
+
+    print(f'{args.artists} artists, {args.bookings} bookings each')
+    expected = timed('scan every artist', lambda: scan(calendar, moment), 20)
+    started = time.perf_counter()
+    found = calendar.free_between(moment, moment + SLOT_MS)
+    print(f"  {'index: first query (builds day)':<34} {(time.perf_counter() - started) * 1e3:>10.3f} ms")
+    assert sorted(found) == sorted(expected)
+    timed('index: single slot', lambda: calendar.free_between(moment, moment + SLOT_MS), 200)
+    timed('index: 6 hour window', lambda: calendar.free_between(*window), 50)
+    timed('index: update after a booking', lambda: calendar.set_booked('0', moment, True), 2000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Compare the day-by-day availability loops with the slot-bitmap calendar on long ranges.
+
+Usage: python benchmarks/availability.py [--days 365] [--bookings 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.slot_calendar import AvailabilityCalendar  # noqa: E402
+from src.models.timestamps import to_epoch_ms  # noqa: E402
+
+DEFAULT_HOURS = ['09:00', '10:00', '11:00', '12:00', '13:00', '14:00', '15:00', '16:00', '17:00']
+
+
+def make_artist(days, bookings, first_day):
+    rng = random.Random(7)
+    custom, statuses, booked = {}, {}, []
+    for offset in range(days):
+        day = (first_day + timedelta(days=offset)).isoformat()
+        if rng.random() < 0.3:
+            custom[day] = sorted(rng.sample(DEFAULT_HOURS, 4))
+        statuses[day] = 'unavailable' if rng.random() < 0.2 else 'available'
+    for _ in range(bookings):
+        day = first_day + timedelta(days=rng.randrange(days))
+        booked.append({'dateTime': f'{day.isoformat()}T{rng.choice(DEFAULT_HOURS)}:00Z', 'status': 'pending'})
+    return custom, statuses, booked
+
+
+def old_hours(custom, start_date, end_date):
+    availability = {}
+    current_date = datetime.strptime(start_date, '%Y-%m-%d')
+    end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
+    while current_date <= end_date_obj:
+        date_str = current_date.strftime('%Y-%m-%d')
+        availability[date_str] = custom[date_str] if date_str in custom else DEFAULT_HOURS.copy()
+        current_date += timedelta(days=1)
+    return availability
+
+
+def old_booked(bookings, start_date, end_date):
+    booked_slots = {}
+    for booking in bookings:
+        booking_date = datetime.fromisoformat(booking['dateTime'].replace('Z', '+00:00'))
+        date_str = booking_date.strftime('%Y-%m-%d')
+        if date_str < start_date or date_str > end_date:
+            continue
+        booked_slots.setdefault(date_str, []).append(booking_date.strftime('%H:%M'))
+    return booked_slots
+
+
+def old_statuses(statuses, start_date, end_date):
+    filtered = {}
+    current_date = datetime.strptime(start_date, '%Y-%m-%d')
+    end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
+    while current_date <= end_date_obj:
+        date_str = current_date.strftime('%Y-%m-%d')
+        filtered[date_str] = statuses.get(date_str, 'available')
+        current_date += timedelta(days=1)
+    return filtered
+
+
+def old_free_count(custom, statuses, bookings, start_date, end_date):
+    booked = old_booked(bookings, start_date, end_date)
+    return sum(
+        0 if statuses.get(day) == 'unavailable' else len(set(hours) - set(booked.get(day, [])))
+        for day, hours in old_hours(custom, start_date, end_date).items()
+    )
+
+
+def timed(label, fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    print(f'  {label:<28} {(time.perf_counter() - started) / repeat * 1e6:>12.1f} us/call')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--bookings', type=int, default=2000)
+    args = parser.parse_args()
+
+    first_day = date(2026, 1, 1)
+    custom, statuses, bookings = make_artist(args.days, args.bookings, first_day)
+    calendar = AvailabilityCalendar()
+    calendar.configure('1', DEFAULT_HOURS, custom, statuses)
+    for booking in bookings:
+        calendar.set_booked('1', to_epoch_ms(booking['dateTime']), True)
+
+    year = (first_day.isoformat(), (first_day + timedelta(days=args.days - 1)).isoformat())
+    quarter = (first_day.isoformat(), (first_day + timedelta(days=89)).isoformat())
+    assert old_free_count(custom, statuses, bookings, *quarter) == calendar.free_slot_count('1', *quarter)
+
+    print(f'{args.days} days, {args.bookings} bookings')
+    print('Day-by-day loops (previous handlers)')
+    timed('hours over the range', lambda: old_hours(custom, *year), 20)
+    timed('booked slots over the range', lambda: old_booked(bookings, *year), 20)
+    timed('day statuses over the range', lambda: old_statuses(statuses, *year), 20)
+    timed('free slots in a quarter', lambda: old_free_count(custom, statuses, bookings, *quarter), 20)
+    print('Slot-bitmap calendar')
+    timed('hours over the range', lambda: calendar.hours('1', *year), 200)
+    timed('booked slots over the range', lambda: calendar.booked_slots('1', *year), 200)
+    timed('day statuses over the range', lambda: calendar.day_statuses('1', *year), 200)
+    timed('free slots in a quarter', lambda: calendar.free_slot_count('1', *quarter), 2000)
+
+
+if __name__ == '__main__':
+    main()
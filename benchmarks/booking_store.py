@@ -0,0 +1,92 @@
+"""Compare the old linear booking scans with BookingStore lookups.
+
+Usage: python benchmarks/booking_store.py [--bookings 1000000] [--artists 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.booking_store import BookingStore  # noqa: E402
+from src.models.timestamps import stamp  # noqa: E402
+
+STATUSES = ('pending', 'confirmed', 'completed', 'declined')
+
+
+def make_bookings(count, artists):
+    rng = random.Random(42)
+    bookings = []
+    for i in range(1, count + 1):
+        day = rng.randrange(365)
+        bookings.append(stamp({
+            'id': str(i),
+            'artistId': str(rng.randrange(artists)),
+            'clientName': f'Client {i}',
+            'clientEmail': f'Client{i % (count // 4 or 1)}@Example.com',
+            'dateTime': f'2025-{1 + day // 31 % 12:02d}-{1 + day % 28:02d}T{9 + i % 9:02d}:00:00Z',
+            'service': 'Workshop Session',
+            'message': '',
+            'status': STATUSES[i % 4],
+            'createdAt': f'2025-01-01T00:00:{i % 60:02d}Z',
+            'createdAtMs': 1735689600000 + i % 60 * 1000,
+        }, 'dateTime'))
+    return bookings
+
+
+def timed(label, fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_call = (time.perf_counter() - started) / repeat
+    print(f'  {label:<32} {per_call * 1e6:>14.1f} us/call')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bookings', type=int, default=1_000_000)
+    parser.add_argument('--artists', type=int, default=5000)
+    args = parser.parse_args()
+
+    bookings = make_bookings(args.bookings, args.artists)
+    started = time.perf_counter()
+    store = BookingStore(bookings)
+    print(f'Indexed {len(store)} bookings in {time.perf_counter() - started:.2f}s')
+
+    target = bookings[len(bookings) // 2]
+    artist_id, email, date_time = target['artistId'], target['clientEmail'], target['dateTime']
+
+    print('Linear scans (previous handlers)')
+    timed('get by id', lambda: next((b for b in bookings if b['id'] == target['id']), None), 5)
+    timed('duplicate slot check', lambda: any(
+        b['artistId'] == artist_id and b['dateTime'] == date_time and b['status'] in ('pending', 'confirmed')
+        for b in bookings
+    ), 5)
+    timed('artist + status filter', lambda: [
+        b for b in [b for b in bookings if b['artistId'] == artist_id] if b['status'] == 'pending'
+    ], 5)
+    timed('newest 20 of all bookings', lambda: sorted(bookings, key=lambda b: b['createdAt'], reverse=True)[:20], 5)
+    timed('user bookings by email', lambda: [b for b in bookings if b['clientEmail'].lower() == email.lower()], 5)
+    timed('active bookings of artist', lambda: [
+        b for b in bookings if b['artistId'] == artist_id and b['status'] in ('pending', 'confirmed')
+    ], 5)
+    timed('artist status counts', lambda: [
+        len([b for b in [b for b in bookings if b['artistId'] == artist_id] if b['status'] == status])
+        for status in ('pending', 'confirmed', 'completed', 'declined')
+    ], 5)
+
+    print('BookingStore')
+    timed('get by id', lambda: store.get(target['id']), 100000)
+    timed('duplicate slot check', lambda: store.active_at(artist_id, target['dateTimeMs']), 100000)
+    timed('artist + status filter', lambda: store.find(artist_id=artist_id, status='pending'), 10000)
+    timed('newest 20 of all bookings', lambda: store.page(limit=20), 10000)
+    timed('user bookings by email', lambda: store.for_email(email), 10000)
+    timed('active bookings of artist', lambda: store.active_for_artist(artist_id), 10000)
+    timed('artist status counts', lambda: store.stats.for_artist(artist_id), 100000)
+    timed('artist counts, last 90 days', lambda: store.stats.for_window(artist_id, 90, 1735689600000 + 30 * 86400000), 10000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Compare per-request contribution scans with the aggregates CampaignStore maintains.
+
+Usage: python benchmarks/campaigns.py [--contributions 1000000] [--campaigns 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.campaign_store import CampaignStore  # noqa: E402
+
+
+def make_records(campaign_count, contribution_count):
+    rng = random.Random(5)
+    campaigns = [{
+        'id': str(i),
+        'artistId': str(i % 20),
+        'targetAmount': 10000,
+        'currentAmount': 0,
+        'status': 'active',
+        'createdAtMs': 1751328000000,
+    } for i in range(1, campaign_count + 1)]
+    contributions = [{
+        'id': str(i),
+        'campaignId': str(rng.randrange(1, campaign_count + 1)),
+        'contributorEmail': f'fan{rng.randrange(contribution_count // 10 or 1)}@example.com',
+        'amount': rng.randrange(5, 500),
+        'createdAt': '2025-07-01T00:00:00Z',
+        'createdAtMs': 1751328000000 + i * 1000,
+    } for i in range(1, contribution_count + 1)]
+    return campaigns, contributions
+
+
+def timed(label, fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    print(f'  {label:<36} {(time.perf_counter() - started) / repeat * 1e6:>14.1f} us/call')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--contributions', type=int, default=1_000_000)
+    parser.add_argument('--campaigns', type=int, default=200)
+    args = parser.parse_args()
+
+    campaigns, contributions = make_records(args.campaigns, args.contributions)
+    started = time.perf_counter()
+    store = CampaignStore(campaigns, contributions)
+    print(f'Loaded {len(store)} campaigns, {store.contribution_count()} contributions '
+          f'in {time.perf_counter() - started:.2f}s')
+    campaign_id = campaigns[len(campaigns) // 2]['id']
+
+    print('Scanning contributions (previous handlers)')
+    timed('get_campaign contributionsCount', lambda: len(
+        [c for c in contributions if c['campaignId'] == campaign_id]
+    ), 5)
+    timed('contributions totalAmount', lambda: sum(
+        c['amount'] for c in contributions if c['campaignId'] == campaign_id
+    ), 5)
+    timed('unique contributors', lambda: len(
+        {c['contributorEmail'].lower() for c in contributions if c['campaignId'] == campaign_id}
+    ), 5)
+    print('CampaignStore aggregates')
+    timed('get_campaign contributionsCount', lambda: store.aggregate(campaign_id)['contributionsCount'], 100000)
+    timed('all aggregates of one campaign', lambda: store.aggregate(campaign_id), 100000)
+    timed('aggregates for every campaign', lambda: [store.aggregate(c['id']) for c in campaigns], 100)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Cost of an unchanged poll: full listing vs a 304 answered from the version counters.
+
+Usage: python benchmarks/conditional_get.py [--bookings 5000] [--polls 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from src.models.timestamps import stamp  # noqa: E402
+from src.routes import bookings  # noqa: E402
+
+
+def load_bookings(count):
+    for i in range(count):
+        bookings.booking_store.add(stamp({
+            'id': f'bench-{i}',
+            'artistId': str(i % 50),
+            'clientName': f'Client {i}',
+            'clientEmail': f'client{i % 20}@example.com',
+            'dateTime': f'2031-02-{i % 28 + 1:02d}T{9 + i % 9:02d}:00:00Z',
+            'service': 'Workshop Session',
+            'message': 'Benchmark booking',
+            'status': 'pending',
+            'createdAt': '2026-01-01T00:00:00Z',
+            'createdAtMs': 1767225600000 + i,
+        }, 'dateTime'))
+
+
+def timed(label, fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        response = fn()
+    print(f'  {label:<40} {(time.perf_counter() - started) / repeat * 1e3:>8.3f} ms/poll '
+          f'{response.status_code} {len(response.data):>9} bytes')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bookings', type=int, default=5000)
+    parser.add_argument('--polls', type=int, default=200)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.register_blueprint(bookings.bookings_bp)
+    client = app.test_client()
+    load_bookings(args.bookings)
+
+    for url in ('/api/v1/bookings', '/api/v1/bookings/user/client7@example.com', '/api/v1/campaigns'):
+        etag = client.get(url).headers['ETag']
+        print(url)
+        timed('full response', lambda: client.get(url), args.polls)
+        timed('If-None-Match, unchanged', lambda: client.get(url, headers={'If-None-Match': etag}), args.polls)
+    print('Hit ratio', client.get('/api/v1/metrics').get_json()['conditionalGet']['hitRatio'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Throughput of replaying contributions one POST at a time vs one batch request.
+
+Usage: python benchmarks/contribution_batch.py [--rows 10000] [--campaigns 20]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from src.routes import bookings  # noqa: E402
+
+
+def make_app():
+    app = Flask(__name__)
+    app.register_blueprint(bookings.bookings_bp)
+    return app.test_client()
+
+
+def make_campaigns(client, count):
+    ids = []
+    for i in range(count):
+        response = client.post('/api/v1/campaigns', json={
+            'artistId': str(i % 5 + 1),
+            'title': f'Campaign {i}',
+            'description': 'Benchmark campaign',
+            'targetAmount': 1000000,
+            'deadline': '2099-12-31T23:59:59Z',
+        })
+        ids.append(response.get_json()['campaign']['id'])
+    return ids
+
+
+def make_rows(campaign_ids, count):
+    rng = random.Random(17)
+    return [{
+        'campaignId': rng.choice(campaign_ids),
+        'contributorName': f'Fan {i}',
+        'contributorEmail': f'fan{rng.randrange(count // 4 or 1)}@example.com',
+        'amount': rng.randrange(5, 500),
+    } for i in range(count)]
+
+
+def timed(label, fn, rows):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f'  {label:<28} {elapsed:>8.2f}s {rows / elapsed:>12.0f} rows/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--campaigns', type=int, default=20)
+    args = parser.parse_args()
+
+    client = make_app()
+    campaign_ids = make_campaigns(client, args.campaigns)
+    rows = make_rows(campaign_ids, args.rows)
+    ndjson = '\n'.join(json.dumps(row) for row in rows)
+
+    def single():
+        for row in rows:
+            assert client.post('/api/v1/contributions', json=row).status_code == 201
+
+    def batch_json():
+        assert client.post('/api/v1/contributions/batch', json=rows).get_json()['created'] == len(rows)
+
+    def batch_ndjson():
+        response = client.post('/api/v1/contributions/batch', data=ndjson, content_type='application/x-ndjson')
+        assert response.get_json()['created'] == len(rows)
+
+    print(f'{args.rows} contributions over {args.campaigns} campaigns')
+    timed('single POSTs', single, args.rows)
+    timed('batch, JSON array', batch_json, args.rows)
+    timed('batch, NDJSON', batch_ndjson, args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Request-thread cost and throughput of inline SMTP sends vs the outbox with persistent connections.
+
+Usage: python benchmarks/email_outbox.py [--emails 200] [--connect-ms 50] [--message-ms 5]
+"""
+import argparse
+import os
+import smtplib
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from smtp_sink import SmtpSink  # noqa: E402
+from src.services.email_outbox import EmailOutbox, SmtpTransport, build_message  # noqa: E402
+
+SENDER = 'MACS Platform <noreply@macsplatform.com>'
+HTML = '<html><body>' + '<p>Your booking is confirmed.</p>' * 40 + '</body></html>'
+
+
+def inline(sink, emails):
+    # The commented-out path in EmailService.send_email: connect, send, quit per email
+    for i in range(emails):
+        server = smtplib.SMTP('127.0.0.1', sink.port)
+        server.send_message(build_message(SENDER, f'client{i}@example.com', 'Booking Confirmed', HTML))
+        server.quit()
+
+
+def outbox_run(sink, emails, workers):
+    outbox = EmailOutbox(lambda: SmtpTransport('127.0.0.1', sink.port, None, None, starttls=False),
+                         SENDER, workers=workers)
+    started = time.perf_counter()
+    for i in range(emails):
+        outbox.enqueue(f'client{i}@example.com', 'Booking Confirmed', HTML)
+    enqueued = time.perf_counter() - started
+    outbox.flush()
+    return enqueued, time.perf_counter() - started, outbox.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--emails', type=int, default=200)
+    parser.add_argument('--connect-ms', type=float, default=50, help='greeting delay standing in for TLS and login')
+    parser.add_argument('--message-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    sink = SmtpSink(connect_delay=args.connect_ms / 1000, message_delay=args.message_ms / 1000).start()
+    print(f'{args.emails} emails, {args.connect_ms}ms per connection, {args.message_ms}ms per message')
+    print(f"  {'':<26} {'request ms':>10} {'total s':>8} {'emails/s':>9} {'connections':>12}")
+
+    before = sink.connections
+    started = time.perf_counter()
+    inline(sink, args.emails)
+    elapsed = time.perf_counter() - started
+    print(f"  {'inline, connect per email':<26} {elapsed / args.emails * 1e3:>10.3f} {elapsed:>8.2f} "
+          f"{args.emails / elapsed:>9.0f} {sink.connections - before:>12}")
+
+    for workers in (1, 4, 8):
+        before = sink.connections
+        enqueued, elapsed, stats = outbox_run(sink, args.emails, workers)
+        assert stats['sent'] == args.emails
+        print(f"  {f'outbox, {workers} workers':<26} {enqueued / args.emails * 1e3:>10.3f} {elapsed:>8.2f} "
+              f"{args.emails / elapsed:>9.0f} {sink.connections - before:>12}")
+    sink.stop()
+
+
+if __name__ == '__main__':
+    main()
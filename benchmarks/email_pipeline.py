@@ -0,0 +1,204 @@
+"""Load test of the whole email path: EmailService render, outbox, SMTP transport, into a local sink.
+
+Usage: python benchmarks/email_pipeline.py [--messages 2000] [--producers 4] [--workers 2] [--rate 0]
+       [--mix confirmation=5,notification=3,status=2] [--outbox sqlite|memory] [--alloc-messages 200]
+
+Starts the in-process SMTP sink from smtp_sink.py, points EmailService at it through
+the same environment variables production uses, and calls the send_* methods from
+--producers threads. Latency is measured from the send_* call to the sink receiving
+the message; allocation is measured separately, one message at a time, under tracemalloc.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from smtp_sink import SmtpSink  # noqa: E402
+
+KINDS = ('confirmation', 'notification', 'status')
+SERVICES = ['Portrait Session', 'Music Lesson', 'Live Performance', 'Mural Consultation']
+DOMAINS = ['example.com', 'mail.test', 'inbox.test', 'post.test']
+
+
+def configure(sink, args, directory):
+    """The EmailService settings for this run, set before the service is created"""
+    os.environ.update({
+        'EMAIL_TRANSPORT': 'smtp',
+        'SMTP_SERVER': '127.0.0.1',
+        'SMTP_PORT': str(sink.port),
+        'SMTP_STARTTLS': 'on' if args.starttls else 'off',
+        'EMAIL_PASSWORD': '',
+        'EMAIL_WORKERS': str(args.workers),
+        'EMAIL_OUTBOX': args.outbox,
+        'EMAIL_OUTBOX_PATH': os.path.join(directory, 'outbox.db'),
+        'EMAIL_RATE_PER_SECOND': '1000000',
+        'EMAIL_DOMAIN_RATE_PER_SECOND': '1000000',
+        'EMAIL_DIGEST': 'off'
+    })
+
+
+def parse_mix(text):
+    weights = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in KINDS:
+            raise SystemExit(f'Unknown message kind {kind!r}; expected one of {", ".join(KINDS)}')
+        weights[kind] = float(weight or 1)
+    return weights
+
+
+def make_plan(count, weights, seed):
+    """(kind, booking, recipient) per message; every recipient is unique, to match sink receipts"""
+    from src.models.timestamps import stamp
+
+    rng = random.Random(seed)
+    kinds = rng.choices(list(weights), weights=list(weights.values()), k=count)
+    plan = []
+    for i, kind in enumerate(kinds):
+        domain = DOMAINS[i % len(DOMAINS)]
+        booking = stamp({
+            'id': str(i),
+            'clientName': f'Client {i}',
+            'clientEmail': f'client{i}@{domain}',
+            'service': rng.choice(SERVICES),
+            'message': f'Looking forward to the session & hoping {rng.randrange(9, 18)}:00 works',
+            'dateTime': f'2026-08-{rng.randrange(1, 29):02d}T{rng.randrange(9, 18):02d}:00:00Z',
+        }, 'dateTime')
+        recipient = f'artist{i}@{domain}' if kind == 'notification' else booking['clientEmail']
+        plan.append((kind, booking, recipient))
+    return plan
+
+
+def send(service, kind, booking, recipient):
+    if kind == 'confirmation':
+        return service.send_booking_confirmation_to_client(booking, 'Maya Chen')
+    if kind == 'notification':
+        return service.send_booking_notification_to_artist(booking, recipient, 'Maya Chen')
+    status = 'confirmed' if int(booking['id']) % 2 else 'declined'
+    return service.send_booking_status_update_to_client(booking, 'Maya Chen', status)
+
+
+def wait_for(sink, count, timeout):
+    deadline = time.monotonic() + timeout
+    while len(sink.messages) < count:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else float('nan')
+
+
+def load_run(service, sink, plan, producers, rate, timeout):
+    started = {}
+    call_times = []
+    lock = threading.Lock()
+    cursor = iter(range(len(plan)))
+
+    def produce():
+        while True:
+            with lock:
+                i = next(cursor, None)
+            if i is None:
+                return
+            kind, booking, recipient = plan[i]
+            if rate:
+                # Open loop: message i is due i / rate seconds in, however the earlier ones went
+                time.sleep(max(0.0, first + i / rate - time.monotonic()))
+            begin = time.monotonic()
+            send(service, kind, booking, recipient)
+            end = time.monotonic()
+            with lock:
+                started[recipient] = begin
+                call_times.append(end - begin)
+
+    first = time.monotonic()
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    complete = wait_for(sink, len(plan), timeout)
+    received = sink.received()
+
+    latencies = [at - started[recipients[0]] for recipients, _, at in received if recipients[0] in started]
+    elapsed = max(at for _, _, at in received) - first if received else float('nan')
+    print(f'  delivered {len(received)}/{len(plan)} in {elapsed:.2f} s'
+          f'{"" if complete else " (timed out waiting for the rest)"}'
+          f' over {sink.connections} SMTP connections')
+    print(f'  throughput          {len(received) / elapsed:>10,.0f} messages/s')
+    print(f'  send_* call         p50 {percentile(call_times, 0.5) * 1e3:>8.3f} ms   p99 {percentile(call_times, 0.99) * 1e3:>8.3f} ms')
+    print(f'  call to delivery    p50 {percentile(latencies, 0.5) * 1e3:>8.3f} ms   p99 {percentile(latencies, 0.99) * 1e3:>8.3f} ms')
+
+
+def allocation_run(service, sink, plan, timeout):
+    """Peak and retained traced memory per message, sending one at a time through the whole path"""
+    sink_file = os.path.abspath(sys.modules[SmtpSink.__module__].__file__)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    peaks = []
+    for kind, booking, recipient in plan:
+        target = len(sink.messages) + 1
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        send(service, kind, booking, recipient)
+        wait_for(sink, target, timeout)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # What the sink keeps of each message is the stand-in's memory, not the pipeline's
+    ignore = [tracemalloc.Filter(False, sink_file), tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained = sum(stat.size_diff for stat in after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'filename'))
+    print(f'  {len(plan)} messages one at a time under tracemalloc')
+    print(f'  peak allocation     avg {sum(peaks) / len(peaks) / 1024:>8.1f} KiB   '
+          f'p99 {percentile(peaks, 0.99) / 1024:>8.1f} KiB per message')
+    print(f'  retained            {retained / len(plan):>8.0f} bytes per message (excluding the sink)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--producers', type=int, default=4, help='threads calling the send_* methods')
+    parser.add_argument('--workers', type=int, default=2, help='outbox workers, each with one SMTP connection')
+    parser.add_argument('--rate', type=float, default=0.0, help='messages/s offered overall; 0 sends as fast as possible')
+    parser.add_argument('--mix', default='confirmation=5,notification=3,status=2')
+    parser.add_argument('--outbox', choices=['sqlite', 'memory'], default='sqlite')
+    parser.add_argument('--starttls', action='store_true', help='issue STARTTLS (the sink does not support it)')
+    parser.add_argument('--message-ms', type=float, default=0.0, help='sink delay per message')
+    parser.add_argument('--alloc-messages', type=int, default=200)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    sink = SmtpSink(message_delay=args.message_ms / 1000).start()
+    with tempfile.TemporaryDirectory() as directory:
+        configure(sink, args, directory)
+        from src.services.email_service import EmailService
+
+        service = EmailService()
+        mix = ', '.join(f'{kind} {weight:g}' for kind, weight in weights.items())
+        pace = f'{args.rate:g}/s' if args.rate else 'unpaced'
+        print(f'{args.messages} messages ({mix}), {pace}, {args.producers} producers, '
+              f'{args.workers} workers, {args.outbox} outbox')
+        load_run(service, sink, make_plan(args.messages, weights, 1), args.producers, args.rate, args.timeout)
+
+        if args.alloc_messages:
+            with sink.lock:
+                sink.messages.clear()
+            allocation_run(service, sink, make_plan(args.alloc_messages, weights, 2), args.timeout)
+    sink.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""Renders per second of the booking emails: the old per-call f-strings vs the compiled Jinja2 templates.
+
+Usage: python benchmarks/email_templates.py [--bookings 2000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.timestamps import moment_of, stamp  # noqa: E402
+from src.services.email_templates import EmailTemplates  # noqa: E402
+
+
+def legacy_confirmation(booking_data, artist_name):
+    """The pre-template confirmation email, as an f-string rebuilt per call"""
+    booking_date = moment_of(booking_data, 'dateTime')
+    formatted_date = booking_date.strftime('%A, %B %d, %Y')
+    formatted_time = booking_date.strftime('%I:%M %p')
+    
+    subject = f"Booking Request Submitted - {artist_name}"
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background: linear-gradient(135deg, #3B82F6, #1E40AF); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
+            .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 10px 10px; }}
+            .booking-details {{ background: white; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #3B82F6; }}
+            .status-badge {{ background: #FEF3C7; color: #92400E; padding: 8px 16px; border-radius: 20px; display: inline-block; font-weight: bold; }}
+            .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 14px; }}
+            .button {{ background: #3B82F6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin: 10px 0; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎨 MACS Platform</h1>
+                <h2>Booking Request Submitted!</h2>
+            </div>
+            <div class="content">
+                <p>Hi {booking_data['clientName']},</p>
+                
+                <p>Thank you for your booking request! We've successfully received your request and it has been sent to <strong>{artist_name}</strong> for review.</p>
+                
+                <div class="booking-details">
+                    <h3>📅 Booking Details</h3>
+                    <p><strong>Artist:</strong> {artist_name}</p>
+                    <p><strong>Service:</strong> {booking_data['service']}</p>
+                    <p><strong>Date:</strong> {formatted_date}</p>
+                    <p><strong>Time:</strong> {formatted_time}</p>
+                    <p><strong>Status:</strong> <span class="status-badge">⏳ Awaiting Confirmation</span></p>
+                </div>
+                
+                <div style="background: #EBF8FF; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                    <h4>💬 Your Message:</h4>
+                    <p style="font-style: italic;">"{booking_data['message']}"</p>
+                </div>
+                
+                <h3>🔔 What happens next?</h3>
+                <ul>
+                    <li>The artist will review your request within 24 hours</li>
+                    <li>You'll receive an email notification when they respond</li>
+                    <li>You can track your booking status in your MACS dashboard</li>
+                </ul>
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="https://macsplatform.com/my-bookings" class="button">View My Bookings</a>
+                </div>
+                
+                <p>If you have any questions, feel free to reach out to us or contact the artist directly.</p>
+                
+                <p>Best regards,<br>The MACS Platform Team</p>
+            </div>
+            <div class="footer">
+                <p>This is an automated message from MACS Platform.<br>
+                Visit us at <a href="https://macsplatform.com">macsplatform.com</a></p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return subject, html_content
+
+
+def legacy_artist_notification(booking_data, artist_name):
+    """The pre-template artist notification"""
+    booking_date = moment_of(booking_data, 'dateTime')
+    formatted_date = booking_date.strftime('%A, %B %d, %Y')
+    formatted_time = booking_date.strftime('%I:%M %p')
+    
+    subject = f"New Booking Request from {booking_data['clientName']}"
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background: linear-gradient(135deg, #10B981, #059669); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
+            .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 10px 10px; }}
+            .booking-details {{ background: white; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #10B981; }}
+            .client-info {{ background: #F0FDF4; padding: 15px; border-radius: 8px; margin: 15px 0; }}
+            .action-buttons {{ text-align: center; margin: 30px 0; }}
+            .button {{ padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin: 0 10px; font-weight: bold; }}
+            .accept-btn {{ background: #10B981; color: white; }}
+            .decline-btn {{ background: #EF4444; color: white; }}
+            .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 14px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎨 MACS Platform</h1>
+                <h2>New Booking Request!</h2>
+            </div>
+            <div class="content">
+                <p>Hi {artist_name},</p>
+                
+                <p>You have received a new booking request! A client is interested in your services and would like to schedule a session.</p>
+                
+                <div class="client-info">
+                    <h3>👤 Client Information</h3>
+                    <p><strong>Name:</strong> {booking_data['clientName']}</p>
+                    <p><strong>Email:</strong> {booking_data['clientEmail']}</p>
+                </div>
+                
+                <div class="booking-details">
+                    <h3>📅 Requested Booking</h3>
+                    <p><strong>Service:</strong> {booking_data['service']}</p>
+                    <p><strong>Date:</strong> {formatted_date}</p>
+                    <p><strong>Time:</strong> {formatted_time}</p>
+                </div>
+                
+                <div style="background: #FEF3C7; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                    <h4>💬 Client's Message:</h4>
+                    <p style="font-style: italic;">"{booking_data['message']}"</p>
+                </div>
+                
+                <div class="action-buttons">
+                    <a href="https://macsplatform.com/dashboard/bookings" class="button accept-btn">✅ Review & Respond</a>
+                </div>
+                
+                <div style="background: #EBF8FF; padding: 20px; border-radius: 8px; margin: 20px 0;">
+                    <h4>⏰ Response Time</h4>
+                    <p>Please respond to this booking request within 24 hours to maintain a good response rate. Clients appreciate quick responses!</p>
+                </div>
+                
+                <p>You can accept or decline this booking request from your artist dashboard.</p>
+                
+                <p>Best regards,<br>The MACS Platform Team</p>
+            </div>
+            <div class="footer">
+                <p>This is an automated message from MACS Platform.<br>
+                Visit your dashboard at <a href="https://macsplatform.com/dashboard">macsplatform.com/dashboard</a></p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return subject, html_content
+
+
+def legacy_status_update(booking_data, artist_name, status):
+    """The pre-template status update"""
+    booking_date = moment_of(booking_data, 'dateTime')
+    formatted_date = booking_date.strftime('%A, %B %d, %Y')
+    formatted_time = booking_date.strftime('%I:%M %p')
+    
+    if status == 'confirmed':
+        subject = f"Booking Confirmed - {artist_name}"
+        status_color = "#10B981"
+        status_text = "✅ Confirmed"
+        message = f"Great news! {artist_name} has confirmed your booking request."
+        next_steps = """
+        <h3>🎉 What's next?</h3>
+        <ul>
+            <li>Your booking is now confirmed and secured</li>
+            <li>The artist may contact you directly with additional details</li>
+            <li>Please arrive on time for your scheduled session</li>
+            <li>Bring any materials or references discussed</li>
+        </ul>
+        """
+    else:  # declined
+        subject = f"Booking Update - {artist_name}"
+        status_color = "#EF4444"
+        status_text = "❌ Declined"
+        message = f"Unfortunately, {artist_name} is not available for your requested time slot."
+        next_steps = """
+        <h3>💡 What you can do:</h3>
+        <ul>
+            <li>Try booking a different date or time</li>
+            <li>Contact the artist directly to discuss alternatives</li>
+            <li>Browse other talented artists on MACS Platform</li>
+        </ul>
+        """
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background: linear-gradient(135deg, #3B82F6, #1E40AF); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
+            .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 10px 10px; }}
+            .booking-details {{ background: white; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid {status_color}; }}
+            .status-badge {{ background: {status_color}; color: white; padding: 8px 16px; border-radius: 20px; display: inline-block; font-weight: bold; }}
+            .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 14px; }}
+            .button {{ background: #3B82F6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin: 10px 0; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎨 MACS Platform</h1>
+                <h2>Booking Status Update</h2>
+            </div>
+            <div class="content">
+                <p>Hi {booking_data['clientName']},</p>
+                
+                <p>{message}</p>
+                
+                <div class="booking-details">
+                    <h3>📅 Booking Details</h3>
+                    <p><strong>Artist:</strong> {artist_name}</p>
+                    <p><strong>Service:</strong> {booking_data['service']}</p>
+                    <p><strong>Date:</strong> {formatted_date}</p>
+                    <p><strong>Time:</strong> {formatted_time}</p>
+                    <p><strong>Status:</strong> <span class="status-badge">{status_text}</span></p>
+                </div>
+                
+                {next_steps}
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="https://macsplatform.com/my-bookings" class="button">View My Bookings</a>
+                </div>
+                
+                <p>Thank you for using MACS Platform to connect with amazing artists!</p>
+                
+                <p>Best regards,<br>The MACS Platform Team</p>
+            </div>
+            <div class="footer">
+                <p>This is an automated message from MACS Platform.<br>
+                Visit us at <a href="https://macsplatform.com">macsplatform.com</a></p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return subject, html_content
+
+
+def make_bookings(count):
+    rng = random.Random(5)
+    services = ['Portrait Session', 'Music Lesson', 'Live Performance', 'Mural Consultation']
+    return [stamp({
+        'id': str(i),
+        'clientName': f'Client {i}',
+        'clientEmail': f'client{i}@example.com',
+        'service': rng.choice(services),
+        'message': f'Looking forward to it & hoping the "{rng.choice(services)}" slot works <3',
+        'dateTime': f'2026-08-{rng.randrange(1, 29):02d}T{rng.randrange(9, 18):02d}:00:00Z',
+    }, 'dateTime') for i in range(count)]
+
+
+def legacy_all(bookings):
+    for booking in bookings:
+        legacy_confirmation(booking, 'Maya Chen')
+        legacy_artist_notification(booking, 'Maya Chen')
+        legacy_status_update(booking, 'Maya Chen', 'confirmed')
+
+
+def templates_all(templates):
+    def run(bookings):
+        for booking in bookings:
+            templates.render('booking_confirmation', booking, artist_name='Maya Chen')
+            templates.render('artist_notification', booking, artist_name='Maya Chen')
+            templates.render('status_confirmed', booking, artist_name='Maya Chen')
+    return run
+
+
+def templates_many(templates):
+    def run(bookings):
+        for variant in ('booking_confirmation', 'artist_notification', 'status_confirmed'):
+            templates.render_many(variant, bookings, artist_name='Maya Chen')
+    return run
+
+
+def timed(label, fn, bookings, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(bookings)
+    elapsed = time.perf_counter() - started
+    renders = len(bookings) * 3 * repeat
+    print(f'  {label:<36} {renders / elapsed:>12,.0f} renders/s')
+    return renders / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bookings', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bookings = make_bookings(args.bookings)
+    started = time.perf_counter()
+    templates = EmailTemplates()
+    print(f'Compiling templates and fragments: {(time.perf_counter() - started) * 1e3:.1f} ms (once, at startup)')
+
+    print(f'{args.bookings} bookings x 3 emails, {args.repeat} repeats')
+    before = timed('f-strings (before)', legacy_all, bookings, args.repeat)
+    after = timed('templates.render', templates_all(templates), bookings, args.repeat)
+    many = timed('templates.render_many', templates_many(templates), bookings, args.repeat)
+    print(f'  render {after / before:.2f}x, render_many {many / before:.2f}x the f-string rate')
+
+    html = templates.render('booking_confirmation', bookings[0], artist_name='Maya Chen')
+    assert '&amp; hoping the &#34;' in html and '&lt;3' in html, 'user data was not escaped'
+    print('  user data is escaped in the template output')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Journal write cost with and without group commit, and recovery time from journal and snapshot.
+
+Usage: python benchmarks/journal.py [--records 1000000] [--writes 2000] [--threads 16] [--dir /tmp/macs-journal]
+"""
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.journal import JournalStorage  # noqa: E402
+from src.models.storage import Storage  # noqa: E402
+
+
+def booking(i, status='pending'):
+    return {
+        'id': str(i),
+        'artistId': str(i % 5000),
+        'clientName': f'Client {i}',
+        'clientEmail': f'client{i % 250000}@example.com',
+        'dateTime': f'2026-{1 + i % 12:02d}-{1 + i % 28:02d}T{9 + i % 9:02d}:00:00Z',
+        'service': 'Workshop Session',
+        'message': '',
+        'status': status,
+        'createdAt': '2026-01-01T00:00:00Z',
+        'createdAtMs': 1767225600000 + i,
+    }
+
+
+def fresh(directory):
+    shutil.rmtree(directory, ignore_errors=True)
+    return directory
+
+
+def writes_per_second(storage, writes, threads):
+    per_thread = writes // threads
+
+    def worker(t):
+        for i in range(per_thread):
+            storage.save_booking(booking(t * per_thread + i))
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    started = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f'  {label:<44} {time.perf_counter() - started:>8.2f}s')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--writes', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--dir', default='/tmp/macs-journal')
+    args = parser.parse_args()
+
+    print(f'Writes/s, {args.writes} bookings saved')
+    print(f"  {'':<28} {'1 thread':>10} {f'{args.threads} threads':>12}")
+    for label, make in (
+        ('no storage', lambda: Storage()),
+        ('journal, fsync per write', lambda: JournalStorage(fresh(args.dir), group_commit=False)),
+        ('journal, group commit', lambda: JournalStorage(fresh(args.dir))),
+    ):
+        rates = [writes_per_second(make(), args.writes, threads) for threads in (1, args.threads)]
+        print(f'  {label:<28} {rates[0]:>10.0f} {rates[1]:>12.0f}')
+
+    print(f'Recovery of {args.records} bookings')
+    journal = JournalStorage(fresh(args.dir), snapshot_every=args.records * 10)
+    timed('write journal (one group commit)', lambda: journal.seed(
+        [booking(i) for i in range(args.records)], [], [], {}, {}))
+    tail = args.records // 100
+    for i in range(tail):
+        journal.save_booking(booking(i, 'confirmed'))
+    journal.close()
+    records = timed(f'load from journal ({args.records + tail} entries)', lambda: JournalStorage(args.dir).load())
+    assert len(records['bookings']) == args.records
+
+    journal = JournalStorage(args.dir, snapshot_every=args.records * 10)
+    journal.load()
+    timed('take snapshot', journal.snapshot)
+    for i in range(tail):
+        journal.save_booking(booking(i, 'completed'))
+    journal.close()
+    records = timed(f'load snapshot + {tail} entry tail', lambda: JournalStorage(args.dir).load())
+    assert len(records['bookings']) == args.records and records['bookings'][0]['status'] == 'completed'
+    shutil.rmtree(args.dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
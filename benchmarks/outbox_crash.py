@@ -0,0 +1,169 @@
+"""Kill and restart the SQLite email outbox's dispatcher mid-run and check every email arrives once.
+
+Usage: python benchmarks/outbox_crash.py [--emails 500] [--kills 8] [--domain-rate 20]
+
+A killed dispatcher may have sent a message without marking it sent, so a resend is
+allowed only for a message first delivered while a killed process was running, and
+at most one per dispatcher thread per kill. The lease run makes each claimed batch
+take longer than the lease and requires no resends at all.
+"""
+import argparse
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from smtp_sink import SmtpSink  # noqa: E402
+from src.services.durable_outbox import CLAIM_BATCH, DurableOutbox  # noqa: E402
+from src.services.email_outbox import SmtpTransport  # noqa: E402
+
+SENDER = 'MACS Platform <noreply@macsplatform.com>'
+DOMAINS = ['example.com', 'example.org', 'example.net', 'mail.test', 'inbox.test']
+MESSAGE_ID = re.compile(rb'^Message-ID: (\S+)', re.MULTILINE | re.IGNORECASE)
+
+
+def make_outbox(path, port, workers=0, rate=1000, domain_rate=1000, lease_ms=500):
+    return DurableOutbox(path, lambda: SmtpTransport('127.0.0.1', port, None, None, starttls=False), SENDER,
+                         workers=workers, rate=rate, burst=rate, domain_rate=domain_rate, domain_burst=5,
+                         backoff=0.05, lease_ms=lease_ms)
+
+
+WORKERS = 2
+# Slack for a message the sink finished receiving just after the kill
+KILL_SLACK = 0.1
+
+
+def dispatch(path, port, rate, domain_rate, lease_ms):
+    """Child process: run the dispatchers until the outbox is drained"""
+    outbox = make_outbox(path, port, workers=WORKERS, rate=rate, domain_rate=domain_rate, lease_ms=lease_ms)
+    outbox.start()
+    outbox.flush()
+
+
+def spawn(path, port, rate=1000, domain_rate=1000, lease_ms=500):
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), '--dispatch', path, str(port),
+                             str(rate), str(domain_rate), str(lease_ms)])
+
+
+def deliveries(sink):
+    """Message-ID -> the sink's receive times, in order"""
+    times = {}
+    for _, data, received in sink.received():
+        times.setdefault(MESSAGE_ID.search(data).group(1).decode(), []).append(received)
+    return times
+
+
+def crash_run(sink, directory, emails, kills):
+    path = os.path.join(directory, 'crash.db')
+    outbox = make_outbox(path, sink.port)
+    for i in range(emails):
+        outbox.enqueue(f'client{i}@{DOMAINS[i % len(DOMAINS)]}', f'Booking {i}', f'<p>Booking {i} confirmed</p>')
+    expected = {row[0] for row in outbox._db().execute('SELECT message_id FROM email_outbox')}
+
+    started = time.perf_counter()
+    rng = random.Random(9)
+    killed = []  # (spawned, killed) on the sink's monotonic clock
+    for _ in range(kills):
+        child = spawn(path, sink.port)
+        spawned = time.monotonic()
+        time.sleep(rng.uniform(0.05, 0.3))
+        child.send_signal(signal.SIGKILL)
+        killed.append((spawned, time.monotonic()))
+        child.wait()
+    child = spawn(path, sink.port)
+    child.wait()
+    elapsed = time.perf_counter() - started
+
+    times = deliveries(sink)
+    states = outbox.stats()['states']
+    # Every delivery but a message's last must come from a process that was then killed
+    resends = Counter()
+    for received in times.values():
+        for at in received[:-1]:
+            window = next((i for i, (first, last) in enumerate(killed) if first <= at <= last + KILL_SLACK), None)
+            assert window is not None, 'a message was sent twice outside a killed dispatcher'
+            resends[window] += 1
+    resent = sum(resends.values())
+    print(f'  {emails} emails, {kills} kills, drained in {elapsed:.2f}s; outbox states {states}')
+    print(f'  delivered {len(times)} distinct Message-IDs, {len(expected - set(times))} missing, '
+          f'{resent} resent, all by killed dispatchers (at most {max(resends.values(), default=0)} per kill)')
+    assert set(times) == expected and states['sent'] == emails
+    assert max(resends.values(), default=0) <= WORKERS
+
+
+def lease_run(sink, directory, emails, lease_ms):
+    """Batches that take longer than the lease to send: renewals must keep them from being sent twice"""
+    path = os.path.join(directory, 'lease.db')
+    outbox = make_outbox(path, sink.port)
+    before = len(sink.received())
+    for i in range(emails):
+        outbox.enqueue(f'client{i}@{DOMAINS[i % len(DOMAINS)]}', f'Booking {i}', '<p>Booking confirmed</p>')
+    per_message = lease_ms / 1000 / 4
+    delay, sink.message_delay = sink.message_delay, per_message
+    try:
+        started = time.perf_counter()
+        spawn(path, sink.port, lease_ms=lease_ms).wait()
+        elapsed = time.perf_counter() - started
+    finally:
+        sink.message_delay = delay
+    counts = Counter(MESSAGE_ID.search(data).group(1) for _, data, _ in sink.received()[before:])
+    resent = sum(n - 1 for n in counts.values())
+    print(f'  {emails} emails, {WORKERS} dispatchers, {CLAIM_BATCH} per batch at '
+          f'{per_message * 1e3:.0f} ms each against a {lease_ms} ms lease: {elapsed:.2f}s, {resent} resent')
+    assert len(counts) == emails and resent == 0
+
+
+def rate_run(sink, directory, emails, domain_rate):
+    path = os.path.join(directory, 'rate.db')
+    outbox = make_outbox(path, sink.port)
+    before = len(sink.received())
+    for i in range(emails):
+        # Half the burst goes to one domain, the rest spread over the others
+        domain = DOMAINS[0] if i % 2 else DOMAINS[1 + i // 2 % (len(DOMAINS) - 1)]
+        outbox.enqueue(f'client{i}@{domain}', f'Booking {i}', '<p>Booking confirmed</p>')
+    child = spawn(path, sink.port, domain_rate=domain_rate)
+    child.wait()
+    times = {}
+    for recipients, _, received in sink.received()[before:]:
+        times.setdefault(recipients[0].rsplit('@', 1)[1], []).append(received)
+    for domain, stamps in sorted(times.items()):
+        span = max(stamps) - min(stamps)
+        # The first `burst` go out at once; the bucket allows rate * span more after them
+        rate = (len(stamps) - 5) / span if span else 0.0
+        print(f'  {domain:<12} {len(stamps):>4} emails over {span:>6.2f}s = {rate:>6.1f}/s after the burst '
+              f'(limit {domain_rate}/s, burst 5)')
+        assert len(stamps) <= 5 + domain_rate * span + 1
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--dispatch':
+        dispatch(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]), float(sys.argv[5]), int(sys.argv[6]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--emails', type=int, default=500)
+    parser.add_argument('--kills', type=int, default=8)
+    parser.add_argument('--domain-rate', type=float, default=20)
+    args = parser.parse_args()
+
+    sink = SmtpSink(message_delay=0.002).start()
+    with tempfile.TemporaryDirectory() as directory:
+        print('Crash and restart')
+        crash_run(sink, directory, args.emails, args.kills)
+        print('Batches outlasting the lease')
+        lease_run(sink, directory, 100, 200)
+        print('Per-domain rate limit')
+        rate_run(sink, directory, 200, args.domain_rate)
+    sink.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Compare proxy -> Node latency and throughput over TCP loopback and a Unix socket.
+
+Usage: python benchmarks/proxy_transport.py [--requests 5000] [--threads 8] [--path /api/v1/campaigns]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Run from anywhere in the checkout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py starts the TCP worker on import; the Unix socket worker is started below
+os.environ.pop('NODE_SOCKET_DIR', None)
+os.environ['NODE_WORKERS'] = '1'
+import app as proxy_app  # noqa: E402
+
+
+def run(base_url, path, total, threads):
+    latencies = []
+    lock = threading.Lock()
+    per_thread = total // threads
+
+    def worker():
+        local = []
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            resp = proxy_app.upstream_session.get(f'{base_url}{path}')
+            resp.content
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    # Warm up the connection pool
+    for _ in range(50):
+        proxy_app.upstream_session.get(f'{base_url}{path}').content
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--path', default='/api/v1/campaigns')
+    args = parser.parse_args()
+
+    tcp_worker = proxy_app.node_pool.workers[0]
+    socket_dir = tempfile.mkdtemp(prefix='macs-bench-')
+    unix_worker = proxy_app.NodeSupervisor(
+        proxy_app.NODE_PORT + 100, name='bench-unix', socket_path=os.path.join(socket_dir, 'node.sock')
+    )
+    unix_worker.start()
+
+    try:
+        if not (tcp_worker.wait_until_ready(30) and unix_worker.wait_until_ready(30)):
+            sys.exit('Node did not become healthy')
+
+        print(f"{args.requests} GET {args.path} with {args.threads} threads")
+        print(f"{'transport':<10} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+        for name, worker in (('tcp', tcp_worker), ('unix', unix_worker)):
+            result = run(worker.base_url, args.path, args.requests, args.threads)
+            print(f"{name:<10} {result['rps']:>10.0f} {result['p50_ms']:>10.3f} {result['p99_ms']:>10.3f}")
+    finally:
+        unix_worker.stop()
+        proxy_app.stop_node_server()
+
+
+if __name__ == '__main__':
+    main()
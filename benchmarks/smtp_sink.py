@@ -0,0 +1,115 @@
+"""Minimal threaded SMTP server that accepts and keeps every message, for the email benchmarks.
+
+Usage: python benchmarks/smtp_sink.py [--port 2525]
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    """Speaks just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP and QUIT.
+
+    connect_delay is slept before the greeting and message_delay after each DATA, to stand
+    in for the handshake and per-message cost of a real provider.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, connect_delay=0.0, message_delay=0.0):
+        super().__init__((host, port), SmtpHandler)
+        self.connect_delay = connect_delay
+        self.message_delay = message_delay
+        self.lock = threading.Lock()
+        self.messages = []  # (recipients, data bytes, monotonic time received)
+        self.connections = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def received(self):
+        with self.lock:
+            return list(self.messages)
+
+
+class SmtpHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        try:
+            self.converse()
+        except ConnectionError:
+            # A client killed mid-conversation; whatever it had not finished is dropped
+            pass
+
+    def converse(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.connect_delay)
+        self.reply('220 sink ESMTP')
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command[:4].upper()
+            if verb == 'EHLO':
+                self.wfile.write(b'250-sink\r\n250 8BITMIME\r\n')
+            elif verb == 'HELO':
+                self.reply('250 sink')
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip().strip('<>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                else:
+                    return
+                time.sleep(server.message_delay)
+                with server.lock:
+                    server.messages.append((recipients, b''.join(data), time.monotonic()))
+                self.reply('250 OK queued')
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=2525)
+    args = parser.parse_args()
+    sink = SmtpSink(port=args.port)
+    print(f'SMTP sink listening on 127.0.0.1:{sink.port}')
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        sink.server_close()
+
+
+if __name__ == '__main__':
+    main()
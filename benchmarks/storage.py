@@ -0,0 +1,239 @@
+"""Run several worker processes against one SqlStorage database and check they act as one store.
+
+Usage: python benchmarks/storage.py [--workers 4] [--requests 300] [--contested 45]
+
+Each worker is a separate process with its own in-memory stores, like a gunicorn
+worker. They all create bookings and contributions, race for the same --contested
+slots, then read back. The run fails unless every id is unique across workers, each
+contested slot was won exactly once, every worker sees every booking and the
+campaign total counts every contribution. Latencies are reported per operation,
+next to the in-memory stores alone in a single process. Booking emails go to the
+in-memory outbox and its log output is discarded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Set before src is imported, since the email service reads it at import
+os.environ.setdefault('EMAIL_OUTBOX', 'memory')
+
+from flask import Flask  # noqa: E402
+from src.models.user import db  # noqa: E402
+from src.models import booking  # noqa: E402,F401
+from src.models.storage import Storage, SqlStorage  # noqa: E402
+from src.routes import bookings  # noqa: E402
+
+FIRST_DAY = date(2030, 1, 1)
+CONTESTED_DAY = date(2029, 1, 1)
+
+
+def make_app(database):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    app.register_blueprint(bookings.bookings_bp)
+    return app
+
+
+def slot(first_day, i):
+    """The i-th slot of artist 1's default hours (nine a day) from first_day on"""
+    return f'{first_day + timedelta(days=i // 9)}T{9 + i % 9:02d}:00:00Z'
+
+
+def book(client, date_time, name):
+    return client.post('/api/v1/bookings', json={
+        'artistId': '1',
+        'clientName': name,
+        'clientEmail': f'{name.replace(" ", ".").lower()}@example.com',
+        'dateTime': date_time,
+        'service': 'Workshop Session',
+        'message': 'Benchmark booking'
+    })
+
+
+def contribute(client, campaign_id, name):
+    return client.post('/api/v1/contributions', json={
+        'campaignId': campaign_id,
+        'contributorName': name,
+        'contributorEmail': f'{name.replace(" ", ".").lower()}@example.com',
+        'amount': 1
+    })
+
+
+def timed(latencies, request):
+    started = time.perf_counter()
+    resp = request()
+    latencies.append(time.perf_counter() - started)
+    return resp
+
+
+def check(resp, *ok):
+    if resp.status_code not in ok:
+        sys.exit(f'Request failed: {resp.status_code} {resp.get_data(as_text=True)}')
+    return resp.get_json()
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return statistics.median(latencies) * 1e6, latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1e6
+
+
+def run_worker(args):
+    """Child process: one worker's writes, a barrier with the others, then its reads"""
+    app = make_app(args.database)
+    client = app.test_client()
+    with app.app_context():
+        bookings.init_storage(Storage() if args.memory else SqlStorage())
+    if args.campaign is None:
+        args.campaign = check(create_campaign(client), 201)['campaign']['id']
+
+    days = args.requests // 9 + 1
+    latencies = {'create booking': [], 'contested booking': [], 'contribute': [], 'get booking': [], 'list bookings': []}
+    booking_ids, contribution_ids, won = [], [], []
+    for i in range(args.requests):
+        date_time = slot(FIRST_DAY + timedelta(days=args.index * days), i)
+        body = check(timed(latencies['create booking'], lambda: book(client, date_time, f'Worker {args.index} {i}')), 201)
+        booking_ids.append(body['booking']['id'])
+    for k in range(args.contested):
+        resp = timed(latencies['contested booking'], lambda: book(client, slot(CONTESTED_DAY, k), f'Racer {args.index} {k}'))
+        if check(resp, 201, 409) and resp.status_code == 201:
+            won.append(k)
+    for i in range(args.requests):
+        body = check(timed(latencies['contribute'], lambda: contribute(client, args.campaign, f'Backer {args.index} {i}')), 201)
+        contribution_ids.append(body['contribution']['id'])
+
+    # Wait until every worker has written before reading what they wrote
+    open(os.path.join(args.barrier, f'{args.index}.done'), 'w').close()
+    while sum(name.endswith('.done') for name in os.listdir(args.barrier)) < args.workers:
+        time.sleep(0.01)
+
+    for i in range(args.requests):
+        check(timed(latencies['get booking'], lambda: client.get(f'/api/v1/bookings/{booking_ids[i]}')), 200)
+        check(timed(latencies['list bookings'], lambda: client.get('/api/v1/bookings?artistId=1&limit=10')), 200)
+    seen = check(client.get('/api/v1/bookings?artistId=1&limit=1'), 200)['total']
+    amount = check(client.get(f'/api/v1/campaigns/{args.campaign}'), 200)['campaign']['currentAmount']
+    # The stats counters were kept up to date through every sync, so must match a recount
+    miscounted = bookings.booking_store.stats.verify(bookings.booking_store)
+    with open(os.path.join(args.barrier, f'{args.index}.json'), 'w') as f:
+        json.dump({
+            'bookingIds': booking_ids,
+            'contributionIds': contribution_ids,
+            'won': won,
+            'seenBookings': seen,
+            'seenAmount': amount,
+            'miscounted': miscounted,
+            'latencies': latencies
+        }, f)
+
+
+def create_campaign(client):
+    return client.post('/api/v1/campaigns', json={
+        'artistId': '1', 'title': 'Benchmark', 'description': 'Shared campaign',
+        'targetAmount': 1000000, 'deadline': '2035-01-01T00:00:00Z'
+    })
+
+
+def run_workers(args, count, database, barrier, campaign_id=None, memory=False):
+    """Start `count` worker processes, wait for them and return their results"""
+    os.mkdir(barrier)
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--workers', str(count),
+               '--requests', str(args.requests), '--contested', str(args.contested),
+               '--database', database, '--barrier', barrier]
+    if campaign_id is not None:
+        command += ['--campaign', campaign_id]
+    if memory:
+        command.append('--memory')
+    workers = [
+        subprocess.Popen(command + ['--index', str(i)], stdout=subprocess.DEVNULL)
+        for i in range(count)
+    ]
+    for worker in workers:
+        if worker.wait():
+            sys.exit(f'Worker failed with exit code {worker.returncode}')
+    results = []
+    for i in range(count):
+        with open(os.path.join(barrier, f'{i}.json')) as f:
+            results.append(json.load(f))
+    return results
+
+
+def report(label, results):
+    for operation in results[0]['latencies']:
+        p50, p99 = percentiles([v for r in results for v in r['latencies'][operation]])
+        print(f'{label:<22} {operation:<18} {p50:>10.1f} {p99:>10.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=300, help='bookings, contributions and reads per worker')
+    parser.add_argument('--contested', type=int, default=45, help='slots every worker tries to book')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--index', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    parser.add_argument('--campaign', help=argparse.SUPPRESS)
+    parser.add_argument('--barrier', help=argparse.SUPPRESS)
+    parser.add_argument('--memory', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return run_worker(args)
+
+    with tempfile.TemporaryDirectory(prefix='macs-bench-') as tmp:
+        database = os.path.join(tmp, 'shared.db')
+        app = make_app(database)
+        client = app.test_client()
+        with app.app_context():
+            db.create_all()
+            bookings.init_storage(SqlStorage())
+        campaign = check(create_campaign(client), 201)['campaign']
+        seeded = len(bookings.booking_store)
+
+        started = time.perf_counter()
+        results = run_workers(args, args.workers, database, os.path.join(tmp, 'shared'), campaign['id'])
+        elapsed = time.perf_counter() - started
+        baseline = run_workers(args, 1, os.path.join(tmp, 'unused.db'), os.path.join(tmp, 'memory'), memory=True)
+
+        booking_ids = [i for r in results for i in r['bookingIds']]
+        contribution_ids = [i for r in results for i in r['contributionIds']]
+        wins = sorted(k for r in results for k in r['won'])
+        expected_bookings = seeded + len(booking_ids) + len(wins)
+        expected_amount = len(contribution_ids)
+        failures = []
+        if len(set(booking_ids)) != len(booking_ids) or len(set(contribution_ids)) != len(contribution_ids):
+            failures.append('duplicate ids across workers')
+        if wins != list(range(args.contested)):
+            failures.append(f'contested slots not won exactly once each: {wins}')
+        for index, r in enumerate(results):
+            if r['seenBookings'] != expected_bookings:
+                failures.append(f"worker {index} sees {r['seenBookings']} bookings, expected {expected_bookings}")
+            if r['seenAmount'] != expected_amount:
+                failures.append(f"worker {index} sees a campaign total of {r['seenAmount']}, expected {expected_amount}")
+            if r['miscounted']:
+                failures.append(f"worker {index} has booking stats that disagree with a recount for artists {r['miscounted']}")
+        with app.app_context():
+            stored = db.session.query(booking.Booking).count()
+            if stored != expected_bookings:
+                failures.append(f'{stored} bookings stored, expected {expected_bookings}')
+
+        # With fewer CPUs than workers, the tail latencies are mostly waits for a time slice
+        print(f'{args.workers} worker processes on {os.cpu_count()} CPUs, {args.requests} bookings, '
+              f'contributions and reads each, {args.contested} contested slots: {elapsed:.2f} s')
+        print(f"{'storage':<22} {'operation':<18} {'p50 us':>10} {'p99 us':>10}")
+        report(f'sqlite, {args.workers} workers', results)
+        report('memory, 1 process', baseline)
+
+        if failures:
+            sys.exit('FAILED: ' + '; '.join(failures))
+        print('OK: unique ids, each contested slot booked once, every worker sees every write and counts it')
+
+
+if __name__ == '__main__':
+    main()
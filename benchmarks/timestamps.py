@@ -0,0 +1,79 @@
+"""Per-request cost of re-parsing ISO strings vs reading the epoch ms stamped at write time.
+
+Usage: python benchmarks/timestamps.py [--records 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.timestamps import day_and_minute, days_until, now_ms, stamp  # noqa: E402
+
+
+def make_records(count):
+    rng = random.Random(3)
+    records = []
+    for i in range(count):
+        day = rng.randrange(1, 29)
+        records.append(stamp({
+            'id': str(i),
+            'createdAt': f'2025-07-{day:02d}T{rng.randrange(24):02d}:{rng.randrange(60):02d}:00Z',
+            'deadline': f'2026-{rng.randrange(1, 13):02d}-{day:02d}T23:59:59Z',
+            'dateTime': f'2026-08-{day:02d}T{rng.randrange(9, 18):02d}:00:00Z',
+        }, 'createdAt', 'deadline', 'dateTime'))
+    return records
+
+
+def parsed_days_remaining(records):
+    for record in records:
+        deadline = datetime.fromisoformat(record['deadline'].replace('Z', '+00:00'))
+        max(0, (deadline - datetime.now(deadline.tzinfo)).days)
+
+
+def stamped_days_remaining(records):
+    now = now_ms()
+    for record in records:
+        max(0, days_until(record['deadlineMs'], now))
+
+
+def parsed_slots(records):
+    for record in records:
+        moment = datetime.fromisoformat(record['dateTime'].replace('Z', '+00:00'))
+        moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M')
+
+
+def stamped_slots(records):
+    for record in records:
+        day_and_minute(record['dateTimeMs'])
+
+
+def timed(label, fn, records, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(records)
+    print(f'  {label:<36} {(time.perf_counter() - started) / repeat * 1e3:>10.3f} ms/request')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=10000)
+    args = parser.parse_args()
+    records = make_records(args.records)
+
+    print(f'{args.records} records per request')
+    print('Parsing ISO strings (previous handlers)')
+    timed('campaign daysRemaining', parsed_days_remaining, records, 20)
+    timed('booking slot date/time', parsed_slots, records, 20)
+    timed('sort by createdAt string', lambda r: sorted(r, key=lambda x: x['createdAt']), records, 20)
+    print('Epoch ms stamped at write time')
+    timed('campaign daysRemaining', stamped_days_remaining, records, 20)
+    timed('booking slot date/time', stamped_slots, records, 20)
+    timed('sort by createdAtMs', lambda r: sorted(r, key=lambda x: x['createdAtMs']), records, 20)
+
+
+if __name__ == '__main__':
+    main()
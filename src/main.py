@@ -6,8 +6,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
+from src.models import booking  # noqa: F401 -- registers the booking tables for create_all
+from src.models.journal import JournalStorage
+from src.models.storage import SqlStorage
 from src.routes.user import user_bp
-from src.routes.bookings import bookings_bp
+from src.routes.bookings import bookings_bp, init_storage
+from src.services.email_service import email_service
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -24,6 +28,14 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 with app.app_context():
     db.create_all()
+    # STORAGE=journal keeps the records in an fsynced journal with snapshots instead of the tables
+    if os.getenv('STORAGE', 'sql') == 'journal':
+        init_storage(JournalStorage(os.getenv('JOURNAL_DIR', os.path.join(os.path.dirname(__file__), 'database', 'journal'))))
+    else:
+        init_storage(SqlStorage())
+
+# Deliver anything a previous run left in the email outbox
+email_service.outbox.start()
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
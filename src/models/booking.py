@@ -0,0 +1,212 @@
+import json
+from src.models.user import db
+
+# Tables follow prisma/schema.prisma (table names and camelCase columns); the fields
+# are the ones the booking and crowdfunding routes actually return.
+
+
+class Booking(db.Model):
+    __tablename__ = 'bookings'
+
+    id = db.Column(db.String(64), primary_key=True)
+    artist_id = db.Column('artistId', db.String(64), nullable=False)
+    user_id = db.Column('userId', db.String(64))
+    client_name = db.Column('clientName', db.String(200), nullable=False)
+    client_email = db.Column('clientEmail', db.String(254), nullable=False)
+    date_time = db.Column('dateTime', db.String(40), nullable=False)
+    service = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    created_at = db.Column('createdAt', db.String(40), nullable=False)
+    updated_at = db.Column('updatedAt', db.String(40))
+
+    __table_args__ = (
+        db.Index('ix_bookings_artist_status', 'artistId', 'status'),
+        db.Index('ix_bookings_artist_datetime', 'artistId', 'dateTime'),
+        db.Index('ix_bookings_client_email_lower', db.func.lower(client_email)),
+        db.Index('ix_bookings_user', 'userId'),
+    )
+
+    def __repr__(self):
+        return f'<Booking {self.id}>'
+
+    def to_dict(self):
+        booking = {
+            'id': self.id,
+            'artistId': self.artist_id,
+            'clientName': self.client_name,
+            'clientEmail': self.client_email,
+            'dateTime': self.date_time,
+            'service': self.service,
+            'message': self.message,
+            'status': self.status,
+            'createdAt': self.created_at
+        }
+        if self.updated_at:
+            booking['updatedAt'] = self.updated_at
+        if self.user_id:
+            booking['userId'] = self.user_id
+        return booking
+
+    @classmethod
+    def from_dict(cls, booking):
+        return cls(
+            id=str(booking['id']),
+            artist_id=booking['artistId'],
+            user_id=booking.get('userId'),
+            client_name=booking['clientName'],
+            client_email=booking['clientEmail'],
+            date_time=booking['dateTime'],
+            service=booking['service'],
+            message=booking.get('message', ''),
+            status=booking['status'],
+            created_at=booking['createdAt'],
+            updated_at=booking.get('updatedAt')
+        )
+
+
+class Campaign(db.Model):
+    __tablename__ = 'campaigns'
+
+    id = db.Column(db.String(64), primary_key=True)
+    artist_id = db.Column('artistId', db.String(64), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    target_amount = db.Column('targetAmount', db.Float, nullable=False)
+    current_amount = db.Column('currentAmount', db.Float, nullable=False, default=0)
+    deadline = db.Column(db.String(40), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='active')
+    image_url = db.Column('imageUrl', db.String(500))
+    created_at = db.Column('createdAt', db.String(40), nullable=False)
+    updated_at = db.Column('updatedAt', db.String(40))
+
+    __table_args__ = (
+        db.Index('ix_campaigns_status_artist', 'status', 'artistId'),
+    )
+
+    def __repr__(self):
+        return f'<Campaign {self.id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'artistId': self.artist_id,
+            'title': self.title,
+            'description': self.description,
+            'targetAmount': self.target_amount,
+            'currentAmount': self.current_amount,
+            'deadline': self.deadline,
+            'imageUrl': self.image_url,
+            'status': self.status,
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at
+        }
+
+    @classmethod
+    def from_dict(cls, campaign):
+        return cls(
+            id=str(campaign['id']),
+            artist_id=campaign['artistId'],
+            title=campaign['title'],
+            description=campaign['description'],
+            target_amount=campaign['targetAmount'],
+            current_amount=campaign['currentAmount'],
+            deadline=campaign['deadline'],
+            status=campaign['status'],
+            image_url=campaign.get('imageUrl'),
+            created_at=campaign['createdAt'],
+            updated_at=campaign.get('updatedAt')
+        )
+
+
+class Contribution(db.Model):
+    __tablename__ = 'contributions'
+
+    id = db.Column(db.String(64), primary_key=True)
+    campaign_id = db.Column('campaignId', db.String(64), nullable=False)
+    contributor_name = db.Column('contributorName', db.String(200), nullable=False)
+    contributor_email = db.Column('contributorEmail', db.String(254), nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    message = db.Column(db.Text)
+    payment_method = db.Column('paymentMethod', db.String(40), nullable=False, default='credit_card')
+    created_at = db.Column('createdAt', db.String(40), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_contributions_campaign_created', 'campaignId', 'createdAt'),
+    )
+
+    def __repr__(self):
+        return f'<Contribution {self.id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'campaignId': self.campaign_id,
+            'contributorName': self.contributor_name,
+            'contributorEmail': self.contributor_email,
+            'amount': self.amount,
+            'message': self.message,
+            'paymentMethod': self.payment_method,
+            'createdAt': self.created_at
+        }
+
+    @classmethod
+    def from_dict(cls, contribution):
+        return cls(
+            id=str(contribution['id']),
+            campaign_id=contribution['campaignId'],
+            contributor_name=contribution['contributorName'],
+            contributor_email=contribution['contributorEmail'],
+            amount=contribution['amount'],
+            message=contribution.get('message', ''),
+            payment_method=contribution.get('paymentMethod', 'credit_card'),
+            created_at=contribution['createdAt']
+        )
+
+
+class Availability(db.Model):
+    """One artist-day: the availability_db status and the custom slots, if any"""
+    __tablename__ = 'availability'
+
+    id = db.Column(db.Integer, primary_key=True)
+    artist_id = db.Column('artistId', db.String(64), nullable=False)
+    date = db.Column(db.String(10), nullable=False)
+    available = db.Column(db.Boolean)
+    slots = db.Column(db.Text)  # JSON list of 'HH:MM' start times
+
+    __table_args__ = (
+        db.UniqueConstraint('artistId', 'date', name='uq_availability_artist_date'),
+    )
+
+    def __repr__(self):
+        return f'<Availability {self.artist_id} {self.date}>'
+
+    def slot_list(self):
+        return json.loads(self.slots) if self.slots is not None else None
+
+
+class IdCounter(db.Model):
+    """The next id of each record kind, handed out by the database so every worker shares one sequence"""
+    __tablename__ = 'id_sequences'
+
+    kind = db.Column(db.String(20), primary_key=True)
+    next_id = db.Column('nextId', db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<IdCounter {self.kind} {self.next_id}>'
+
+
+class StoreChange(db.Model):
+    """One saved record, in commit order, for the workers that keep the stores in memory"""
+    __tablename__ = 'store_changes'
+
+    seq = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # booking | campaign | contribution | availability
+    record_id = db.Column('recordId', db.String(200), nullable=False)
+    origin = db.Column(db.String(64), nullable=False)
+
+    # AUTOINCREMENT never reuses a seq, so a gap can only mean pruned rows
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    def __repr__(self):
+        return f'<StoreChange {self.seq} {self.kind} {self.record_id}>'
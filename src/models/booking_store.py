@@ -0,0 +1,265 @@
+import threading
+
+from src.models.keyset import SortedBucket, sort_key
+from src.models.timestamps import DAY_MS
+
+# Every status a booking may be given; the active ones hold their slot
+BOOKING_STATUSES = ('pending', 'confirmed', 'completed', 'declined', 'cancelled')
+ACTIVE_STATUSES = ('pending', 'confirmed')
+STATS_STATUSES = ('pending', 'confirmed', 'completed', 'declined')
+
+# Stands in for a missing index key; never written to
+EMPTY_BUCKET = SortedBucket()
+
+
+class BookingStats:
+    """Per-artist booking counts by status, overall and per day of creation.
+
+    Kept up to date on every add and status change so the stats endpoint never scans
+    bookings; windowed counts add up at most one bucket per day of the window.
+    """
+
+    def __init__(self):
+        self.totals = {}  # artist id -> {status: count}
+        self.daily = {}   # artist id -> {day number: {status: count}}
+
+    def clear(self):
+        self.totals.clear()
+        self.daily.clear()
+
+    def _bump(self, artist_id, day, status, delta):
+        totals = self.totals.setdefault(artist_id, {})
+        totals[status] = totals.get(status, 0) + delta
+        buckets = self.daily.setdefault(artist_id, {})
+        bucket = buckets.setdefault(day, {})
+        bucket[status] = bucket.get(status, 0) + delta
+
+    def record(self, booking):
+        self._bump(booking['artistId'], booking['createdAtMs'] // DAY_MS, booking['status'], 1)
+
+    def move(self, booking, old_status, new_status):
+        day = booking['createdAtMs'] // DAY_MS
+        self._bump(booking['artistId'], day, old_status, -1)
+        self._bump(booking['artistId'], day, new_status, 1)
+
+    @staticmethod
+    def _summary(counts):
+        stats = {'total': sum(counts.values())}
+        for status in STATS_STATUSES:
+            stats[status] = counts.get(status, 0)
+        return stats
+
+    def for_artist(self, artist_id):
+        """{'total', 'pending', 'confirmed', 'completed', 'declined'} for all of an artist's bookings"""
+        return self._summary(self.totals.get(artist_id, {}))
+
+    def for_window(self, artist_id, days, now_ms):
+        """The same counts for bookings created in the last `days` days up to now_ms"""
+        buckets = self.daily.get(artist_id, {})
+        today = now_ms // DAY_MS
+        counts = {}
+        for day in range(today - days + 1, today + 1):
+            for status, count in buckets.get(day, {}).items():
+                counts[status] = counts.get(status, 0) + count
+        return self._summary(counts)
+
+    def rebuild(self, bookings):
+        """Recount from scratch"""
+        self.clear()
+        for booking in bookings:
+            self.record(booking)
+
+    def verify(self, bookings):
+        """Recount from scratch and return the artists whose maintained counts disagree"""
+        fresh = BookingStats()
+        fresh.rebuild(bookings)
+
+        def nonzero(counts):
+            return {key: value for key, value in counts.items() if value}
+
+        mismatched = []
+        for artist_id in set(self.totals) | set(fresh.totals):
+            kept = self.daily.get(artist_id, {})
+            recount = fresh.daily.get(artist_id, {})
+            if nonzero(self.totals.get(artist_id, {})) != nonzero(fresh.totals.get(artist_id, {})) or any(
+                nonzero(kept.get(day, {})) != nonzero(recount.get(day, {})) for day in set(kept) | set(recount)
+            ):
+                mismatched.append(artist_id)
+        return sorted(mismatched)
+
+
+class BookingStore:
+    """In-memory bookings with a primary id map and secondary indexes.
+
+    Every index maps a key to a SortedBucket of booking id -> booking, so a booking
+    can be moved between keys cheaply when its status changes and each bucket can be
+    paged newest first without sorting it. Mutations and multi-step reads hold `lock`.
+    """
+
+    def __init__(self, bookings=None):
+        # Guards the indexes, which bookings of every artist share
+        self.lock = threading.Lock()
+        self.by_id = {}
+        self.by_artist = {}
+        self.by_email = {}
+        self.by_status = {}
+        self.by_user = {}
+        self.by_artist_status = {}
+        self.by_slot = {}
+        self.ordered = SortedBucket()
+        self.stats = BookingStats()
+        # In key order every insert lands at the end of its buckets
+        for booking in sorted(bookings or [], key=sort_key):
+            self.add(booking)
+
+    def clear(self):
+        with self.lock:
+            for index in (self.by_id, self.by_artist, self.by_email, self.by_status,
+                          self.by_user, self.by_artist_status, self.by_slot):
+                index.clear()
+            self.ordered = SortedBucket()
+            self.stats.clear()
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(list(self.by_id.values()))
+
+    @staticmethod
+    def _index_add(index, key, booking_id, booking, position=None):
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = SortedBucket()
+        bucket.add(booking_id, booking, position)
+
+    @staticmethod
+    def _index_remove(index, key, booking_id):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.remove(booking_id)
+            if not bucket:
+                del index[key]
+
+    def add(self, booking):
+        with self.lock:
+            booking_id = str(booking['id'])
+            position = sort_key(booking)
+            self.by_id[booking_id] = booking
+            self.ordered.add(booking_id, booking, position)
+            self._index_add(self.by_artist, booking['artistId'], booking_id, booking, position)
+            self._index_add(self.by_email, booking['clientEmail'].lower(), booking_id, booking, position)
+            self._index_add(self.by_status, booking['status'], booking_id, booking, position)
+            self._index_add(self.by_artist_status, (booking['artistId'], booking['status']), booking_id, booking, position)
+            self._index_add(self.by_slot, (booking['artistId'], booking['dateTimeMs']), booking_id, booking, position)
+            if booking.get('userId'):
+                self._index_add(self.by_user, booking['userId'], booking_id, booking, position)
+            self.stats.record(booking)
+            return booking
+
+    def get(self, booking_id):
+        return self.by_id.get(str(booking_id))
+
+    def set_status(self, booking, status, updated_at, updated_at_ms):
+        """Change a booking's status and move it between the status indexes"""
+        with self.lock:
+            booking_id = str(booking['id'])
+            old_status = booking['status']
+            if old_status != status:
+                self._index_remove(self.by_status, old_status, booking_id)
+                self._index_remove(self.by_artist_status, (booking['artistId'], old_status), booking_id)
+                self._index_add(self.by_status, status, booking_id, booking)
+                self._index_add(self.by_artist_status, (booking['artistId'], status), booking_id, booking)
+                self.stats.move(booking, old_status, status)
+            booking['status'] = status
+            booking['updatedAt'] = updated_at
+            booking['updatedAtMs'] = updated_at_ms
+            return booking
+
+    def _smallest(self, artist_id, user_id, client_email, status):
+        """The smallest index bucket covering the filters, and whether it holds exactly the matches"""
+        candidates = []
+        if artist_id and status:
+            candidates.append(self.by_artist_status.get((artist_id, status), EMPTY_BUCKET))
+        elif artist_id:
+            candidates.append(self.by_artist.get(artist_id, EMPTY_BUCKET))
+        elif status:
+            candidates.append(self.by_status.get(status, EMPTY_BUCKET))
+        if user_id:
+            candidates.append(self.by_user.get(user_id, EMPTY_BUCKET))
+        if client_email:
+            candidates.append(self.by_email.get(client_email.lower(), EMPTY_BUCKET))
+        if not candidates:
+            return self.ordered, True
+        # The email index is case-insensitive while the filter is exact
+        return min(candidates, key=len), len(candidates) == 1 and not client_email
+
+    @staticmethod
+    def _matcher(artist_id, user_id, client_email, status):
+        return lambda b: (
+            (not artist_id or b['artistId'] == artist_id)
+            and (not user_id or b.get('userId') == user_id)
+            and (not client_email or b['clientEmail'] == client_email)
+            and (not status or b['status'] == status)
+        )
+
+    def find(self, artist_id=None, user_id=None, client_email=None, status=None):
+        """Bookings matching every given filter, scanning only the smallest matching index"""
+        with self.lock:
+            smallest, exact = self._smallest(artist_id, user_id, client_email, status)
+            if exact:
+                return list(smallest.values())
+            match = self._matcher(artist_id, user_id, client_email, status)
+            return [b for b in smallest.values() if match(b)]
+
+    def page(self, artist_id=None, user_id=None, client_email=None, status=None, limit=None, after=None):
+        """Matching bookings newest first from below the sort key `after`.
+
+        Returns (bookings, next_key, total); next_key is None on the last page. total comes
+        from the size of an index bucket, so it is None when the filters have no bucket of
+        their own (userId or clientEmail with another filter) and this page is not all of
+        the matches; counting those would mean scanning the bucket.
+        """
+        with self.lock:
+            smallest, exact = self._smallest(artist_id, user_id, client_email, status)
+            if exact:
+                bookings, next_key = smallest.page(limit, after)
+                return bookings, next_key, len(smallest)
+            match = self._matcher(artist_id, user_id, client_email, status)
+            bookings, next_key = smallest.page(limit, after, match)
+            total = len(bookings) if after is None and next_key is None else None
+            return bookings, next_key, total
+
+    def page_for_email(self, email, limit=None, after=None):
+        """Like page() for a client email matched case-insensitively"""
+        with self.lock:
+            bucket = self.by_email.get(email.lower())
+            if bucket is None:
+                return [], None, 0
+            bookings, next_key = bucket.page(limit, after)
+            return bookings, next_key, len(bucket)
+
+    def for_email(self, email):
+        """Bookings for a client email, matched case-insensitively"""
+        with self.lock:
+            return list(self.by_email.get(email.lower(), {}).values())
+
+    def active_for_artist(self, artist_id):
+        """Pending and confirmed bookings of an artist"""
+        with self.lock:
+            bookings = []
+            for status in ACTIVE_STATUSES:
+                bookings.extend(self.by_artist_status.get((artist_id, status), {}).values())
+            return bookings
+
+    def active_at(self, artist_id, date_time_ms):
+        """The pending or confirmed booking holding the slot starting at epoch ms date_time_ms, if any.
+
+        Slots are keyed on the instant, so the same time written in different ISO forms
+        ('Z', '.000Z', '+00:00') is one slot.
+        """
+        with self.lock:
+            for booking in self.by_slot.get((artist_id, date_time_ms), {}).values():
+                if booking['status'] in ACTIVE_STATUSES:
+                    return booking
+            return None
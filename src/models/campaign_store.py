@@ -0,0 +1,127 @@
+from src.models.keyset import SortedBucket
+
+
+class CampaignAggregate:
+    """Running totals of one campaign's contributions"""
+
+    __slots__ = ('count', 'total', 'contributors', 'last_at', 'last_at_ms')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.contributors = set()
+        self.last_at = None
+        self.last_at_ms = None
+
+    def add(self, contribution):
+        self.count += 1
+        self.total += contribution['amount']
+        self.contributors.add(contribution['contributorEmail'].lower())
+        if self.last_at_ms is None or contribution['createdAtMs'] > self.last_at_ms:
+            self.last_at = contribution['createdAt']
+            self.last_at_ms = contribution['createdAtMs']
+
+    def to_dict(self):
+        return {
+            'contributionsCount': self.count,
+            'totalContributed': self.total,
+            'uniqueContributors': len(self.contributors),
+            'lastContributionAt': self.last_at
+        }
+
+
+class CampaignStore:
+    """In-memory campaigns by id, with each campaign's contributions and their aggregates.
+
+    Contributions are kept per campaign in (createdAt, id) order for paging, and the
+    aggregates are updated as each one is added, so reads never sum contributions.
+    """
+
+    def __init__(self, campaigns=None, contributions=None):
+        self.campaigns = {}
+        self.contributions = []
+        self.by_campaign = {}
+        self.aggregates = {}
+        for campaign in campaigns or []:
+            self.add_campaign(campaign)
+        for contribution in contributions or []:
+            self.add_contribution(contribution)
+
+    def clear(self):
+        self.campaigns.clear()
+        self.contributions.clear()
+        self.by_campaign.clear()
+        self.aggregates.clear()
+
+    def __len__(self):
+        return len(self.campaigns)
+
+    def __iter__(self):
+        return iter(list(self.campaigns.values()))
+
+    def add_campaign(self, campaign):
+        self.campaigns[campaign['id']] = campaign
+        return campaign
+
+    def get(self, campaign_id):
+        return self.campaigns.get(campaign_id)
+
+    def find(self, status=None, artist_id=None):
+        return [
+            c for c in list(self.campaigns.values())
+            if (not status or c['status'] == status) and (not artist_id or c['artistId'] == artist_id)
+        ]
+
+    def add_contribution(self, contribution):
+        campaign_id = contribution['campaignId']
+        self.contributions.append(contribution)
+        bucket = self.by_campaign.get(campaign_id)
+        if bucket is None:
+            bucket = self.by_campaign[campaign_id] = SortedBucket()
+        bucket.add(contribution['id'], contribution)
+        aggregate = self.aggregates.get(campaign_id)
+        if aggregate is None:
+            aggregate = self.aggregates[campaign_id] = CampaignAggregate()
+        aggregate.add(contribution)
+        return contribution
+
+    def has_contribution(self, campaign_id, contribution_id):
+        bucket = self.by_campaign.get(campaign_id)
+        return bucket is not None and contribution_id in bucket.items
+
+    def add_contributions(self, campaign_id, contributions):
+        """Add a batch of contributions to one campaign, looking its bucket and aggregate up once"""
+        bucket = self.by_campaign.get(campaign_id)
+        if bucket is None:
+            bucket = self.by_campaign[campaign_id] = SortedBucket()
+        aggregate = self.aggregates.get(campaign_id)
+        if aggregate is None:
+            aggregate = self.aggregates[campaign_id] = CampaignAggregate()
+        self.contributions.extend(contributions)
+        for contribution in contributions:
+            bucket.add(contribution['id'], contribution)
+            aggregate.add(contribution)
+        return contributions
+
+    def contribution_count(self):
+        return len(self.contributions)
+
+    def aggregate(self, campaign_id):
+        """contributionsCount, totalContributed, uniqueContributors and lastContributionAt of a campaign"""
+        return (self.aggregates.get(campaign_id) or CampaignAggregate()).to_dict()
+
+    def contributions_page(self, campaign_id, limit=None, after=None):
+        """A campaign's contributions newest first: (contributions, next_key)"""
+        bucket = self.by_campaign.get(campaign_id)
+        if bucket is None:
+            return [], None
+        return bucket.page(limit, after)
+
+    def rebuild_aggregates(self):
+        """Recompute every aggregate from the stored contributions"""
+        self.aggregates.clear()
+        for contribution in self.contributions:
+            aggregate = self.aggregates.get(contribution['campaignId'])
+            if aggregate is None:
+                aggregate = self.aggregates[contribution['campaignId']] = CampaignAggregate()
+            aggregate.add(contribution)
@@ -0,0 +1,56 @@
+import threading
+from contextlib import contextmanager
+
+DEFAULT_STRIPES = 256
+
+
+class StripedLock:
+    """A fixed pool of locks shared out by key.
+
+    Writers to the same key always serialise, while writers to different keys only
+    meet when their keys hash to the same stripe, so no lock object is created per key.
+    """
+
+    def __init__(self, stripes=DEFAULT_STRIPES):
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def stripe(self, key):
+        return hash(str(key)) % len(self.locks)
+
+    @contextmanager
+    def hold(self, *keys):
+        """Hold the locks of every key, taken in stripe order so overlapping holders cannot deadlock"""
+        stripes = sorted({self.stripe(key) for key in keys})
+        for stripe in stripes:
+            self.locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self.locks[stripe].release()
+
+
+class IdSequence:
+    """Thread-safe source of increasing string ids, continuing after the existing numeric ones"""
+
+    def __init__(self, existing_ids=()):
+        self.lock = threading.Lock()
+        self.reset(existing_ids)
+
+    def reset(self, existing_ids):
+        numbers = [int(i) for i in map(str, existing_ids) if i.isdigit()]
+        with self.lock:
+            self.next_id = max(numbers, default=0) + 1
+
+    def next(self):
+        with self.lock:
+            value = self.next_id
+            self.next_id += 1
+        return str(value)
+
+    def take(self, count):
+        """`count` consecutive ids in one step"""
+        with self.lock:
+            first = self.next_id
+            self.next_id += count
+        return [str(i) for i in range(first, first + count)]
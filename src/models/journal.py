@@ -0,0 +1,304 @@
+import gc
+import json
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+from src.models.storage import Storage
+
+SNAPSHOT_EVERY = 100000
+# Entries parsed per json.loads call during recovery
+PARSE_CHUNK = 4096
+
+_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def _dump(entry):
+    return (_encoder.encode(entry) + '\n').encode('utf-8')
+
+
+@contextmanager
+def _paused_gc():
+    """Pause the cyclic GC, which otherwise rescans the growing record set many times over"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _numbered(directory, prefix):
+    """{number: path} of the '<prefix>-<number>.ndjson' files in directory"""
+    files = {}
+    for name in os.listdir(directory):
+        if name.startswith(prefix + '-') and name.endswith('.ndjson'):
+            number = name[len(prefix) + 1:-len('.ndjson')]
+            if number.isdigit():
+                files[int(number)] = os.path.join(directory, name)
+    return files
+
+
+def _read_lines(path):
+    """Lines of a file through a read-only memory map; a torn last line (crash mid-write) is dropped"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                if line.endswith(b'\n'):
+                    yield line
+
+
+def _read_entries(path):
+    """(entry, line) pairs of a journal or snapshot, skipping lines that do not parse"""
+    lines = _read_lines(path)
+    while True:
+        chunk = list(islice(lines, PARSE_CHUNK))
+        if not chunk:
+            return
+        # One loads call per chunk is much cheaper than one per line
+        try:
+            entries = json.loads(b'[' + b','.join(chunk) + b']')
+        except ValueError:
+            entries = []
+            for line in chunk:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    entries.append(None)
+        for entry, line in zip(entries, chunk):
+            if entry is not None:
+                yield entry, line
+
+
+class JournalStorage(Storage):
+    """Write-ahead journal of every store write, with periodic compacted snapshots.
+
+    Each save appends one NDJSON entry holding the whole record to journal-<n>.ndjson and
+    returns once it is fsynced. With group commit, writers arriving while an fsync runs
+    queue behind it and are all made durable by the next one. Every `snapshot_every`
+    entries the latest entry per record is written to snapshot-<n>.ndjson, after which
+    journals before n are deleted. load() reads the newest snapshot and replays the
+    journals from its number on; entries replace whole records, so replay is idempotent.
+    The journal belongs to one process: run a single worker with STORAGE=journal.
+    """
+
+    def __init__(self, directory, group_commit=True, snapshot_every=SNAPSHOT_EVERY):
+        self.directory = directory
+        self.group_commit = group_commit
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+        self.cond = threading.Condition()
+        # Latest entry line per record, in first-write order, for snapshots
+        self.records = {}       # ('booking' | 'campaign' | 'contribution', id) -> line
+        self.availability = {}  # (artist id, date) -> [status, slots]
+        self.written = 0
+        self.synced = 0
+        self.syncing = False
+        self.since_snapshot = 0
+        self.snapshotting = False
+        self.segment = max([*_numbered(directory, 'journal'), *_numbered(directory, 'snapshot')], default=0)
+        self.file = None
+        self.local = threading.local()
+
+    def _open_segment(self):
+        # Always start a new segment, so nothing is appended after a torn line
+        self.segment += 1
+        self.file = open(os.path.join(self.directory, f'journal-{self.segment}.ndjson'), 'ab')
+
+    # ============= WRITES =============
+
+    @contextmanager
+    def transaction(self):
+        """Journal the saves inside together, behind one fsync, once the block completes"""
+        if getattr(self.local, 'pending', None) is not None:
+            yield
+            return
+        self.local.pending = []
+        try:
+            yield
+            pending = self.local.pending
+        finally:
+            self.local.pending = None
+        if pending:
+            self._append(pending)
+
+    def _journal(self, entries):
+        pending = getattr(self.local, 'pending', None)
+        if pending is not None:
+            pending.extend(entries)
+        else:
+            self._append(entries)
+
+    def _remember(self, entry, line):
+        op = entry['op']
+        if op == 'availability':
+            state = self.availability.setdefault((entry['artistId'], entry['date']), [None, None])
+            if entry.get('status') is not None:
+                state[0] = entry['status']
+            if entry.get('slots') is not None:
+                state[1] = entry['slots']
+        else:
+            self.records[(op, str(entry['record']['id']))] = line
+
+    def _append(self, entries):
+        lines = [(entry, _dump(entry)) for entry in entries]
+        with self.cond:
+            if self.file is None:
+                self._open_segment()
+            for entry, line in lines:
+                self.file.write(line)
+                self._remember(entry, line)
+            self.written += len(lines)
+            self.since_snapshot += len(lines)
+            if not self.group_commit:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.synced = self.written
+            else:
+                self._wait_synced(self.written)
+            if self.since_snapshot >= self.snapshot_every and not self.snapshotting:
+                self.snapshotting = True
+                threading.Thread(target=self.snapshot, daemon=True).start()
+
+    def _wait_synced(self, target):
+        """Block until entry number target is on disk, leading an fsync if none is running.
+
+        Called with cond held; the fsync itself runs without it so later writers can
+        append meanwhile and ride the next fsync together.
+        """
+        while self.synced < target:
+            if self.syncing:
+                self.cond.wait()
+                continue
+            self.syncing = True
+            covered = self.written
+            self.file.flush()
+            fd = os.dup(self.file.fileno())
+            self.cond.release()
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+                self.cond.acquire()
+                self.syncing = False
+                self.synced = max(self.synced, covered)
+                self.cond.notify_all()
+
+    def save_booking(self, booking):
+        self._journal([{'op': 'booking', 'record': booking}])
+
+    def save_campaign(self, campaign):
+        self._journal([{'op': 'campaign', 'record': campaign}])
+
+    def save_contribution(self, contribution):
+        self._journal([{'op': 'contribution', 'record': contribution}])
+
+    def save_contributions(self, contributions):
+        self._journal([{'op': 'contribution', 'record': c} for c in contributions])
+
+    def save_availability(self, artist_id, date, status=None, slots=None):
+        self._journal([{'op': 'availability', 'artistId': artist_id, 'date': date, 'status': status, 'slots': slots}])
+
+    def seed(self, bookings, campaigns, contributions, availability, custom_availability):
+        """Journal the demo data with a single fsync"""
+        entries = [{'op': 'booking', 'record': b} for b in bookings]
+        entries += [{'op': 'campaign', 'record': c} for c in campaigns]
+        entries += [{'op': 'contribution', 'record': c} for c in contributions]
+        for artist_id, days in availability.items():
+            entries += [{'op': 'availability', 'artistId': artist_id, 'date': d, 'status': s} for d, s in days.items()]
+        for artist_id, days in custom_availability.items():
+            entries += [{'op': 'availability', 'artistId': artist_id, 'date': d, 'slots': s} for d, s in days.items()]
+        with _paused_gc():
+            self._append(entries)
+
+    # ============= SNAPSHOTS =============
+
+    def snapshot(self):
+        """Write the latest entry of every record to a new snapshot and drop the journals it covers"""
+        with self.cond:
+            self.snapshotting = True
+            # Entries from here on go to a new segment, which the snapshot hands over to
+            self._close_segment()
+            self._open_segment()
+            number = self.segment
+            lines = list(self.records.values())
+            availability = [
+                {'op': 'availability', 'artistId': artist_id, 'date': date, 'status': status, 'slots': slots}
+                for (artist_id, date), (status, slots) in self.availability.items()
+            ]
+            self.since_snapshot = 0
+        try:
+            path = os.path.join(self.directory, f'snapshot-{number}.ndjson')
+            with open(path + '.tmp', 'wb') as f:
+                f.writelines(lines)
+                f.writelines(map(_dump, availability))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + '.tmp', path)
+            for old, old_path in _numbered(self.directory, 'snapshot').items():
+                if old < number:
+                    os.remove(old_path)
+            for old, old_path in _numbered(self.directory, 'journal').items():
+                if old < number:
+                    os.remove(old_path)
+        finally:
+            with self.cond:
+                self.snapshotting = False
+
+    # ============= RECOVERY =============
+
+    def load(self):
+        snapshots = _numbered(self.directory, 'snapshot')
+        start = max(snapshots, default=0)
+        paths = [snapshots[start]] if start else []
+        paths += [path for number, path in sorted(_numbered(self.directory, 'journal').items()) if number >= start]
+
+        with self.cond, _paused_gc():
+            self.records.clear()
+            self.availability.clear()
+            latest = {}
+            for path in paths:
+                for entry, line in _read_entries(path):
+                    if entry['op'] == 'availability':
+                        self._remember(entry, None)
+                    else:
+                        key = (entry['op'], str(entry['record']['id']))
+                        self.records[key] = line
+                        latest[key] = entry['record']
+            if not self.records and not self.availability:
+                return None
+
+            stored = {'booking': [], 'campaign': [], 'contribution': []}
+            for (op, record_id), record in latest.items():
+                stored[op].append(record)
+            availability = {}
+            custom_availability = {}
+            for (artist_id, date), (status, slots) in self.availability.items():
+                if status is not None:
+                    availability.setdefault(artist_id, {})[date] = status
+                if slots is not None:
+                    custom_availability.setdefault(artist_id, {})[date] = slots
+        return {
+            'bookings': stored['booking'],
+            'campaigns': stored['campaign'],
+            'contributions': stored['contribution'],
+            'availability': availability,
+            'customAvailability': custom_availability
+        }
+
+    def _close_segment(self):
+        # Waiting releases cond during the fsync, so re-check until nothing new was appended
+        if self.file is not None:
+            while self.synced < self.written:
+                self._wait_synced(self.written)
+            self.file.close()
+            self.file = None
+
+    def close(self):
+        with self.cond:
+            self._close_segment()
@@ -0,0 +1,73 @@
+import base64
+import json
+from bisect import bisect_left, insort
+
+
+def sort_key(record):
+    """Keyset position of a record: newest createdAtMs last, id breaks ties"""
+    return (record['createdAtMs'], str(record['id']))
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Turn a cursor token back into a sort key, raising ValueError if it was not made by encode_cursor"""
+    try:
+        created_at_ms, record_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if type(created_at_ms) is not int or not isinstance(record_id, str):
+        raise ValueError('Invalid cursor')
+    return (created_at_ms, record_id)
+
+
+class SortedBucket:
+    """Records under one index key, by id and kept in (createdAt, id) order"""
+
+    __slots__ = ('items', 'keys')
+
+    def __init__(self):
+        self.items = {}
+        self.keys = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def values(self):
+        return self.items.values()
+
+    def add(self, record_id, record, key=None):
+        if record_id in self.items:
+            self.remove(record_id)
+        self.items[record_id] = record
+        key = key or sort_key(record)
+        # Records mostly arrive newest last, so try an append before the bisect
+        if not self.keys or self.keys[-1] < key:
+            self.keys.append(key)
+        else:
+            insort(self.keys, key)
+
+    def remove(self, record_id):
+        record = self.items.pop(record_id, None)
+        if record is not None:
+            del self.keys[bisect_left(self.keys, sort_key(record))]
+
+    def page(self, limit=None, after=None, match=None):
+        """Records newest first, starting below the key `after`.
+
+        Returns (records, next_key) where next_key is None once the bucket is exhausted.
+        Cost is O(log n + records visited), not O(n).
+        """
+        end = bisect_left(self.keys, after) if after else len(self.keys)
+        records = []
+        for i in range(end - 1, -1, -1):
+            key = self.keys[i]
+            record = self.items[key[1]]
+            if match and not match(record):
+                continue
+            if limit is not None and len(records) == limit:
+                return records, sort_key(records[-1])
+            records.append(record)
+        return records, None
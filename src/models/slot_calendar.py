@@ -0,0 +1,361 @@
+from collections import OrderedDict
+from datetime import date
+import threading
+from src.models.timestamps import DAY_MS, day_and_minute
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+# Longest span of days one artist calendar may cover (about 20 years)
+MAX_CALENDAR_DAYS = 7305
+# Days FreeSlotIndex keeps built before evicting the least recently queried
+MAX_INDEXED_DAYS = 400
+
+
+def slot_index(time_str):
+    """'HH:MM' -> index of the 15-minute slot it starts in"""
+    hours, minutes = time_str.split(':')[:2]
+    index = (int(hours) * 60 + int(minutes)) // SLOT_MINUTES
+    if not 0 <= index < SLOTS_PER_DAY:
+        raise ValueError(f'Invalid time: {time_str}')
+    return index
+
+
+def mask_from_times(times):
+    mask = 0
+    for time_str in times:
+        mask |= 1 << slot_index(time_str)
+    return mask
+
+
+_times_cache = {}
+
+
+def times_from_mask(mask):
+    """Slot bitmap -> sorted list of 'HH:MM' start times (memoised, calendars reuse few masks)"""
+    times = _times_cache.get(mask)
+    if times is None:
+        times = []
+        for slot in slot_bits(mask):
+            minutes = slot * SLOT_MINUTES
+            times.append(f'{minutes // 60:02d}:{minutes % 60:02d}')
+        if len(_times_cache) < 4096:
+            _times_cache[mask] = times
+    return list(times)
+
+
+def slot_bits(mask):
+    """Indexes of the set bits of a slot bitmap"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def day_number(date_str):
+    return date.fromisoformat(date_str[:10]).toordinal()
+
+
+def day_string(number):
+    return date.fromordinal(number).isoformat()
+
+
+class ArtistCalendar:
+    """One artist's days as contiguous per-day slot bitmaps.
+
+    hours[i] holds the bookable start slots of day start + i (custom hours or the
+    default), booked[i] the slots taken by pending/confirmed bookings and closed[i]
+    is 1 when the artist marked the day unavailable. Days outside the arrays fall
+    back to the default hours, nothing booked and open.
+    """
+
+    __slots__ = ('default_mask', 'start', 'hours', 'booked', 'closed')
+
+    def __init__(self, default_hours=()):
+        self.default_mask = mask_from_times(default_hours)
+        self.start = None
+        self.hours = []
+        self.booked = []
+        self.closed = bytearray()
+
+    def _index(self, day):
+        """Array index of a day, growing the arrays to cover it"""
+        if self.start is None:
+            self.start = day
+        if not self.covers(day):
+            raise ValueError('Date is too far from the rest of the calendar')
+        if day < self.start:
+            grow = self.start - day
+            self.hours[:0] = [self.default_mask] * grow
+            self.booked[:0] = [0] * grow
+            self.closed[:0] = bytes(grow)
+            self.start = day
+        index = day - self.start
+        if index >= len(self.hours):
+            grow = index + 1 - len(self.hours)
+            self.hours.extend([self.default_mask] * grow)
+            self.booked.extend([0] * grow)
+            self.closed.extend(bytes(grow))
+        return index
+
+    def _window(self, first, last):
+        """Array slice bounds for days first..last clipped to the arrays, and the padding either side"""
+        if self.start is None:
+            return 0, 0, last - first + 1, 0
+        lo = min(max(first - self.start, 0), len(self.hours))
+        hi = max(min(last - self.start + 1, len(self.hours)), lo)
+        before = min(max(self.start - first, 0), last - first + 1)
+        return lo, hi, before, max(last - first + 1 - before - (hi - lo), 0)
+
+    def covers(self, day):
+        """Whether the arrays can grow to hold day without spanning more than MAX_CALENDAR_DAYS"""
+        if self.start is None:
+            return True
+        return max(day, self.start + len(self.hours) - 1) - min(day, self.start) < MAX_CALENDAR_DAYS
+
+    def set_hours(self, day, times):
+        self.hours[self._index(day)] = mask_from_times(times)
+
+    def set_closed(self, day, closed):
+        self.closed[self._index(day)] = 1 if closed else 0
+
+    def set_booked(self, day, slot, booked):
+        index = self._index(day)
+        if booked:
+            self.booked[index] |= 1 << slot
+        else:
+            self.booked[index] &= ~(1 << slot)
+
+    def _day(self, array, day, default):
+        if self.start is None or not 0 <= day - self.start < len(array):
+            return default
+        return array[day - self.start]
+
+    def hours_on(self, day):
+        return self._day(self.hours, day, self.default_mask)
+
+    def booked_on(self, day):
+        return self._day(self.booked, day, 0)
+
+    def closed_on(self, day):
+        return bool(self._day(self.closed, day, 0))
+
+    def free_on(self, day):
+        return 0 if self.closed_on(day) else self.hours_on(day) & ~self.booked_on(day)
+
+    def hours_range(self, first, last):
+        lo, hi, before, after = self._window(first, last)
+        return [self.default_mask] * before + self.hours[lo:hi] + [self.default_mask] * after
+
+    def booked_range(self, first, last):
+        lo, hi, before, after = self._window(first, last)
+        return [0] * before + self.booked[lo:hi] + [0] * after
+
+    def closed_range(self, first, last):
+        lo, hi, before, after = self._window(first, last)
+        return bytes(before) + bytes(self.closed[lo:hi]) + bytes(after)
+
+    def free_range(self, first, last):
+        """Bookable and unbooked slots of each day first..last; closed days are 0"""
+        return [
+            0 if closed else hours & ~booked
+            for hours, booked, closed in zip(
+                self.hours_range(first, last), self.booked_range(first, last), self.closed_range(first, last)
+            )
+        ]
+
+
+class FreeSlotIndex:
+    """Inverted index (day, slot) -> ids of the artists free in that slot.
+
+    A day is built from every artist's calendar the first time it is queried and is
+    then kept up to date one artist at a time as bookings and day statuses change.
+    """
+
+    def __init__(self, calendar, max_days=MAX_INDEXED_DAYS):
+        self.calendar = calendar
+        self.max_days = max_days
+        # day -> ({artist id: free mask}, [set of artist ids per slot])
+        self.days = OrderedDict()
+        # Updates for different artists share each day's sets
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.days.clear()
+
+    def _day(self, day):
+        entry = self.days.get(day)
+        if entry is not None:
+            self.days.move_to_end(day)
+            return entry
+        masks = {}
+        slots = [set() for _ in range(SLOTS_PER_DAY)]
+        for artist_id, calendar in list(self.calendar.artists.items()):
+            mask = calendar.free_on(day)
+            if mask:
+                masks[artist_id] = mask
+                for slot in slot_bits(mask):
+                    slots[slot].add(artist_id)
+        entry = self.days[day] = (masks, slots)
+        if len(self.days) > self.max_days:
+            self.days.popitem(last=False)
+        return entry
+
+    def update(self, artist_id, day):
+        """Re-read one artist's free slots on a day that is already built"""
+        with self.lock:
+            entry = self.days.get(day)
+            if entry is None:
+                return
+            masks, slots = entry
+            old = masks.get(artist_id, 0)
+            calendar = self.calendar.artists.get(artist_id)
+            new = calendar.free_on(day) if calendar is not None else 0
+            for slot in slot_bits(old & ~new):
+                slots[slot].discard(artist_id)
+            for slot in slot_bits(new & ~old):
+                slots[slot].add(artist_id)
+            if new:
+                masks[artist_id] = new
+            else:
+                masks.pop(artist_id, None)
+
+    def free_artists(self, day, window):
+        """{artist id: free slots within the window bitmap} for artists free at any slot of it"""
+        with self.lock:
+            masks, slots = self._day(day)
+            candidates = set()
+            for slot in slot_bits(window):
+                candidates.update(slots[slot])
+            return {artist_id: masks[artist_id] & window for artist_id in candidates}
+
+
+class AvailabilityCalendar:
+    """Slot bitmaps of every artist, kept in step with availability changes and bookings"""
+
+    def __init__(self):
+        self.artists = {}
+        self.free_index = FreeSlotIndex(self)
+
+    def clear(self):
+        self.artists.clear()
+        self.free_index.clear()
+
+    def get(self, artist_id):
+        """The artist's calendar, or an empty one (not stored) for an unknown artist"""
+        return self.artists.get(artist_id) or ArtistCalendar()
+
+    def artist(self, artist_id):
+        calendar = self.artists.get(artist_id)
+        if calendar is None:
+            calendar = self.artists[artist_id] = ArtistCalendar()
+        return calendar
+
+    def configure(self, artist_id, default_hours=(), custom_hours=None, day_status=None):
+        """Build an artist's calendar from default hours, per-day custom hours and day statuses"""
+        calendar = ArtistCalendar(default_hours)
+        for date_str, times in (custom_hours or {}).items():
+            calendar.set_hours(day_number(date_str), times)
+        for date_str, status in (day_status or {}).items():
+            calendar.set_closed(day_number(date_str), status == 'unavailable')
+        self.artists[artist_id] = calendar
+        self.free_index.clear()
+        return calendar
+
+    def set_status(self, artist_id, date_str, status):
+        day = day_number(date_str)
+        self.artist(artist_id).set_closed(day, status == 'unavailable')
+        self.free_index.update(artist_id, day)
+
+    def set_hours(self, artist_id, date_str, times):
+        day = day_number(date_str)
+        self.artist(artist_id).set_hours(day, times)
+        self.free_index.update(artist_id, day)
+
+    def set_booked(self, artist_id, date_time_ms, booked):
+        """Mark the UTC slot starting at epoch ms date_time_ms booked or free"""
+        day, minute = day_and_minute(date_time_ms)
+        self.artist(artist_id).set_booked(day, minute // SLOT_MINUTES, booked)
+        self.free_index.update(artist_id, day)
+
+    def is_open(self, artist_id, date_time_ms):
+        """Whether a UTC epoch ms time starts exactly on one of the artist's bookable slots"""
+        calendar = self.artists.get(artist_id)
+        if calendar is None or date_time_ms % (SLOT_MINUTES * 60000):
+            return False
+        day, minute = day_and_minute(date_time_ms)
+        return bool(calendar.hours_on(day) >> (minute // SLOT_MINUTES) & 1)
+
+    def can_book(self, artist_id, date_time_ms):
+        """Whether set_booked can record this time without pushing the calendar past MAX_CALENDAR_DAYS"""
+        return self.get(artist_id).covers(day_and_minute(date_time_ms)[0])
+
+    def is_closed(self, artist_id, date_str):
+        """Whether the artist marked the day unavailable; dates that do not parse never are"""
+        calendar = self.artists.get(artist_id)
+        try:
+            return calendar is not None and calendar.closed_on(day_number(date_str))
+        except ValueError:
+            return False
+
+    def hours(self, artist_id, start_date, end_date):
+        """{date: ['HH:MM', ...]} of bookable hours for each day in the range"""
+        calendar = self.get(artist_id)
+        first, last = day_number(start_date), day_number(end_date)
+        return {
+            day_string(first + i): times_from_mask(mask)
+            for i, mask in enumerate(calendar.hours_range(first, last))
+        }
+
+    def day_statuses(self, artist_id, start_date, end_date):
+        """{date: 'available'|'unavailable'} for each day in the range"""
+        first, last = day_number(start_date), day_number(end_date)
+        return {
+            day_string(first + i): 'unavailable' if closed else 'available'
+            for i, closed in enumerate(self.get(artist_id).closed_range(first, last))
+        }
+
+    def booked_slots(self, artist_id, start_date=None, end_date=None):
+        """{date: ['HH:MM', ...]} of booked slots, only for days that have any"""
+        calendar = self.artists.get(artist_id)
+        if calendar is None or calendar.start is None:
+            return {}
+        if start_date and end_date:
+            first, last = day_number(start_date), day_number(end_date)
+        else:
+            first, last = calendar.start, calendar.start + len(calendar.booked) - 1
+        return {
+            day_string(first + i): times_from_mask(mask)
+            for i, mask in enumerate(calendar.booked_range(first, last)) if mask
+        }
+
+    def free_slot_count(self, artist_id, start_date, end_date):
+        """Number of open, unbooked slots over a range, e.g. a month or a quarter"""
+        first, last = day_number(start_date), day_number(end_date)
+        return sum(mask.bit_count() for mask in self.get(artist_id).free_range(first, last))
+
+    def free_between(self, start_ms, end_ms):
+        """{artist id: [(day, free slot bitmap), ...]} for artists free at any slot in [start_ms, end_ms).
+
+        Slots partly inside the window count.
+        """
+        first, first_minute = day_and_minute(start_ms)
+        first_slot = first_minute // SLOT_MINUTES
+        last = day_and_minute(end_ms)[0]
+        last_slot = -(-(end_ms % DAY_MS) // (SLOT_MINUTES * 60000))
+        if last_slot == 0:
+            last, last_slot = last - 1, SLOTS_PER_DAY
+
+        free = {}
+        for day in range(first, last + 1):
+            window = FULL_DAY
+            if day == first:
+                window &= ~((1 << first_slot) - 1)
+            if day == last:
+                window &= (1 << last_slot) - 1
+            if not window:
+                continue
+            for artist_id, mask in self.free_index.free_artists(day, window).items():
+                free.setdefault(artist_id, []).append((day, mask))
+        return free
@@ -0,0 +1,274 @@
+import itertools
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from sqlalchemy import text
+from src.models.user import db
+from src.models.booking import Availability, Booking, Campaign, Contribution, StoreChange
+
+# store_changes rows kept behind the newest; a process further behind than this reloads everything
+CHANGE_LOG_KEEP = 50000
+PRUNE_EVERY = 1000
+# Ids per IN (...) when reading changed records back
+READ_CHUNK = 500
+
+ID_MODELS = {'booking': Booking, 'campaign': Campaign, 'contribution': Contribution}
+
+
+class Storage:
+    """Durable backing for the in-memory booking and crowdfunding stores.
+
+    The routes serve reads from memory. Every write is saved through these hooks
+    first and only applied to memory once they return, so a write that fails to
+    persist leaves memory as it was. Saves inside transaction() are kept together
+    or not at all. This base class keeps nothing, which is the demo behaviour, and
+    like any storage that does not override the sharing hooks below (exclusive,
+    next_ids, last_change, changes_since) it assumes a single process.
+    """
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def exclusive(self):
+        """Held by a process around each shared write and its in-memory apply, and around syncs"""
+        return nullcontext()
+
+    def next_ids(self, kind, count=1):
+        """`count` new ids of a record kind, or None to let this process number its records"""
+        return None
+
+    def last_change(self):
+        """The position in the change log that the records load() returns are current to"""
+        return 0
+
+    def changes_since(self, seq):
+        """(latest seq, records other processes saved after seq).
+
+        The records come as {'bookings': [...], 'campaigns': [...], 'contributions': [...],
+        'availability': [...]}; they are None when the log no longer reaches back to seq
+        and everything has to be loaded again.
+        """
+        return seq, {}
+
+    def save_booking(self, booking):
+        pass
+
+    def save_campaign(self, campaign):
+        pass
+
+    def save_contribution(self, contribution):
+        pass
+
+    def save_contributions(self, contributions):
+        for contribution in contributions:
+            self.save_contribution(contribution)
+
+    def save_availability(self, artist_id, date, status=None, slots=None):
+        pass
+
+    def load(self):
+        """Return the stored records, or None when there is nothing stored yet"""
+        return None
+
+
+class SqlStorage(Storage):
+    """Writes through to the SQLAlchemy tables in src/database/app.db.
+
+    Several processes, such as gunicorn workers, can share the database. Ids come from
+    the id_sequences table, every save is logged in store_changes under the saving
+    process's pid, and each process applies the others' changes to its memory through
+    changes_since(). transaction() takes SQLite's write lock up front (BEGIN IMMEDIATE),
+    so the checks inside it see every write other processes have committed.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.RLock()
+        self.writes = itertools.count(1)
+
+    @contextmanager
+    def transaction(self):
+        """Hold the database write lock and commit the saves inside once, at the end; roll them all back if the block raises"""
+        if getattr(self.local, 'active', False):
+            yield
+            return
+        # Drop whatever the session has open, so BEGIN starts the transaction
+        db.session.rollback()
+        db.session.execute(text('BEGIN IMMEDIATE'))
+        self.local.active = True
+        try:
+            yield
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            self.local.active = False
+
+    def _commit(self):
+        if getattr(self.local, 'active', False):
+            db.session.flush()
+            return
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def exclusive(self):
+        """A process's writes and syncs take turns, so its memory applies changes in commit order"""
+        return self.lock
+
+    def _log(self, kind, record_ids):
+        origin = str(os.getpid())
+        db.session.add_all(StoreChange(kind=kind, record_id=str(i), origin=origin) for i in record_ids)
+        if next(self.writes) % PRUNE_EVERY == 0:
+            db.session.execute(
+                text('DELETE FROM store_changes WHERE seq <= (SELECT MAX(seq) FROM store_changes) - :keep'),
+                {'keep': CHANGE_LOG_KEEP}
+            )
+
+    def _save(self, row):
+        db.session.merge(row)
+        self._commit()
+
+    def save_booking(self, booking):
+        self._log('booking', [booking['id']])
+        self._save(Booking.from_dict(booking))
+
+    def save_campaign(self, campaign):
+        self._log('campaign', [campaign['id']])
+        self._save(Campaign.from_dict(campaign))
+
+    def save_contribution(self, contribution):
+        self._log('contribution', [contribution['id']])
+        self._save(Contribution.from_dict(contribution))
+
+    def save_contributions(self, contributions):
+        """Insert a batch of new contributions in one transaction"""
+        self._log('contribution', [c['id'] for c in contributions])
+        db.session.add_all(Contribution.from_dict(c) for c in contributions)
+        self._commit()
+
+    def save_availability(self, artist_id, date, status=None, slots=None):
+        self._log('availability', [json.dumps([artist_id, date])])
+        row = Availability.query.filter_by(artist_id=artist_id, date=date).first()
+        if row is None:
+            row = Availability(artist_id=artist_id, date=date)
+            db.session.add(row)
+        if status is not None:
+            row.available = status == 'available'
+        if slots is not None:
+            row.slots = json.dumps(slots)
+        self._commit()
+
+    def seed(self, bookings, campaigns, contributions, availability, custom_availability):
+        """Write the demo data into empty tables in one transaction"""
+        db.session.add_all(Booking.from_dict(b) for b in bookings)
+        db.session.add_all(Campaign.from_dict(c) for c in campaigns)
+        db.session.add_all(Contribution.from_dict(c) for c in contributions)
+        rows = {}
+        for artist_id, days in availability.items():
+            for date, status in days.items():
+                rows[(artist_id, date)] = Availability(artist_id=artist_id, date=date, available=status == 'available')
+        for artist_id, days in custom_availability.items():
+            for date, slots in days.items():
+                row = rows.get((artist_id, date))
+                if row is None:
+                    row = rows[(artist_id, date)] = Availability(artist_id=artist_id, date=date)
+                row.slots = json.dumps(slots)
+        db.session.add_all(rows.values())
+        db.session.flush()
+        self._start_sequences()
+        self._commit()
+
+    def _start_sequences(self):
+        """Start each id sequence after the largest numeric id stored, never moving one back"""
+        for kind, model in ID_MODELS.items():
+            largest = db.session.query(db.func.max(db.cast(model.id, db.Integer))).filter(
+                model.id.op('NOT GLOB')('*[^0-9]*')
+            ).scalar()
+            db.session.execute(
+                text('INSERT INTO id_sequences (kind, nextId) VALUES (:kind, :next) '
+                     'ON CONFLICT (kind) DO UPDATE SET nextId = MAX(nextId, excluded.nextId)'),
+                {'kind': kind, 'next': (largest or 0) + 1}
+            )
+
+    def next_ids(self, kind, count=1):
+        """`count` consecutive ids from the kind's id_sequences row, which every process draws on"""
+        query = text('UPDATE id_sequences SET nextId = nextId + :count WHERE kind = :kind RETURNING nextId')
+        last = db.session.execute(query, {'kind': kind, 'count': count}).scalar()
+        if last is None:
+            self._start_sequences()
+            last = db.session.execute(query, {'kind': kind, 'count': count}).scalar()
+        self._commit()
+        return [str(i) for i in range(last - count, last)]
+
+    def last_change(self):
+        return db.session.execute(text('SELECT MAX(seq) FROM store_changes')).scalar() or 0
+
+    def changes_since(self, seq):
+        # Every request asks, and mostly nothing changed: check the newest seq with plain SQL first
+        if self.last_change() <= seq:
+            return seq, {}
+        rows = db.session.query(StoreChange.seq, StoreChange.kind, StoreChange.record_id, StoreChange.origin).filter(
+            StoreChange.seq > seq
+        ).order_by(StoreChange.seq).all()
+        if not rows:
+            return seq, {}
+        if rows[0].seq != seq + 1:
+            # The rows in between were pruned
+            return rows[-1].seq, None
+
+        origin = str(os.getpid())
+        changed = {}
+        for row in rows:
+            if row.origin != origin:
+                changed.setdefault(row.kind, {})[row.record_id] = None
+        records = {}
+        for kind, model in ID_MODELS.items():
+            if kind in changed:
+                records[kind + 's'] = [r.to_dict() for r in self._rows(model, list(changed[kind]))]
+        if 'availability' in changed:
+            records['availability'] = []
+            for key in changed['availability']:
+                artist_id, date = json.loads(key)
+                row = Availability.query.filter_by(artist_id=artist_id, date=date).first()
+                if row is not None:
+                    status = None if row.available is None else 'available' if row.available else 'unavailable'
+                    records['availability'].append({'artistId': artist_id, 'date': date, 'status': status, 'slots': row.slot_list()})
+        return rows[-1].seq, records
+
+    def _rows(self, model, ids):
+        """Rows of model with the given ids, in the order they were written"""
+        rowid = db.literal_column('rowid')
+        rows = []
+        for start in range(0, len(ids), READ_CHUNK):
+            rows.extend(model.query.filter(model.id.in_(ids[start:start + READ_CHUNK])).order_by(rowid).all())
+        return rows
+
+    def load(self):
+        if db.session.query(Booking.id).first() is None and db.session.query(Campaign.id).first() is None:
+            return None
+        self._start_sequences()
+        self._commit()
+
+        availability = {}
+        custom_availability = {}
+        for row in Availability.query.all():
+            if row.available is not None:
+                availability.setdefault(row.artist_id, {})[row.date] = 'available' if row.available else 'unavailable'
+            if row.slots is not None:
+                custom_availability.setdefault(row.artist_id, {})[row.date] = row.slot_list()
+
+        # rowid keeps the order records were written in, like the in-memory lists
+        rowid = db.literal_column('rowid')
+        return {
+            'bookings': [b.to_dict() for b in Booking.query.order_by(rowid).all()],
+            'campaigns': [c.to_dict() for c in Campaign.query.order_by(rowid).all()],
+            'contributions': [c.to_dict() for c in Contribution.query.order_by(rowid).all()],
+            'availability': availability,
+            'customAvailability': custom_availability
+        }
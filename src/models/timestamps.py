@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+# Records keep their ISO display strings and carry the same instant as integer epoch
+# milliseconds in a sibling '<field>Ms' key, set once when the record is written.
+DAY_MS = 86400000
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def to_epoch_ms(value):
+    """ISO 8601 string -> epoch milliseconds; strings without an offset are read as UTC"""
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def iso_from_ms(ms):
+    """Epoch milliseconds -> canonical display string, e.g. '2025-07-10T14:30:00.000Z'"""
+    moment = datetime.fromtimestamp(ms / 1000, timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{ms % 1000:03d}Z'
+
+
+def now_ms():
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+def utc_now():
+    """(display string, epoch ms) for the current time, always in UTC with a 'Z'"""
+    ms = now_ms()
+    return iso_from_ms(ms), ms
+
+
+def stamp(record, *fields):
+    """Set '<field>Ms' for each ISO string field present on the record"""
+    for field in fields:
+        value = record.get(field)
+        if value:
+            record[field + 'Ms'] = to_epoch_ms(value)
+    return record
+
+
+def day_and_minute(ms):
+    """Epoch ms -> (proleptic Gregorian day ordinal, minute of the UTC day)"""
+    days, rest = divmod(ms, DAY_MS)
+    return EPOCH_ORDINAL + days, rest // 60000
+
+
+def days_until(deadline_ms, now=None):
+    """Whole days from now to the deadline, like timedelta.days (negative once it has passed)"""
+    return (deadline_ms - (now if now is not None else now_ms())) // DAY_MS
+
+
+def moment_of(record, field):
+    """UTC datetime of a record field, from '<field>Ms' when the record carries it"""
+    ms = record.get(field + 'Ms')
+    if ms is None:
+        ms = to_epoch_ms(record[field])
+    return datetime.fromtimestamp(ms / 1000, timezone.utc)
@@ -0,0 +1,75 @@
+import threading
+from zlib import crc32
+
+from src.models.timestamps import now_ms
+
+
+class VersionClock:
+    """Version counters for collections and entities, bumped on every mutation.
+
+    Keys are plain tuples such as ('bookings',) or ('availability', artist_id). All keys
+    share one increasing counter, so the version of several keys together is their max.
+    ETags also carry the clock's epoch, which changes on clear() and on restart, so a
+    tag issued before a reload never matches afterwards.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.epoch = now_ms()
+            self.counter = 0
+            self.versions = {}  # key -> (version, modified epoch ms)
+
+    def bump(self, *keys):
+        with self.lock:
+            self.counter += 1
+            stamp = (self.counter, now_ms())
+            for key in keys:
+                self.versions[key] = stamp
+            return self.counter
+
+    def version(self, *keys):
+        """(version, modified epoch ms) of the most recently changed key"""
+        return max((self.versions.get(key, (0, self.epoch)) for key in keys), default=(0, self.epoch))
+
+    def etag(self, version, extra=None):
+        """Strong entity tag for a version, plus any response inputs that are not versioned"""
+        tag = f'{self.epoch:x}-{version}'
+        if extra is not None:
+            tag += f'-{crc32(repr(extra).encode()):08x}'
+        return tag
+
+
+class HitCounter:
+    """Per-route counts of conditional reads and how many were answered 304"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}  # route -> [requests, not modified]
+
+    def record(self, route, hit):
+        with self.lock:
+            counts = self.routes.setdefault(route, [0, 0])
+            counts[0] += 1
+            counts[1] += hit
+
+    def to_dict(self):
+        with self.lock:
+            routes = {route: list(counts) for route, counts in self.routes.items()}
+        total = sum(requests for requests, _ in routes.values())
+        hits = sum(hits for _, hits in routes.values())
+        return {
+            'requests': total,
+            'notModified': hits,
+            'hitRatio': round(hits / total, 4) if total else 0.0,
+            'routes': {
+                route: {
+                    'requests': requests,
+                    'notModified': hits,
+                    'hitRatio': round(hits / requests, 4) if requests else 0.0
+                } for route, (requests, hits) in routes.items()
+            }
+        }
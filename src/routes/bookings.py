@@ -1,11 +1,36 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta
-import uuid
+from flask import Blueprint, Response, request, jsonify
+from datetime import datetime, timezone
+from src.models.booking_store import ACTIVE_STATUSES, BOOKING_STATUSES, BookingStore
+from src.models.campaign_store import CampaignStore
+from src.models.concurrency import IdSequence, StripedLock
+from src.models.keyset import decode_cursor, encode_cursor, sort_key
+from src.models.slot_calendar import SLOT_MINUTES, AvailabilityCalendar, day_number, day_string, times_from_mask
+from src.models.storage import Storage
+from src.models.timestamps import DAY_MS, days_until, now_ms, stamp, to_epoch_ms, utc_now
+from src.models.versions import HitCounter, VersionClock
+from src.services.email_service import email_service
+import json
 
 bookings_bp = Blueprint('bookings', __name__)
 
+# Records carry '<field>Ms' epoch milliseconds next to their ISO strings, set on write
+def stamp_booking(booking):
+    return stamp(booking, 'dateTime', 'createdAt', 'updatedAt')
+
+def stamp_campaign(campaign):
+    return stamp(campaign, 'deadline', 'createdAt', 'updatedAt')
+
+def stamp_contribution(contribution):
+    return stamp(contribution, 'createdAt')
+
+STAMPED_KEYS = ('dateTimeMs', 'createdAtMs', 'updatedAtMs', 'deadlineMs')
+
+def public(record):
+    """A record as the API returns it, without the '<field>Ms' keys the server keeps for itself"""
+    return {key: value for key, value in record.items() if key not in STAMPED_KEYS}
+
 # In-memory storage for demo (replace with database in production)
-bookings_db = [
+booking_store = BookingStore(map(stamp_booking, [
     {
         'id': '1',
         'artistId': '1',
@@ -54,7 +79,7 @@ bookings_db = [
         'createdAt': '2025-06-25T09:15:00Z',
         'updatedAt': '2025-06-26T14:20:00Z'
     }
-]
+]))
 
 # Artist information for email notifications
 artists_db = {
@@ -65,6 +90,16 @@ artists_db = {
     }
 }
 
+# Artist ids by lowercased specialty, for the availability search
+artists_by_specialty = {}
+
+def index_artist(artist_id, artist):
+    for specialty in artist.get('specialties', []):
+        artists_by_specialty.setdefault(specialty.lower(), set()).add(artist_id)
+
+for artist_id, artist in artists_db.items():
+    index_artist(artist_id, artist)
+
 # Artist availability storage (in production, this would be in database)
 availability_db = {
     '1': {
@@ -103,7 +138,7 @@ availability_db = {
 }
 
 # Campaigns storage for crowdfunding
-campaigns_db = [
+campaigns_seed = [
     {
         'id': '1',
         'artistId': '1',
@@ -133,7 +168,7 @@ campaigns_db = [
 ]
 
 # Contributions storage
-contributions_db = [
+contributions_seed = [
     {
         'id': '1',
         'campaignId': '1',
@@ -166,6 +201,9 @@ contributions_db = [
     }
 ]
 
+# Campaigns with their contributions and running contribution aggregates
+campaign_store = CampaignStore(map(stamp_campaign, campaigns_seed), map(stamp_contribution, contributions_seed))
+
 # Artist availability template (in production, this would be in database)
 artist_availability = {
     '1': {
@@ -185,48 +223,225 @@ artist_availability = {
     }
 }
 
+# Slot bitmaps built from availability_db, artist_availability and the active bookings
+availability_calendar = AvailabilityCalendar()
+
+def build_calendar():
+    """Rebuild every artist's slot bitmaps from the stores above"""
+    availability_calendar.clear()
+    for artist_id in set(availability_db) | set(artist_availability):
+        artist_avail = artist_availability.get(artist_id, {})
+        availability_calendar.configure(
+            artist_id,
+            artist_avail.get('default_hours', []),
+            artist_avail.get('custom_availability', {}),
+            availability_db.get(artist_id, {})
+        )
+    for booking in booking_store.by_status.get('pending', {}).values():
+        availability_calendar.set_booked(booking['artistId'], booking['dateTimeMs'], True)
+    for booking in booking_store.by_status.get('confirmed', {}).values():
+        availability_calendar.set_booked(booking['artistId'], booking['dateTimeMs'], True)
+
+def sync_booked_slot(booking):
+    """Mark a booking's slot booked while any pending or confirmed booking holds it"""
+    held = booking_store.active_at(booking['artistId'], booking['dateTimeMs']) is not None
+    availability_calendar.set_booked(booking['artistId'], booking['dateTimeMs'], held)
+
+build_calendar()
+
+# Booking writes hold their artist's lock and contribution writes their campaign's, so
+# a request's checks and the write that follows them never interleave with another's.
+# With SqlStorage writes also hold storage.exclusive() and SQLite's write lock, so
+# writes to different artists still commit one at a time
+artist_locks = StripedLock()
+campaign_locks = StripedLock()
+booking_ids = IdSequence(b['id'] for b in booking_store)
+campaign_ids = IdSequence(c['id'] for c in campaign_store)
+contribution_ids = IdSequence(c['id'] for c in campaign_store.contributions)
+
+# Durable backing for the stores above; main.py swaps in SqlStorage at startup
+storage = Storage()
+# How far into the storage's change log the stores above are current
+stored_seq = 0
+
+def init_storage(new_storage):
+    """Use new_storage for writes and load its records, seeding it with the demo data when empty"""
+    global storage, stored_seq
+    storage = new_storage
+
+    # Under the write lock, so of several workers starting together only one seeds
+    with storage.transaction():
+        seq = storage.last_change()
+        records = storage.load()
+        if records is None:
+            seed = getattr(storage, 'seed', None)
+            if seed:
+                custom = {
+                    artist_id: avail.get('custom_availability', {})
+                    for artist_id, avail in artist_availability.items()
+                }
+                seed(list(booking_store), list(campaign_store), campaign_store.contributions, availability_db, custom)
+    stored_seq = seq
+    if records is not None:
+        load_stores(records)
+
+def load_stores(records):
+    """Refill the stores in place from stored records, so every reference to them sees the records"""
+    booking_store.clear()
+    for booking in sorted(map(stamp_booking, records['bookings']), key=sort_key):
+        booking_store.add(booking)
+    campaign_store.clear()
+    for campaign in records['campaigns']:
+        campaign_store.add_campaign(stamp_campaign(campaign))
+    for contribution in records['contributions']:
+        campaign_store.add_contribution(stamp_contribution(contribution))
+    availability_db.clear()
+    availability_db.update(records['availability'])
+    for artist_id, days in records['customAvailability'].items():
+        artist_avail = artist_availability.setdefault(artist_id, {'default_hours': [], 'custom_availability': {}})
+        artist_avail.setdefault('custom_availability', {}).update(days)
+    build_calendar()
+    versions.clear()
+    booking_ids.reset(b['id'] for b in booking_store)
+    campaign_ids.reset(c['id'] for c in campaign_store)
+    contribution_ids.reset(c['id'] for c in campaign_store.contributions)
+
+def sync_stores():
+    """Apply the writes other processes sharing the storage have committed since the last sync"""
+    global stored_seq
+    # Unlocked: most requests find nothing new and should not queue behind write transactions
+    if storage.last_change() <= stored_seq:
+        return
+    with storage.exclusive():
+        seq, records = storage.changes_since(stored_seq)
+        if records is None:
+            load_stores(storage.load())
+        elif records:
+            apply_stored(records)
+        stored_seq = seq
+
+def apply_stored(records):
+    """Apply records another process saved to the in-memory stores and bump their versions"""
+    for booking in records.get('bookings', []):
+        stamp_booking(booking)
+        current = booking_store.get(booking['id'])
+        if current is None:
+            current = booking_store.add(booking)
+        else:
+            booking_store.set_status(current, booking['status'], booking.get('updatedAt'), booking.get('updatedAtMs'))
+        if availability_calendar.can_book(current['artistId'], current['dateTimeMs']):
+            sync_booked_slot(current)
+        versions.bump(*booking_version_keys(current))
+    for campaign in records.get('campaigns', []):
+        stamp_campaign(campaign)
+        current = campaign_store.get(campaign['id'])
+        if current is None:
+            campaign_store.add_campaign(campaign)
+        else:
+            current.update(campaign)
+    for contribution in records.get('contributions', []):
+        if not campaign_store.has_contribution(contribution['campaignId'], contribution['id']):
+            campaign_store.add_contribution(stamp_contribution(contribution))
+    if records.get('campaigns') or records.get('contributions'):
+        versions.bump(('campaigns',))
+    for day in records.get('availability', []):
+        artist_id, date = day['artistId'], day['date']
+        if day['status'] is not None:
+            availability_db.setdefault(artist_id, {})[date] = day['status']
+            availability_calendar.set_status(artist_id, date, day['status'])
+        if day['slots'] is not None:
+            artist_avail = artist_availability.setdefault(artist_id, {'default_hours': [], 'custom_availability': {}})
+            artist_avail.setdefault('custom_availability', {})[date] = day['slots']
+            availability_calendar.set_hours(artist_id, date, day['slots'])
+        versions.bump(('availability', artist_id))
+
+@bookings_bp.before_request
+def pick_up_stored_changes():
+    sync_stores()
+
+def new_ids(kind, sequence, count=1):
+    """Ids for new records: from the storage when it hands them out, else from this process's sequence"""
+    ids = storage.next_ids(kind, count)
+    return ids if ids is not None else sequence.take(count)
+
+def campaign_json(campaign, now=None):
+    """A campaign with its contribution aggregates and derived fields, leaving the stored record untouched"""
+    result = public(campaign)
+    result.update(campaign_store.aggregate(campaign['id']))
+    result['progressPercentage'] = round((campaign['currentAmount'] / campaign['targetAmount']) * 100, 1)
+    result['daysRemaining'] = max(0, days_until(campaign['deadlineMs'], now))
+    return result
+
+MAX_PAGE_SIZE = 100
+
+def parse_page_args():
+    """Read the optional ?limit= and ?cursor= of a listing; without a limit every record is returned"""
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    if limit is not None:
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError('limit must be a positive integer')
+        limit = min(int(limit), MAX_PAGE_SIZE)
+    after = decode_cursor(cursor) if cursor else None
+    return limit, after
+
+def next_cursor(next_key):
+    return encode_cursor(next_key) if next_key else None
+
+# Version counters behind the ETag / Last-Modified validators of the polled read endpoints.
+# Every mutation bumps ('bookings',) plus ('bookings', email), ('campaigns',) or ('availability', artist_id)
+versions = VersionClock()
+conditional_reads = HitCounter()
+
+def booking_version_keys(booking):
+    return ('bookings',), ('bookings', booking['clientEmail'].lower())
+
+def conditional_read(*keys, extra=None):
+    """Validators for a read built from the versioned keys, and whether the client's copy is current.
+
+    extra covers response inputs no version tracks, such as days remaining; such responses
+    carry no Last-Modified since it could not reflect them. Last-Modified has whole-second
+    resolution, so it is also left off while the second of the last change is still running:
+    a later change in that second would carry the same value and be answered 304.
+    """
+    version, modified_ms = versions.version(*keys)
+    etag = versions.etag(version, extra)
+    if extra is not None or modified_ms // 1000 >= now_ms() // 1000:
+        last_modified = None
+    else:
+        last_modified = datetime.fromtimestamp(modified_ms // 1000, timezone.utc)
+    if request.if_none_match:
+        fresh = request.if_none_match.contains(etag)
+    else:
+        fresh = bool(last_modified and request.if_modified_since and last_modified <= request.if_modified_since)
+    conditional_reads.record(request.url_rule.rule, fresh)
+    return etag, last_modified, fresh
+
+def with_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
 def get_booked_slots_for_artist(artist_id, start_date=None, end_date=None):
     """Get all booked time slots for an artist within a date range"""
-    booked_slots = {}
-    
-    for booking in bookings_db:
-        if booking['artistId'] == artist_id and booking['status'] in ['pending', 'confirmed']:
-            booking_date = datetime.fromisoformat(booking['dateTime'].replace('Z', '+00:00'))
-            date_str = booking_date.strftime('%Y-%m-%d')
-            time_str = booking_date.strftime('%H:%M')
-            
-            # Filter by date range if provided
-            if start_date and end_date:
-                if date_str < start_date or date_str > end_date:
-                    continue
-            
-            if date_str not in booked_slots:
-                booked_slots[date_str] = []
-            booked_slots[date_str].append(time_str)
-    
-    return booked_slots
+    return availability_calendar.booked_slots(artist_id, start_date, end_date)
 
-def check_time_slot_availability(artist_id, date_time):
+def is_time_slot_available(artist_id, date_time):
     """Check if a specific time slot is available for booking"""
     try:
-        booking_datetime = datetime.fromisoformat(date_time.replace('Z', '+00:00'))
-        date_str = booking_datetime.strftime('%Y-%m-%d')
-        time_str = booking_datetime.strftime('%H:%M')
-        
-        # Check if artist has availability for this date
-        artist_avail = artist_availability.get(artist_id, {})
-        available_slots = artist_avail.get('custom_availability', {}).get(date_str)
-        
-        if available_slots is None:
-            # Use default hours if no custom availability
-            available_slots = artist_avail.get('default_hours', [])
+        date_time_ms = to_epoch_ms(date_time)
         
-        if time_str not in available_slots:
+        # Check the artist's hours (custom for the date, else default) for this slot
+        if not availability_calendar.is_open(artist_id, date_time_ms):
             return False, "Artist is not available at this time"
         
+        # The calendar spans a bounded number of days per artist
+        if not availability_calendar.can_book(artist_id, date_time_ms):
+            return False, "Date is too far from the artist's other dates"
+        
         # Check if slot is already booked
-        booked_slots = get_booked_slots_for_artist(artist_id, date_str, date_str)
-        if date_str in booked_slots and time_str in booked_slots[date_str]:
+        if booking_store.active_at(artist_id, date_time_ms):
             return False, "Time slot is already booked"
         
         return True, "Time slot is available"
@@ -251,36 +466,59 @@ def create_booking():
         if not re.match(email_pattern, data['clientEmail']):
             return jsonify({'error': 'Invalid email format'}), 400
         
-        # Check time slot availability
-        available, message = is_time_slot_available(data['artistId'], data['dateTime'])
-        if not available:
-            return jsonify({'error': message}), 409
-        
-        # Check for duplicate bookings
-        for booking in bookings_db:
-            if (booking['artistId'] == data['artistId'] and 
-                booking['dateTime'] == data['dateTime'] and
-                booking['status'] in ['pending', 'confirmed']):
-                return jsonify({'error': 'Time slot already booked'}), 409
-        
-        # Create new booking
-        new_booking = {
-            'id': len(bookings_db) + 1,
-            'artistId': data['artistId'],
-            'clientName': data['clientName'],
-            'clientEmail': data['clientEmail'],
-            'dateTime': data['dateTime'],
-            'service': data['service'],
-            'message': data.get('message', ''),
-            'status': 'pending',
-            'createdAt': datetime.now().isoformat()
-        }
+        with artist_locks.hold(data['artistId']), storage.exclusive():
+            with storage.transaction():
+                # Check against every booking committed so far, this process's or not
+                sync_stores()
+                
+                # Check time slot availability
+                available, message = is_time_slot_available(data['artistId'], data['dateTime'])
+                if not available:
+                    return jsonify({'error': message}), 409
+                
+                # Check for duplicate bookings
+                date_time_ms = to_epoch_ms(data['dateTime'])
+                if booking_store.active_at(data['artistId'], date_time_ms):
+                    return jsonify({'error': 'Time slot already booked'}), 409
+                
+                # Create new booking
+                created_at, created_at_ms = utc_now()
+                new_booking = {
+                    'id': new_ids('booking', booking_ids)[0],
+                    'artistId': data['artistId'],
+                    'clientName': data['clientName'],
+                    'clientEmail': data['clientEmail'],
+                    'dateTime': data['dateTime'],
+                    'service': data['service'],
+                    'message': data.get('message', ''),
+                    'status': 'pending',
+                    'createdAt': created_at,
+                    'createdAtMs': created_at_ms,
+                    'dateTimeMs': date_time_ms
+                }
+                
+                storage.save_booking(new_booking)
+            
+            availability_calendar.set_booked(new_booking['artistId'], date_time_ms, True)
+            booking_store.add(new_booking)
+            versions.bump(*booking_version_keys(new_booking))
         
-        bookings_db.append(new_booking)
+        # Notify the artist, or add the request to their digest in digest mode
+        artist_info = artists_db.get(new_booking['artistId'])
+        if artist_info:
+            try:
+                email_service.send_booking_notification_to_artist(
+                    new_booking,
+                    artist_info['email'],
+                    artist_info['name']
+                )
+            except Exception as e:
+                print(f"Error sending booking notification email: {str(e)}")
+                # Don't fail the booking if email fails
         
         return jsonify({
             'success': True,
-            'booking': new_booking,
+            'booking': public(new_booking),
             'message': 'Booking request submitted successfully'
         }), 201
         
@@ -294,18 +532,35 @@ def update_booking_status(booking_id):
         data = request.get_json()
         
         # Find the booking
-        booking = next((b for b in bookings_db if str(b['id']) == str(booking_id)), None)
+        booking = booking_store.get(booking_id)
         if not booking:
             return jsonify({'error': 'Booking not found'}), 404
         
         # Update status
         if 'status' in data:
-            booking['status'] = data['status']
-            booking['updatedAt'] = datetime.now().isoformat()
+            if data['status'] not in BOOKING_STATUSES:
+                return jsonify({'error': f'Invalid status. Must be one of: {", ".join(BOOKING_STATUSES)}'}), 400
+            with artist_locks.hold(booking['artistId']), storage.exclusive():
+                with storage.transaction():
+                    sync_stores()
+                    # A sync that reloads the stores replaces every record, so look it up again
+                    booking = booking_store.get(booking_id)
+                    if not booking:
+                        return jsonify({'error': 'Booking not found'}), 404
+                    
+                    # Reactivating a declined or cancelled booking needs its slot to be free still
+                    if data['status'] in ACTIVE_STATUSES and booking['status'] not in ACTIVE_STATUSES:
+                        if booking_store.active_at(booking['artistId'], booking['dateTimeMs']):
+                            return jsonify({'error': 'Time slot already booked'}), 409
+                    updated_at, updated_at_ms = utc_now()
+                    storage.save_booking(dict(booking, status=data['status'], updatedAt=updated_at, updatedAtMs=updated_at_ms))
+                booking_store.set_status(booking, data['status'], updated_at, updated_at_ms)
+                sync_booked_slot(booking)
+                versions.bump(*booking_version_keys(booking))
         
         return jsonify({
             'success': True,
-            'booking': booking,
+            'booking': public(booking),
             'message': f'Booking {data.get("status", "updated")} successfully'
         }), 200
         
@@ -320,30 +575,35 @@ def get_bookings():
         user_id = request.args.get('userId')
         client_email = request.args.get('clientEmail')
         status = request.args.get('status')
-        
-        # Filter bookings
-        filtered_bookings = bookings_db.copy()
-        
-        if artist_id:
-            filtered_bookings = [b for b in filtered_bookings if b['artistId'] == artist_id]
-        
-        if user_id:
-            filtered_bookings = [b for b in filtered_bookings if b.get('userId') == user_id]
-        
-        if client_email:
-            filtered_bookings = [b for b in filtered_bookings if b['clientEmail'] == client_email]
-        
-        if status:
-            filtered_bookings = [b for b in filtered_bookings if b['status'] == status]
-        
-        # Sort by creation date (newest first)
-        filtered_bookings.sort(key=lambda x: x['createdAt'], reverse=True)
-        
-        return jsonify({
+        try:
+            limit, after = parse_page_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        etag, last_modified, fresh = conditional_read(('bookings',))
+        if fresh:
+            return with_validators(Response(status=304), etag, last_modified)
+        
+        # Filter bookings, newest first
+        filtered_bookings, next_key, total = booking_store.page(
+            artist_id=artist_id,
+            user_id=user_id,
+            client_email=client_email,
+            status=status,
+            limit=limit,
+            after=after
+        )
+        
+        result = {
             'success': True,
-            'bookings': filtered_bookings,
-            'total': len(filtered_bookings)
-        })
+            'bookings': [public(b) for b in filtered_bookings],
+            'hasMore': next_key is not None,
+            'nextCursor': next_cursor(next_key)
+        }
+        # Left out for filter combinations that have no maintained count
+        if total is not None:
+            result['total'] = total
+        return with_validators(jsonify(result), etag, last_modified)
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -351,14 +611,14 @@ def get_bookings():
 @bookings_bp.route('/api/v1/bookings/<booking_id>', methods=['GET'])
 def get_booking(booking_id):
     try:
-        booking = next((b for b in bookings_db if b['id'] == booking_id), None)
+        booking = booking_store.get(booking_id)
         
         if not booking:
             return jsonify({'error': 'Booking not found'}), 404
         
         return jsonify({
             'success': True,
-            'booking': booking
+            'booking': public(booking)
         })
         
     except Exception as e:
@@ -374,17 +634,27 @@ def confirm_booking(booking_id):
             return jsonify({'error': 'Invalid action. Must be "accept" or "decline"'}), 400
         
         # Find booking
-        booking = next((b for b in bookings_db if b['id'] == booking_id), None)
+        booking = booking_store.get(booking_id)
         if not booking:
             return jsonify({'error': 'Booking not found'}), 404
         
-        if booking['status'] != 'pending':
-            return jsonify({'error': 'Booking is not in pending status'}), 400
-        
-        # Update booking status
-        new_status = 'confirmed' if action == 'accept' else 'declined'
-        booking['status'] = new_status
-        booking['updatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        with artist_locks.hold(booking['artistId']), storage.exclusive():
+            with storage.transaction():
+                sync_stores()
+                # A sync that reloads the stores replaces every record, so look it up again
+                booking = booking_store.get(booking_id)
+                if not booking:
+                    return jsonify({'error': 'Booking not found'}), 404
+                if booking['status'] != 'pending':
+                    return jsonify({'error': 'Booking is not in pending status'}), 400
+                
+                # Update booking status
+                new_status = 'confirmed' if action == 'accept' else 'declined'
+                updated_at, updated_at_ms = utc_now()
+                storage.save_booking(dict(booking, status=new_status, updatedAt=updated_at, updatedAtMs=updated_at_ms))
+            booking_store.set_status(booking, new_status, updated_at, updated_at_ms)
+            sync_booked_slot(booking)
+            versions.bump(*booking_version_keys(booking))
         
         # Send status update email to client
         artist_info = artists_db.get(booking['artistId'])
@@ -401,7 +671,7 @@ def confirm_booking(booking_id):
         
         return jsonify({
             'success': True,
-            'booking': booking,
+            'booking': public(booking),
             'message': f'Booking {new_status} successfully. Client has been notified via email.'
         })
         
@@ -426,25 +696,10 @@ def get_availability(artist_id):
         availability = {}
         
         if start_date and end_date:
-            # Generate availability for date range
-            current_date = datetime.strptime(start_date, '%Y-%m-%d')
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-            
-            while current_date <= end_date_obj:
-                date_str = current_date.strftime('%Y-%m-%d')
-                
-                # Skip past dates
-                if current_date.date() < datetime.now().date():
-                    current_date += timedelta(days=1)
-                    continue
-                
-                # Get available slots for this date
-                if date_str in custom_availability:
-                    availability[date_str] = custom_availability[date_str]
-                else:
-                    availability[date_str] = default_hours.copy()
-                
-                current_date += timedelta(days=1)
+            # Generate availability for date range, skipping past dates
+            first_date = max(start_date, datetime.now().strftime('%Y-%m-%d'))
+            if day_number(first_date) <= day_number(end_date):
+                availability = availability_calendar.hours(artist_id, first_date, end_date)
         else:
             # Return custom availability only
             availability = custom_availability.copy()
@@ -469,7 +724,7 @@ def check_availability():
         if not artist_id or not date_time:
             return jsonify({'error': 'Missing artistId or dateTime'}), 400
         
-        is_available, message = check_time_slot_availability(artist_id, date_time)
+        is_available, message = is_time_slot_available(artist_id, date_time)
         
         return jsonify({
             'success': True,
@@ -481,23 +736,31 @@ def check_availability():
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
 # Statistics endpoint for artist dashboard
+STATS_MAX_WINDOW_DAYS = 366
+
 @bookings_bp.route('/api/v1/bookings/stats/<artist_id>', methods=['GET'])
 def get_booking_stats(artist_id):
     try:
-        artist_bookings = [b for b in bookings_db if b['artistId'] == artist_id]
-        
-        stats = {
-            'total': len(artist_bookings),
-            'pending': len([b for b in artist_bookings if b['status'] == 'pending']),
-            'confirmed': len([b for b in artist_bookings if b['status'] == 'confirmed']),
-            'completed': len([b for b in artist_bookings if b['status'] == 'completed']),
-            'declined': len([b for b in artist_bookings if b['status'] == 'declined'])
-        }
-        
-        return jsonify({
+        with booking_store.lock:
+            stats = booking_store.stats.for_artist(artist_id)
+        response = {
             'success': True,
             'stats': stats
-        })
+        }
+        
+        # Optional counts for bookings created in the last N days, e.g. ?windows=7,30,90
+        windows = request.args.get('windows')
+        if windows:
+            now = now_ms()
+            response['windows'] = {}
+            for window in windows.split(','):
+                window = window.strip()
+                if not window.isdigit() or not 1 <= int(window) <= STATS_MAX_WINDOW_DAYS:
+                    return jsonify({'error': f'windows must be day counts between 1 and {STATS_MAX_WINDOW_DAYS}'}), 400
+                with booking_store.lock:
+                    response['windows'][window] = booking_store.stats.for_window(artist_id, int(window), now)
+        
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -509,6 +772,10 @@ def get_artist_availability(artist_id):
         start_date = request.args.get('startDate')
         end_date = request.args.get('endDate')
         
+        etag, last_modified, fresh = conditional_read(('availability', artist_id))
+        if fresh:
+            return with_validators(Response(status=304), etag, last_modified)
+        
         if artist_id not in availability_db:
             availability_db[artist_id] = {}
         
@@ -516,21 +783,12 @@ def get_artist_availability(artist_id):
         
         # Filter by date range if provided
         if start_date and end_date:
-            filtered_availability = {}
-            current_date = datetime.strptime(start_date, '%Y-%m-%d')
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-            
-            while current_date <= end_date_obj:
-                date_str = current_date.strftime('%Y-%m-%d')
-                filtered_availability[date_str] = artist_availability.get(date_str, 'available')
-                current_date += timedelta(days=1)
-            
-            artist_availability = filtered_availability
+            artist_availability = availability_calendar.day_statuses(artist_id, start_date, end_date)
         
-        return jsonify({
+        return with_validators(jsonify({
             'success': True,
             'availability': artist_availability
-        })
+        }), etag, last_modified)
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -544,12 +802,29 @@ def update_artist_availability(artist_id):
         if not availability:
             return jsonify({'error': 'No availability data provided'}), 400
         
-        # Initialize artist availability if not exists
-        if artist_id not in availability_db:
-            availability_db[artist_id] = {}
-        
-        # Update availability
-        availability_db[artist_id].update(availability)
+        for date, status in availability.items():
+            if status not in ('available', 'unavailable'):
+                return jsonify({'error': f'Invalid availability for {date}: must be "available" or "unavailable"'}), 400
+            try:
+                day_number(date)
+            except ValueError:
+                return jsonify({'error': f'Invalid date: {date}'}), 400
+        
+        with artist_locks.hold(artist_id), storage.exclusive():
+            with storage.transaction():
+                sync_stores()
+                for date, status in availability.items():
+                    storage.save_availability(artist_id, date, status=status)
+            
+            # Initialize artist availability if not exists
+            if artist_id not in availability_db:
+                availability_db[artist_id] = {}
+            
+            # Update availability
+            availability_db[artist_id].update(availability)
+            for date, status in availability.items():
+                availability_calendar.set_status(artist_id, date, status)
+            versions.bump(('availability', artist_id))
         
         return jsonify({
             'success': True,
@@ -572,23 +847,19 @@ def check_time_slot_availability():
             return jsonify({'error': 'Missing required fields: artistId, date, time'}), 400
         
         # Check if date is available
-        if artist_id in availability_db:
-            date_availability = availability_db[artist_id].get(date, 'available')
-            if date_availability == 'unavailable':
-                return jsonify({
-                    'success': True,
-                    'available': False,
-                    'message': 'This date is marked as unavailable'
-                })
+        if availability_calendar.is_closed(artist_id, date):
+            return jsonify({
+                'success': True,
+                'available': False,
+                'message': 'This date is marked as unavailable'
+            })
         
         # Check for existing confirmed bookings at this time
-        date_time_str = f"{date}T{time}:00Z"
-        existing_booking = next((
-            b for b in bookings_db 
-            if b['artistId'] == artist_id 
-            and b['dateTime'] == date_time_str 
-            and b['status'] in ['confirmed', 'pending']
-        ), None)
+        try:
+            date_time_ms = to_epoch_ms(f"{date}T{time}:00Z")
+        except ValueError:
+            return jsonify({'error': 'Invalid date or time format'}), 400
+        existing_booking = booking_store.active_at(artist_id, date_time_ms)
         
         if existing_booking:
             return jsonify({
@@ -610,17 +881,24 @@ def check_time_slot_availability():
 @bookings_bp.route('/api/v1/bookings/user/<user_email>', methods=['GET'])
 def get_user_bookings(user_email):
     try:
-        # Find all bookings for this user email
-        user_bookings = [b for b in bookings_db if b['clientEmail'].lower() == user_email.lower()]
+        try:
+            limit, after = parse_page_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Sort by creation date (newest first)
-        user_bookings.sort(key=lambda x: x['createdAt'], reverse=True)
+        etag, last_modified, fresh = conditional_read(('bookings', user_email.lower()))
+        if fresh:
+            return with_validators(Response(status=304), etag, last_modified)
         
-        return jsonify({
+        # Find the bookings for this user email, newest first
+        user_bookings, next_key, total = booking_store.page_for_email(user_email, limit, after)
+        
+        return with_validators(jsonify({
             'success': True,
-            'bookings': user_bookings,
-            'total': len(user_bookings)
-        })
+            'bookings': [public(b) for b in user_bookings],
+            'total': total,
+            'nextCursor': next_cursor(next_key)
+        }), etag, last_modified)
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -638,23 +916,19 @@ def check_timeslot_availability():
             return jsonify({'error': 'Missing required fields: artistId, date, time'}), 400
         
         # Check if date is available
-        if artist_id in availability_db:
-            date_availability = availability_db[artist_id].get(date, 'available')
-            if date_availability == 'unavailable':
-                return jsonify({
-                    'success': True,
-                    'available': False,
-                    'message': 'This date is marked as unavailable by the artist'
-                })
+        if availability_calendar.is_closed(artist_id, date):
+            return jsonify({
+                'success': True,
+                'available': False,
+                'message': 'This date is marked as unavailable by the artist'
+            })
         
         # Check for existing confirmed bookings at this time
-        date_time_str = f"{date}T{time}:00Z"
-        existing_booking = next((
-            b for b in bookings_db 
-            if b['artistId'] == artist_id 
-            and b['dateTime'] == date_time_str 
-            and b['status'] in ['confirmed', 'pending']
-        ), None)
+        try:
+            date_time_ms = to_epoch_ms(f"{date}T{time}:00Z")
+        except ValueError:
+            return jsonify({'error': 'Invalid date or time format'}), 400
+        existing_booking = booking_store.active_at(artist_id, date_time_ms)
         
         if existing_booking:
             return jsonify({
@@ -713,7 +987,78 @@ def test_email():
         
         return jsonify({
             'success': success,
-            'message': f'Test email sent successfully' if success else 'Failed to send test email'
+            'message': f'Test email queued for sending' if success else 'Failed to queue test email'
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+# ============= ARTIST SEARCH ENDPOINTS =============
+
+MAX_SEARCH_DAYS = 31
+MAX_SEARCH_RESULTS = 100
+
+# Find artists free at a time or within a window
+@bookings_bp.route('/api/v1/artists/available', methods=['GET'])
+def search_available_artists():
+    try:
+        date_time = request.args.get('dateTime')
+        start = request.args.get('start')
+        end = request.args.get('end')
+        specialties = [
+            specialty.strip().lower()
+            for value in request.args.getlist('specialty')
+            for specialty in value.split(',') if specialty.strip()
+        ]
+        
+        try:
+            if date_time:
+                start_ms = to_epoch_ms(date_time)
+                end_ms = start_ms + SLOT_MINUTES * 60000
+            elif start and end:
+                start_ms, end_ms = to_epoch_ms(start), to_epoch_ms(end)
+            else:
+                return jsonify({'error': 'Provide dateTime, or start and end'}), 400
+        except ValueError:
+            return jsonify({'error': 'Invalid date/time format'}), 400
+        
+        if end_ms <= start_ms:
+            return jsonify({'error': 'end must be after start'}), 400
+        if end_ms - start_ms > MAX_SEARCH_DAYS * DAY_MS:
+            return jsonify({'error': f'Search window cannot exceed {MAX_SEARCH_DAYS} days'}), 400
+        
+        limit = request.args.get('limit', '20')
+        if not limit.isdigit() or int(limit) < 1:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+        limit = min(int(limit), MAX_SEARCH_RESULTS)
+        
+        free = availability_calendar.free_between(start_ms, end_ms)
+        
+        # Keep artists with any of the requested specialties
+        if specialties:
+            wanted = set()
+            for specialty in specialties:
+                wanted |= artists_by_specialty.get(specialty, set())
+            free = {artist_id: days for artist_id, days in free.items() if artist_id in wanted}
+        
+        artists = []
+        for artist_id in sorted(free, key=lambda a: (len(a), a))[:limit]:
+            artist = artists_db.get(artist_id, {})
+            artists.append({
+                'artistId': artist_id,
+                'name': artist.get('name'),
+                'specialties': artist.get('specialties', []),
+                'freeSlots': [
+                    f'{day_string(day)}T{time}:00Z'
+                    for day, mask in free[artist_id]
+                    for time in times_from_mask(mask)
+                ]
+            })
+        
+        return jsonify({
+            'success': True,
+            'artists': artists,
+            'total': len(free)
         })
         
     except Exception as e:
@@ -729,29 +1074,26 @@ def get_campaigns():
         status_filter = request.args.get('status', 'active')
         artist_id = request.args.get('artistId')
         
-        filtered_campaigns = campaigns_db
-        
-        if status_filter != 'all':
-            filtered_campaigns = [c for c in filtered_campaigns if c['status'] == status_filter]
+        filtered_campaigns = campaign_store.find(
+            status=None if status_filter == 'all' else status_filter,
+            artist_id=artist_id
+        )
         
-        if artist_id:
-            filtered_campaigns = [c for c in filtered_campaigns if c['artistId'] == artist_id]
+        # Days remaining change with the clock rather than with a version, so they join the ETag
+        now = now_ms()
+        days_remaining = [max(0, days_until(c['deadlineMs'], now)) for c in filtered_campaigns]
+        etag, last_modified, fresh = conditional_read(('campaigns',), extra=days_remaining)
+        if fresh:
+            return with_validators(Response(status=304), etag, last_modified)
         
-        # Calculate progress percentage for each campaign
-        for campaign in filtered_campaigns:
-            campaign['progressPercentage'] = round((campaign['currentAmount'] / campaign['targetAmount']) * 100, 1)
-            
-            # Calculate days remaining
-            deadline = datetime.fromisoformat(campaign['deadline'].replace('Z', '+00:00'))
-            now = datetime.now(deadline.tzinfo)
-            days_remaining = (deadline - now).days
-            campaign['daysRemaining'] = max(0, days_remaining)
+        # Add progress, days remaining and contribution totals to each campaign
+        filtered_campaigns = [campaign_json(c, now) for c in filtered_campaigns]
         
-        return jsonify({
+        return with_validators(jsonify({
             'success': True,
             'campaigns': filtered_campaigns,
             'total': len(filtered_campaigns)
-        })
+        }), etag, last_modified)
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -778,33 +1120,41 @@ def create_campaign():
         
         # Validate deadline
         try:
-            deadline = datetime.fromisoformat(data['deadline'].replace('Z', '+00:00'))
-            if deadline <= datetime.now(deadline.tzinfo):
+            deadline_ms = to_epoch_ms(data['deadline'])
+            if deadline_ms <= now_ms():
                 return jsonify({'error': 'Deadline must be in the future'}), 400
         except ValueError:
             return jsonify({'error': 'Invalid deadline format'}), 400
         
-        # Create new campaign
-        campaign_id = str(len(campaigns_db) + 1)
-        new_campaign = {
-            'id': campaign_id,
-            'artistId': data['artistId'],
-            'title': data['title'],
-            'description': data['description'],
-            'targetAmount': target_amount,
-            'currentAmount': 0,
-            'deadline': data['deadline'],
-            'imageUrl': data.get('imageUrl', ''),
-            'status': 'active',
-            'createdAt': datetime.now().isoformat() + 'Z',
-            'updatedAt': datetime.now().isoformat() + 'Z'
-        }
-        
-        campaigns_db.append(new_campaign)
+        with storage.exclusive():
+            with storage.transaction():
+                # Create new campaign
+                campaign_id = new_ids('campaign', campaign_ids)[0]
+                created_at, created_at_ms = utc_now()
+                new_campaign = {
+                    'id': campaign_id,
+                    'artistId': data['artistId'],
+                    'title': data['title'],
+                    'description': data['description'],
+                    'targetAmount': target_amount,
+                    'currentAmount': 0,
+                    'deadline': data['deadline'],
+                    'deadlineMs': deadline_ms,
+                    'imageUrl': data.get('imageUrl', ''),
+                    'status': 'active',
+                    'createdAt': created_at,
+                    'createdAtMs': created_at_ms,
+                    'updatedAt': created_at,
+                    'updatedAtMs': created_at_ms
+                }
+                storage.save_campaign(new_campaign)
+            
+            campaign_store.add_campaign(new_campaign)
+            versions.bump(('campaigns',))
         
         return jsonify({
             'success': True,
-            'campaign': new_campaign,
+            'campaign': campaign_json(new_campaign),
             'message': 'Campaign created successfully'
         }), 201
         
@@ -815,26 +1165,13 @@ def create_campaign():
 @bookings_bp.route('/api/v1/campaigns/<campaign_id>', methods=['GET'])
 def get_campaign(campaign_id):
     try:
-        campaign = next((c for c in campaigns_db if c['id'] == campaign_id), None)
+        campaign = campaign_store.get(campaign_id)
         if not campaign:
             return jsonify({'error': 'Campaign not found'}), 404
         
-        # Calculate progress percentage
-        campaign['progressPercentage'] = round((campaign['currentAmount'] / campaign['targetAmount']) * 100, 1)
-        
-        # Calculate days remaining
-        deadline = datetime.fromisoformat(campaign['deadline'].replace('Z', '+00:00'))
-        now = datetime.now(deadline.tzinfo)
-        days_remaining = (deadline - now).days
-        campaign['daysRemaining'] = max(0, days_remaining)
-        
-        # Get campaign contributions
-        campaign_contributions = [c for c in contributions_db if c['campaignId'] == campaign_id]
-        campaign['contributionsCount'] = len(campaign_contributions)
-        
         return jsonify({
             'success': True,
-            'campaign': campaign
+            'campaign': campaign_json(campaign)
         })
         
     except Exception as e:
@@ -844,40 +1181,52 @@ def get_campaign(campaign_id):
 @bookings_bp.route('/api/v1/campaigns/<campaign_id>', methods=['PATCH'])
 def update_campaign(campaign_id):
     try:
-        campaign = next((c for c in campaigns_db if c['id'] == campaign_id), None)
+        campaign = campaign_store.get(campaign_id)
         if not campaign:
             return jsonify({'error': 'Campaign not found'}), 404
         
         data = request.get_json()
         
-        # Update allowed fields
+        # Check every field before changing anything
+        changes = {}
         updatable_fields = ['title', 'description', 'targetAmount', 'deadline', 'imageUrl', 'status']
         for field in updatable_fields:
             if field in data:
                 if field == 'targetAmount':
                     try:
                         target_amount = float(data[field])
-                        if target_amount <= 0:
-                            return jsonify({'error': 'Target amount must be greater than 0'}), 400
-                        campaign[field] = target_amount
-                    except ValueError:
+                    except (TypeError, ValueError):
                         return jsonify({'error': 'Invalid target amount format'}), 400
+                    if target_amount <= 0:
+                        return jsonify({'error': 'Target amount must be greater than 0'}), 400
+                    changes[field] = target_amount
                 elif field == 'deadline':
                     try:
-                        deadline = datetime.fromisoformat(data[field].replace('Z', '+00:00'))
-                        if deadline <= datetime.now(deadline.tzinfo):
-                            return jsonify({'error': 'Deadline must be in the future'}), 400
-                        campaign[field] = data[field]
-                    except ValueError:
+                        deadline_ms = to_epoch_ms(data[field])
+                    except (TypeError, ValueError, AttributeError):
                         return jsonify({'error': 'Invalid deadline format'}), 400
+                    if deadline_ms <= now_ms():
+                        return jsonify({'error': 'Deadline must be in the future'}), 400
+                    changes[field] = data[field]
+                    changes['deadlineMs'] = deadline_ms
                 else:
-                    campaign[field] = data[field]
-        
-        campaign['updatedAt'] = datetime.now().isoformat() + 'Z'
+                    changes[field] = data[field]
+        
+        with campaign_locks.hold(campaign_id), storage.exclusive():
+            with storage.transaction():
+                sync_stores()
+                # A sync that reloads the stores replaces every record, so look it up again
+                campaign = campaign_store.get(campaign_id)
+                if not campaign:
+                    return jsonify({'error': 'Campaign not found'}), 404
+                changes['updatedAt'], changes['updatedAtMs'] = utc_now()
+                storage.save_campaign(dict(campaign, **changes))
+            campaign.update(changes)
+            versions.bump(('campaigns',))
         
         return jsonify({
             'success': True,
-            'campaign': campaign,
+            'campaign': campaign_json(campaign),
             'message': 'Campaign updated successfully'
         })
         
@@ -886,93 +1235,248 @@ def update_campaign(campaign_id):
 
 # ============= CONTRIBUTION ENDPOINTS =============
 
+MAX_BATCH_ROWS = 10000
+
+
+class ContributionError(ValueError):
+    """A contribution payload that cannot be accepted, with the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def campaign_key(data):
+    """The campaignId a payload names, if it is one that can be looked up (a string or number)"""
+    if isinstance(data, dict):
+        campaign_id = data.get('campaignId')
+        if isinstance(campaign_id, (str, int, float)) and not isinstance(campaign_id, bool):
+            return campaign_id
+    return None
+
+
+def validate_contribution(data, now):
+    """The (campaign, amount) a contribution payload applies to, or ContributionError"""
+    if not isinstance(data, dict):
+        raise ContributionError('Contribution must be a JSON object')
+    
+    # Validate required fields
+    required_fields = ['campaignId', 'contributorName', 'contributorEmail', 'amount']
+    for field in required_fields:
+        if not data.get(field):
+            raise ContributionError(f'Missing required field: {field}')
+    if campaign_key(data) is None:
+        raise ContributionError('Invalid campaignId format')
+    
+    # Validate amount
+    try:
+        amount = float(data['amount'])
+    except (TypeError, ValueError):
+        raise ContributionError('Invalid amount format')
+    if amount <= 0:
+        raise ContributionError('Contribution amount must be greater than 0')
+    
+    # Check if campaign exists, is active and its deadline has not passed
+    campaign = campaign_store.get(data['campaignId'])
+    if not campaign:
+        raise ContributionError('Campaign not found', 404)
+    if campaign['status'] != 'active':
+        raise ContributionError('Campaign is not active')
+    if now > campaign['deadlineMs']:
+        raise ContributionError('Campaign deadline has passed')
+    return campaign, amount
+
+
+def new_contribution_record(contribution_id, data, amount, created_at, created_at_ms):
+    return {
+        'id': contribution_id,
+        'campaignId': data['campaignId'],
+        'contributorName': data['contributorName'],
+        'contributorEmail': data['contributorEmail'],
+        'amount': amount,
+        'message': data.get('message', ''),
+        'paymentMethod': data.get('paymentMethod', 'credit_card'),
+        'createdAt': created_at,
+        'createdAtMs': created_at_ms
+    }
+
+
+def parse_batch_rows():
+    """Rows of a batch request body: a JSON array, or one JSON object per line (NDJSON)"""
+    body = request.get_data(as_text=True)
+    if request.mimetype != 'application/x-ndjson' and body.lstrip().startswith('['):
+        rows = json.loads(body)
+        if not isinstance(rows, list):
+            raise ValueError('Body must be a JSON array or NDJSON')
+        return rows
+    rows = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            # Reported against the row rather than failing the whole batch
+            rows.append(None)
+    return rows
+
 # Submit contribution
 @bookings_bp.route('/api/v1/contributions', methods=['POST'])
 def create_contribution():
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['campaignId', 'contributorName', 'contributorEmail', 'amount']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Validate amount
-        try:
-            amount = float(data['amount'])
-            if amount <= 0:
-                return jsonify({'error': 'Contribution amount must be greater than 0'}), 400
-        except ValueError:
-            return jsonify({'error': 'Invalid amount format'}), 400
-        
-        # Check if campaign exists and is active
-        campaign = next((c for c in campaigns_db if c['id'] == data['campaignId']), None)
-        if not campaign:
-            return jsonify({'error': 'Campaign not found'}), 404
-        
-        if campaign['status'] != 'active':
-            return jsonify({'error': 'Campaign is not active'}), 400
-        
-        # Check if campaign deadline has passed
-        deadline = datetime.fromisoformat(campaign['deadline'].replace('Z', '+00:00'))
-        if datetime.now(deadline.tzinfo) > deadline:
-            return jsonify({'error': 'Campaign deadline has passed'}), 400
-        
-        # Create new contribution
-        contribution_id = str(len(contributions_db) + 1)
-        new_contribution = {
-            'id': contribution_id,
-            'campaignId': data['campaignId'],
-            'contributorName': data['contributorName'],
-            'contributorEmail': data['contributorEmail'],
-            'amount': amount,
-            'message': data.get('message', ''),
-            'paymentMethod': data.get('paymentMethod', 'credit_card'),
-            'createdAt': datetime.now().isoformat() + 'Z'
-        }
-        
-        contributions_db.append(new_contribution)
-        
-        # Update campaign current amount
-        campaign['currentAmount'] += amount
-        campaign['updatedAt'] = datetime.now().isoformat() + 'Z'
+        with campaign_locks.hold(campaign_key(data)), storage.exclusive():
+            with storage.transaction():
+                # Check against the campaign's total as committed, whichever process last changed it
+                sync_stores()
+                try:
+                    campaign, amount = validate_contribution(data, now_ms())
+                except ContributionError as e:
+                    return jsonify({'error': str(e)}), e.status
+                
+                # Create new contribution
+                created_at, created_at_ms = utc_now()
+                contribution_id = new_ids('contribution', contribution_ids)[0]
+                new_contribution = new_contribution_record(contribution_id, data, amount, created_at, created_at_ms)
+                
+                # Update campaign current amount
+                changes = {
+                    'currentAmount': campaign['currentAmount'] + amount,
+                    'updatedAt': created_at,
+                    'updatedAtMs': created_at_ms
+                }
+                storage.save_contribution(new_contribution)
+                storage.save_campaign(dict(campaign, **changes))
+            
+            campaign_store.add_contribution(new_contribution)
+            campaign.update(changes)
+            versions.bump(('campaigns',))
         
         return jsonify({
             'success': True,
-            'contribution': new_contribution,
-            'campaign': campaign,
+            'contribution': public(new_contribution),
+            'campaign': campaign_json(campaign),
             'message': 'Contribution submitted successfully'
         }), 201
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+# Submit many contributions at once (JSON array or NDJSON)
+@bookings_bp.route('/api/v1/contributions/batch', methods=['POST'])
+def create_contributions_batch():
+    try:
+        try:
+            rows = parse_batch_rows()
+        except ValueError as e:
+            return jsonify({'error': f'Invalid batch body: {str(e)}'}), 400
+        if not rows:
+            return jsonify({'error': 'Batch contains no contributions'}), 400
+        if len(rows) > MAX_BATCH_ROWS:
+            return jsonify({'error': f'Batch may contain at most {MAX_BATCH_ROWS} contributions'}), 400
+        
+        # Hold every campaign the batch touches while its rows are checked and applied
+        campaign_keys = {campaign_key(row) for row in rows}
+        with campaign_locks.hold(*campaign_keys), storage.exclusive():
+            changes = {}
+            with storage.transaction():
+                sync_stores()
+                
+                # Validate every row against the same clock
+                created_at, created_at_ms = utc_now()
+                results = []
+                accepted = []
+                for index, data in enumerate(rows):
+                    try:
+                        campaign, amount = validate_contribution(data, created_at_ms)
+                    except ContributionError as e:
+                        results.append({'index': index, 'success': False, 'error': str(e), 'status': e.status})
+                        continue
+                    results.append({'index': index, 'success': True})
+                    accepted.append((results[-1], data, campaign, amount))
+                
+                # Number the valid ones in one step and group them by campaign
+                by_campaign = {}
+                ids = new_ids('contribution', contribution_ids, len(accepted)) if accepted else []
+                for contribution_id, (result, data, campaign, amount) in zip(ids, accepted):
+                    contribution = new_contribution_record(contribution_id, data, amount, created_at, created_at_ms)
+                    by_campaign.setdefault(campaign['id'], (campaign, []))[1].append(contribution)
+                    result['id'] = contribution_id
+                
+                # Persist every campaign's contributions and totals together, then apply them
+                for campaign_id, (campaign, contributions) in by_campaign.items():
+                    changes[campaign_id] = {
+                        'currentAmount': campaign['currentAmount'] + sum(c['amount'] for c in contributions),
+                        'updatedAt': created_at,
+                        'updatedAtMs': created_at_ms
+                    }
+                    storage.save_contributions(contributions)
+                    storage.save_campaign(dict(campaign, **changes[campaign_id]))
+            
+            campaigns = []
+            for campaign_id, (campaign, contributions) in by_campaign.items():
+                campaign_store.add_contributions(campaign_id, contributions)
+                campaign.update(changes[campaign_id])
+                campaigns.append(campaign_json(campaign))
+            if by_campaign:
+                versions.bump(('campaigns',))
+        
+        created = sum(len(contributions) for _, contributions in by_campaign.values())
+        return jsonify({
+            'success': created > 0,
+            'created': created,
+            'failed': len(results) - created,
+            'results': results,
+            'campaigns': campaigns
+        }), 201 if created else 400
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
 # Get contributions for a campaign
 @bookings_bp.route('/api/v1/contributions/<campaign_id>', methods=['GET'])
 def get_campaign_contributions(campaign_id):
     try:
         # Check if campaign exists
-        campaign = next((c for c in campaigns_db if c['id'] == campaign_id), None)
+        campaign = campaign_store.get(campaign_id)
         if not campaign:
             return jsonify({'error': 'Campaign not found'}), 404
         
-        # Get all contributions for this campaign
-        campaign_contributions = [c for c in contributions_db if c['campaignId'] == campaign_id]
-        
-        # Sort by creation date (newest first)
-        campaign_contributions.sort(key=lambda x: x['createdAt'], reverse=True)
+        try:
+            limit, after = parse_page_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Calculate total amount
-        total_amount = sum(c['amount'] for c in campaign_contributions)
+        # Get this campaign's contributions, newest first
+        campaign_contributions, next_key = campaign_store.contributions_page(campaign_id, limit, after)
+        aggregate = campaign_store.aggregate(campaign_id)
         
         return jsonify({
             'success': True,
-            'contributions': campaign_contributions,
-            'total': len(campaign_contributions),
-            'totalAmount': total_amount
+            'contributions': [public(c) for c in campaign_contributions],
+            'total': aggregate['contributionsCount'],
+            'totalAmount': aggregate['totalContributed'],
+            'nextCursor': next_cursor(next_key)
         })
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+
+# ============= METRICS =============
+
+# How often the polled read endpoints answered 304 Not Modified, the email outbox's backlog
+# and, in digest mode, the artist notifications waiting to be sent
+@bookings_bp.route('/api/v1/metrics', methods=['GET'])
+def get_metrics():
+    try:
+        return jsonify({
+            'success': True,
+            'conditionalGet': conditional_reads.to_dict(),
+            'emailOutbox': email_service.outbox.stats(),
+            'emailDigest': email_service.digest.stats() if email_service.digest is not None else None
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -0,0 +1,271 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from src.models.timestamps import now_ms
+
+# Messages a dispatcher claims per transaction
+CLAIM_BATCH = 20
+# A 'sending' message whose dispatcher died is reclaimed after this long
+LEASE_MS = 60000
+# Longest an idle dispatcher sleeps before looking for due messages again
+IDLE_POLL_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id TEXT NOT NULL UNIQUE,
+    recipient TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html TEXT NOT NULL,
+    text TEXT,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at INTEGER NOT NULL,
+    claimed_by TEXT,
+    claimed_at INTEGER,
+    created_at INTEGER NOT NULL,
+    sent_at INTEGER,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_due ON email_outbox (state, next_attempt_at);
+"""
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Take a token; returns 0, or the seconds until one is available (nothing taken)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class DomainLimits:
+    """One TokenBucket per recipient domain, created on first use"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def take(self, domain):
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            with self.lock:
+                bucket = self.buckets.setdefault(domain, TokenBucket(self.rate, self.burst))
+        return bucket.take()
+
+
+class DurableOutbox:
+    """Email outbox persisted in a SQLite table, drained by dispatcher threads.
+
+    Messages move queued -> sending -> sent, or back to queued with a later
+    next_attempt_at after a failure, and to failed after max_attempts. Dispatchers claim
+    due messages in batches inside one write transaction, so no two claim the same one;
+    a message left 'sending' by a dispatcher that died is reclaimed once its lease
+    expires. The lease is renewed just before each send, so only a single send that
+    outlasts lease_ms (keep the transport timeout below it) lets another dispatcher take
+    the message over, and every later update only applies while the dispatcher still
+    holds the claim. Sends are rate limited per recipient domain and overall. Each
+    message keeps its Message-ID across attempts, so the rare resend after a crash
+    between the SMTP reply and the 'sent' update can be recognised downstream.
+    """
+
+    def __init__(self, path, transport_factory, sender, workers=2, max_attempts=5, backoff=1.0,
+                 max_backoff=300.0, rate=10.0, burst=20, domain_rate=2.0, domain_burst=5,
+                 batch_size=CLAIM_BATCH, lease_ms=LEASE_MS):
+        self.path = path
+        self.transport_factory = transport_factory
+        self.sender = sender
+        self.worker_count = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.lease_ms = lease_ms
+        self.rate_limit = TokenBucket(rate, burst)
+        self.domain_limits = DomainLimits(domain_rate, domain_burst)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.workers = []
+        self.ready = False
+
+    def _db(self):
+        """This thread's connection, in autocommit mode so transactions are explicit"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')
+            if not self.ready:
+                conn.executescript(SCHEMA)
+                self.ready = True
+            self.local.conn = conn
+        return conn
+
+    # ============= PRODUCERS =============
+
+    def enqueue(self, to_email, subject, html_content, text_content=None):
+        now = now_ms()
+        domain = to_email.rsplit('@', 1)[-1].lower()
+        self._db().execute(
+            'INSERT INTO email_outbox (message_id, recipient, domain, subject, html, text, next_attempt_at, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (f'<{uuid.uuid4().hex}@macsplatform.com>', to_email, domain, subject, html_content, text_content, now, now)
+        )
+        self.start()
+        with self.wake:
+            self.wake.notify()
+        return True
+
+    def start(self):
+        """Start the dispatchers, which also pick up whatever a previous process left queued"""
+        if len(self.workers) >= self.worker_count:
+            return
+        with self.lock:
+            while len(self.workers) < self.worker_count:
+                worker = threading.Thread(target=self._dispatch, name=f'email-dispatch-{len(self.workers)}', daemon=True)
+                self.workers.append(worker)
+                worker.start()
+
+    # ============= DISPATCHERS =============
+
+    def _claim(self, worker_id):
+        now = now_ms()
+        db = self._db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            rows = db.execute(
+                "SELECT id, message_id, recipient, domain, subject, html, text, attempts FROM email_outbox "
+                "WHERE (state = 'queued' AND next_attempt_at <= ?) OR (state = 'sending' AND claimed_at < ?) "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, now - self.lease_ms, self.batch_size)
+            ).fetchall()
+            db.executemany(
+                "UPDATE email_outbox SET state = 'sending', claimed_by = ?, claimed_at = ? WHERE id = ?",
+                [(worker_id, now, row[0]) for row in rows]
+            )
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return [{
+            'id': row[0], 'messageId': row[1], 'to': row[2], 'domain': row[3],
+            'subject': row[4], 'html': row[5], 'text': row[6], 'attempts': row[7]
+        } for row in rows]
+
+    def _idle_wait(self):
+        row = self._db().execute("SELECT MIN(next_attempt_at) FROM email_outbox WHERE state = 'queued'").fetchone()
+        wait = IDLE_POLL_SECONDS if row[0] is None else max(0.0, min(IDLE_POLL_SECONDS, (row[0] - now_ms()) / 1000))
+        with self.wake:
+            self.wake.wait(wait)
+
+    def _dispatch(self):
+        # Unique across restarts too, since claimed_by decides who may still update a message
+        worker_id = f'{os.getpid()}-{threading.current_thread().name}-{uuid.uuid4().hex[:8]}'
+        transport = self.transport_factory()
+        while True:
+            try:
+                batch = self._claim(worker_id)
+                if not batch:
+                    self._idle_wait()
+                    continue
+                for email in batch:
+                    self._deliver(transport, email, worker_id)
+            except Exception as e:
+                print(f"Email dispatcher error: {str(e)}")
+                time.sleep(IDLE_POLL_SECONDS)
+
+    def _update_claimed(self, email, worker_id, assignments, values):
+        """Update a claimed message if this dispatcher still holds it; False if its lease was lost"""
+        updated = self._db().execute(
+            f"UPDATE email_outbox SET {assignments} WHERE id = ? AND claimed_by = ? AND state = 'sending'",
+            (*values, email['id'], worker_id)
+        ).rowcount
+        return updated == 1
+
+    def _deliver(self, transport, email, worker_id):
+        # A domain over its limit only delays its own messages
+        wait = self.domain_limits.take(email['domain'])
+        if wait:
+            self._update_claimed(email, worker_id, "state = 'queued', claimed_by = NULL, next_attempt_at = ?",
+                                 (now_ms() + int(wait * 1000) + 1,))
+            return
+        wait = self.rate_limit.take()
+        while wait:
+            time.sleep(wait)
+            wait = self.rate_limit.take()
+
+        # Renew the lease for this send; the message may have waited behind the rest of its batch
+        if not self._update_claimed(email, worker_id, 'claimed_at = ?', (now_ms(),)):
+            return
+
+        attempts = email['attempts'] + 1
+        try:
+            transport.send(self.sender, email)
+        except Exception as e:
+            transport.close()
+            if attempts >= self.max_attempts:
+                print(f"Error sending email to {email['to']} after {attempts} attempts: {str(e)}")
+                self._update_claimed(email, worker_id, "state = 'failed', attempts = ?, claimed_by = NULL, last_error = ?",
+                                     (attempts, str(e)))
+            else:
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+                self._update_claimed(email, worker_id,
+                                     "state = 'queued', attempts = ?, claimed_by = NULL, next_attempt_at = ?, last_error = ?",
+                                     (attempts, now_ms() + int(delay * 1000), str(e)))
+            return
+        if not self._update_claimed(email, worker_id, "state = 'sent', attempts = ?, claimed_by = NULL, sent_at = ?",
+                                    (attempts, now_ms())):
+            print(f"Email {email['messageId']} was sent after its lease expired; another dispatcher may send it again")
+
+    # ============= INSPECTION =============
+
+    def pending(self):
+        row = self._db().execute("SELECT COUNT(*) FROM email_outbox WHERE state IN ('queued', 'sending')").fetchone()
+        return row[0]
+
+    def flush(self, timeout=None):
+        """Wait until no message is queued or sending; False if timeout passed first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self):
+        db = self._db()
+        states = dict(db.execute('SELECT state, COUNT(*) FROM email_outbox GROUP BY state').fetchall())
+        latency = db.execute(
+            "SELECT AVG(sent_at - created_at), MAX(sent_at - created_at) FROM "
+            "(SELECT sent_at, created_at FROM email_outbox WHERE state = 'sent' ORDER BY id DESC LIMIT 1000)"
+        ).fetchone()
+        return {
+            'sent': states.get('sent', 0),
+            'failed': states.get('failed', 0),
+            'queueDepth': states.get('queued', 0) + states.get('sending', 0),
+            'states': {state: states.get(state, 0) for state in ('queued', 'sending', 'sent', 'failed')},
+            'workers': len(self.workers),
+            'latencyMs': {'avg': latency[0], 'max': latency[1]}
+        }
@@ -0,0 +1,96 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class DigestBuffer:
+    """Items buffered per key and flushed together, after `window` seconds or at `max_items`.
+
+    Every open buffer has one deadline in a heap that a single timer thread sleeps on, so
+    the number of threads does not grow with the number of keys. A buffer flushed early
+    for reaching max_items leaves its heap entry behind, which the timer skips when it
+    comes due. flush(key, meta, items) is called without the lock held, from the timer
+    thread or from the add() that filled the buffer.
+    """
+
+    def __init__(self, flush, window=300.0, max_items=10):
+        self.flush = flush
+        self.window = window
+        self.max_items = max_items
+        self.cond = threading.Condition()
+        self.buffers = {}  # key -> {'seq', 'deadline', 'meta', 'items'}
+        self.heap = []     # (deadline, seq, key)
+        self.seq = itertools.count()
+        self.timer = None
+        self.buffered = 0
+        self.flushed = 0
+        self.digests = 0
+
+    def add(self, key, item, **meta):
+        with self.cond:
+            buffer = self.buffers.get(key)
+            if buffer is None:
+                deadline = time.monotonic() + self.window
+                buffer = {'seq': next(self.seq), 'deadline': deadline, 'meta': meta, 'items': []}
+                self.buffers[key] = buffer
+                heapq.heappush(self.heap, (deadline, buffer['seq'], key))
+                self._start()
+                self.cond.notify()
+            buffer['items'].append(item)
+            self.buffered += 1
+            full = len(buffer['items']) >= self.max_items
+            if full:
+                del self.buffers[key]
+        if full:
+            self._flush(key, buffer)
+        return True
+
+    def _start(self):
+        if self.timer is None:
+            self.timer = threading.Thread(target=self._run, name='email-digest', daemon=True)
+            self.timer.start()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while True:
+                    wait = self.heap[0][0] - time.monotonic() if self.heap else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self.cond.wait(wait)
+                _, seq, key = heapq.heappop(self.heap)
+                buffer = self.buffers.get(key)
+                if buffer is None or buffer['seq'] != seq:
+                    continue
+                del self.buffers[key]
+            self._flush(key, buffer)
+
+    def _flush(self, key, buffer):
+        with self.cond:
+            self.flushed += len(buffer['items'])
+            self.digests += 1
+        try:
+            self.flush(key, buffer['meta'], buffer['items'])
+        except Exception as e:
+            print(f"Error flushing email digest for {key}: {str(e)}")
+
+    def flush_all(self):
+        """Flush every open buffer now, e.g. at shutdown"""
+        with self.cond:
+            buffers = list(self.buffers.items())
+            self.buffers.clear()
+        for key, buffer in buffers:
+            self._flush(key, buffer)
+
+    def stats(self):
+        with self.cond:
+            return {
+                'windowSeconds': self.window,
+                'maxItems': self.max_items,
+                'openDigests': len(self.buffers),
+                'pending': sum(len(buffer['items']) for buffer in self.buffers.values()),
+                'buffered': self.buffered,
+                'flushed': self.flushed,
+                'digestsSent': self.digests
+            }
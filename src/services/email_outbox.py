@@ -0,0 +1,186 @@
+import queue
+import random
+import smtplib
+import threading
+import time
+from collections import deque
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# Send latencies kept for the percentiles in stats()
+LATENCY_WINDOW = 1000
+
+
+def build_message(sender, to_email, subject, html_content, text_content=None, message_id=None):
+    """The MIME message for an email, with a plain text part when one is given"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg['To'] = to_email
+    if message_id:
+        msg['Message-ID'] = message_id
+    if text_content:
+        msg.attach(MIMEText(text_content, 'plain'))
+    msg.attach(MIMEText(html_content, 'html'))
+    return msg
+
+
+class LogTransport:
+    """Prints emails instead of sending them (the demo behaviour)"""
+
+    def send(self, sender, email):
+        print(f"\n=== EMAIL NOTIFICATION ===")
+        print(f"To: {email['to']}")
+        print(f"Subject: {email['subject']}")
+        print(f"Content: {email['html']}")
+        print("=========================\n")
+
+    def close(self):
+        pass
+
+
+class SmtpTransport:
+    """One long-lived SMTP connection, opened with STARTTLS and login on first use and reused"""
+
+    def __init__(self, host, port, user, password, starttls=True, timeout=30):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.server = None
+
+    def connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                server.ehlo()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+
+    def send(self, sender, email):
+        msg = build_message(sender, email['to'], email['subject'], email['html'], email.get('text'), email.get('messageId'))
+        if self.server is None:
+            self.connect()
+        try:
+            self.server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped an idle connection; one fresh attempt before backing off
+            self.close()
+            self.connect()
+            self.server.send_message(msg)
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                self.server.close()
+            self.server = None
+
+
+class EmailOutbox:
+    """Queue of outgoing emails drained by a pool of worker threads.
+
+    Each worker owns one transport (so one persistent SMTP connection), reconnects it
+    after a failure and retries with exponential backoff up to max_attempts. Workers
+    start on the first enqueue.
+    """
+
+    def __init__(self, transport_factory, sender, workers=2, max_attempts=5, backoff=1.0, max_backoff=60.0):
+        self.transport_factory = transport_factory
+        self.sender = sender
+        self.worker_count = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.workers = []
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)  # enqueue to sent, seconds
+
+    def enqueue(self, to_email, subject, html_content, text_content=None):
+        self.start()
+        self.queue.put({
+            'to': to_email,
+            'subject': subject,
+            'html': html_content,
+            'text': text_content,
+            'enqueuedAt': time.monotonic()
+        })
+        return True
+
+    def start(self):
+        if len(self.workers) >= self.worker_count:
+            return
+        with self.lock:
+            while len(self.workers) < self.worker_count:
+                worker = threading.Thread(target=self._work, name=f'email-outbox-{len(self.workers)}', daemon=True)
+                self.workers.append(worker)
+                worker.start()
+
+    def _work(self):
+        transport = self.transport_factory()
+        while True:
+            email = self.queue.get()
+            try:
+                self._deliver(transport, email)
+            finally:
+                self.queue.task_done()
+
+    def _deliver(self, transport, email):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                transport.send(self.sender, email)
+            except Exception as e:
+                transport.close()
+                if attempt == self.max_attempts:
+                    print(f"Error sending email to {email['to']} after {attempt} attempts: {str(e)}")
+                    with self.lock:
+                        self.failed += 1
+                    return
+                with self.lock:
+                    self.retries += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+            else:
+                with self.lock:
+                    self.sent += 1
+                    self.latencies.append(time.monotonic() - email['enqueuedAt'])
+                return
+
+    def flush(self, timeout=None):
+        """Wait until every queued email is sent or has failed; False if timeout passed first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            counts = {'sent': self.sent, 'failed': self.failed, 'retries': self.retries}
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3) if latencies else None
+
+        counts.update({
+            'queueDepth': self.queue.qsize(),
+            'workers': len(self.workers),
+            'latencyMs': {'p50': percentile(0.5), 'p95': percentile(0.95), 'max': percentile(1.0)}
+        })
+        return counts
@@ -0,0 +1,110 @@
+import os
+
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup, escape
+
+from src.models.timestamps import moment_of
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates', 'emails')
+
+SITE_FOOTER = {'link_text': 'Visit us at', 'link_url': 'https://macsplatform.com', 'link_label': 'macsplatform.com'}
+DASHBOARD_FOOTER = {
+    'link_text': 'Visit your dashboard at',
+    'link_url': 'https://macsplatform.com/dashboard',
+    'link_label': 'macsplatform.com/dashboard'
+}
+
+# variant -> (template, heading, styles fragment, styles context, footer context, template context)
+VARIANTS = {
+    'booking_confirmation': (
+        'booking_confirmation.html', 'Booking Request Submitted!', 'client_styles.html',
+        {'accent': '#3B82F6', 'badge_background': '#FEF3C7', 'badge_color': '#92400E'}, SITE_FOOTER, {}
+    ),
+    'artist_notification': (
+        'artist_notification.html', 'New Booking Request!', 'artist_styles.html', {}, DASHBOARD_FOOTER, {}
+    ),
+    'artist_digest': (
+        'artist_digest.html', 'New Booking Requests!', 'artist_styles.html', {'table': True}, DASHBOARD_FOOTER, {}
+    ),
+    'status_confirmed': (
+        'status_update.html', 'Booking Status Update', 'client_styles.html',
+        {'accent': '#10B981', 'badge_background': '#10B981', 'badge_color': 'white'}, SITE_FOOTER, {'confirmed': True}
+    ),
+    'status_declined': (
+        'status_update.html', 'Booking Status Update', 'client_styles.html',
+        {'accent': '#EF4444', 'badge_background': '#EF4444', 'badge_color': 'white'}, SITE_FOOTER, {'confirmed': False}
+    )
+}
+
+
+def booking_context(booking):
+    """The per-booking part of a template context"""
+    moment = moment_of(booking, 'dateTime')
+    return {'booking': booking, 'date': moment.strftime('%A, %B %d, %Y'), 'time': moment.strftime('%I:%M %p')}
+
+
+class EmailTemplates:
+    """The booking emails as Jinja2 templates, compiled once and rendered with autoescaping.
+
+    Everything around the message body (doctype, styles, header, sign-off and footer) is
+    fixed per variant, so it is rendered once here and only the body template runs per
+    email. auto_reload is off: templates ship with the code, and reload checks would
+    stat the files on every render.
+    """
+
+    def __init__(self, directory=TEMPLATE_DIR):
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=True,
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self.variants = {}
+        for variant, (template, heading, styles, styles_context, footer_context, context) in VARIANTS.items():
+            styles = Markup(self.fragment(styles, styles_context))
+            head = self.fragment('header.html', {'styles': styles, 'heading': heading})
+            tail = self.fragment('footer.html', footer_context)
+            self.variants[variant] = (self.env.get_template(template), head, tail, context)
+
+    def fragment(self, name, context):
+        return self.env.get_template(f'fragments/{name}').render(context)
+
+    def render(self, variant, booking, **context):
+        template, head, tail, static = self.variants[variant]
+        return head + template.render(static, **context, **booking_context(booking)) + tail
+
+    def render_digest(self, variant, bookings, **context):
+        """Render one email listing several bookings, as `requests` in the template"""
+        template, head, tail, static = self.variants[variant]
+        requests = [booking_context(booking) for booking in bookings]
+        return head + template.render(static, requests=requests, **context) + tail
+
+    def render_many(self, variant, bookings, **context):
+        """Render one variant for many bookings.
+
+        The shared context is merged and escaped once, booking times are formatted once
+        per distinct time, and each render runs the compiled template directly on a
+        context sharing that dict instead of copying it together with the globals.
+        """
+        template, head, tail, static = self.variants[variant]
+        shared = dict(static)
+        shared.update({key: escape(value) for key, value in context.items()})
+        moments = {}
+        rendered = []
+        for booking in bookings:
+            values = dict(shared)
+            values['booking'] = booking
+            key = booking.get('dateTimeMs', booking.get('dateTime'))
+            formatted = moments.get(key)
+            if formatted is None:
+                formatted = moments[key] = booking_context(booking)
+            values['date'] = formatted['date']
+            values['time'] = formatted['time']
+            body = ''.join(template.root_render_func(template.new_context(values, shared=True)))
+            rendered.append(head + body + tail)
+        return rendered
+
+
+# Compiled at import, so at startup
+email_templates = EmailTemplates()
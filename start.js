@@ -1,6 +1,7 @@
 const express = require('express');
 const cors = require('cors');
 const helmet = require('helmet');
+const fs = require('fs');
 require('dotenv').config();
 
 const app = express();
@@ -491,11 +492,26 @@ app.use((err, req, res, next) => {
 });
 
 // Start server
-app.listen(PORT, '0.0.0.0', () => {
-  console.log(`🌺 MACS Backend API running on port ${PORT}`);
-  console.log(`🚀 Health check: http://localhost:${PORT}/health`);
-  console.log(`📊 Environment: ${process.env.NODE_ENV || 'development'}`);
-});
+const SOCKET_PATH = process.env.SOCKET_PATH;
+
+if (SOCKET_PATH) {
+  // Listen on a Unix domain socket when the Python proxy asks for one
+  try {
+    fs.unlinkSync(SOCKET_PATH);
+  } catch (err) {
+    if (err.code !== 'ENOENT') throw err;
+  }
+  app.listen(SOCKET_PATH, () => {
+    console.log(`🌺 MACS Backend API running on socket ${SOCKET_PATH}`);
+    console.log(`📊 Environment: ${process.env.NODE_ENV || 'development'}`);
+  });
+} else {
+  app.listen(PORT, '0.0.0.0', () => {
+    console.log(`🌺 MACS Backend API running on port ${PORT}`);
+    console.log(`🚀 Health check: http://localhost:${PORT}/health`);
+    console.log(`📊 Environment: ${process.env.NODE_ENV || 'development'}`);
+  });
+}
 
 module.exports = app;
 